@@ -0,0 +1,232 @@
+# fleet.py
+# Флот роботов на одном поле: у каждого робота своя стартовая позиция и своя последовательность команд.
+# Состояние всех роботов хранится в массивах NumPy, и за один такт все роботы делают по одному шагу
+# сразу (без отдельного объекта на робота). После каждого такта проверяются выход за границы поля
+# и столкновения (два робота в одной клетке) по сетке занятости клеток.
+#
+# Файл программ: одна строка — один робот, номер робота — номер строки:
+#   x,y;R,4;D,2;L,1
+# Пустые строки пропускаются, неверные — сообщаются в конце и не останавливают остальных роботов.
+# Запуск: python fleet.py <файл программ> [--final-only]
+
+import argparse  # Разбор аргументов командной строки
+from functools import lru_cache  # Повторяющиеся команды разбираются один раз
+from itertools import chain  # Для сборки команд всех роботов в один массив
+import sys  # Для вывода через буферизованный поток
+
+import numpy as np
+
+from robot import FIELD_WIDTH, FIELD_HEIGHT, DIRECTIONS, field_size, read_command
+
+OUTPUT_BUFFER = 1 << 20  # Размер буфера вывода (1 МБ)
+GRID_LIMIT = 1 << 24  # Для полей больше этого числа клеток сетка занятости не выделяется
+
+# Состояния робота
+ACTIVE = 0     # На поле (выполняет команды или уже закончил и стоит на месте)
+OUT = 1        # Вышел за границы поля
+COLLIDED = 2   # Столкнулся с другим роботом
+
+# Команды в программах сильно повторяются: разобранные строки запоминаются
+_read_command = lru_cache(maxsize=1 << 16)(read_command)
+
+def parse_program(line, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+    """
+    Разбирает программу робота 'x,y;команда;команда...' для поля width x height.
+    Возвращает ((x, y), [(направление, шаги), ...]) или вызывает ValueError.
+    """
+    start, *commands = line.strip().split(';')
+    x, y = (int(v) for v in start.split(','))
+    if not (1 <= x <= width and 1 <= y <= height):
+        raise ValueError("Стартовая позиция вне поля.")
+    return (x, y), [_read_command(command) for command in commands if command.strip()]
+
+class Fleet:
+    """
+    Состояние флота в массивах:
+    - x, y: текущие координаты роботов;
+    - cmd, end: индекс текущей и граница команд робота в общих массивах команд (dx, dy, steps);
+    - left: сколько шагов осталось в текущей команде;
+    - state, event_tick: состояние робота и такт, на котором он вышел за поле или столкнулся.
+    Поле имеет размеры width x height.
+    """
+
+    def __init__(self, starts, programs, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+        n = len(starts)
+        self.width, self.height = width, height
+        self.x = np.array([s[0] for s in starts], dtype=np.int64)
+        self.y = np.array([s[1] for s in starts], dtype=np.int64)
+
+        # Команды всех роботов подряд; команды без шагов ничего не делают и отбрасываются
+        kept = [[(*DIRECTIONS[direction], s) for direction, s in program if s > 0] for program in programs]
+        lengths = [len(program) for program in kept]
+        flat = chain.from_iterable(chain.from_iterable(kept))
+        table = np.zeros((sum(lengths) + 1, 3), dtype=np.int64)  # Лишняя строка: индекс end допустим
+        table[:-1] = np.fromiter(flat, dtype=np.int64, count=3 * sum(lengths)).reshape(-1, 3)
+        self.dx, self.dy, self.steps = table[:, 0], table[:, 1], table[:, 2]
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        self.cmd = offsets[:-1].copy()
+        self.end = offsets[1:].copy()
+        self.left = self.steps[self.cmd]
+
+        # Сетка занятости выделяется один раз: за такт в ней записываются только клетки с роботами,
+        # а прочие клетки не читаются, поэтому очищать её не нужно (np.empty не заполняет память,
+        # и ОС выделяет страницы только под клетки, где бывали роботы)
+        self.grid = np.empty(width * height, dtype=np.int32) if width * height <= GRID_LIMIT else None
+        self.state = np.full(n, ACTIVE, dtype=np.int8)
+        self.event_tick = np.full(n, -1, dtype=np.int64)
+        self.tick = 0
+        self.moves = []  # Шаги по тактам: (номера роботов, x, y) — из них собираются траектории
+
+        self._check_collisions()  # Роботы могут стоять в одной клетке уже на старте
+
+    def _check_collisions(self):
+        """
+        Отмечает роботов, оказавшихся в одной клетке, по сетке занятости поля: каждый робот
+        записывает в свою клетку свой номер; если в клетке остался чужой номер, клетка общая
+        и помечается -1. Время и память — по числу роботов, а не по размеру поля.
+        На больших полях вместо сетки повторяющиеся номера клеток ищутся сортировкой.
+        """
+        on_field = np.flatnonzero(self.state == ACTIVE)
+        cells = (self.y[on_field] - 1) * self.width + (self.x[on_field] - 1)
+        if self.grid is not None:
+            slots = np.arange(on_field.size, dtype=np.int32)
+            self.grid[cells] = slots  # При повторах в клетке остаётся один из номеров
+            self.grid[cells[self.grid[cells] != slots]] = -1
+            crashed = on_field[self.grid[cells] == -1]
+        else:
+            _, inverse, counts = np.unique(cells, return_inverse=True, return_counts=True)
+            crashed = on_field[counts[inverse] > 1]
+        self.state[crashed] = COLLIDED
+        self.event_tick[crashed] = self.tick
+
+    def step(self):
+        """
+        Выполняет один такт: каждый активный робот с невыполненными командами делает шаг.
+        Возвращает False, если двигаться больше некому.
+        """
+        ids = np.flatnonzero((self.state == ACTIVE) & (self.cmd < self.end))
+        if ids.size == 0:
+            return False
+        self.tick += 1
+
+        c = self.cmd[ids]
+        nx = self.x[ids] + self.dx[c]
+        ny = self.y[ids] + self.dy[c]
+        self.x[ids] = nx
+        self.y[ids] = ny
+
+        # Выход за границы: робот останавливается в первой позиции вне поля, как в одиночном режиме
+        out = (nx < 1) | (nx > self.width) | (ny < 1) | (ny > self.height)
+        self.state[ids[out]] = OUT
+        self.event_tick[ids[out]] = self.tick
+        inside = ~out
+        self.moves.append((ids[inside], nx[inside], ny[inside]))
+
+        # Переход к следующей команде у тех, кто закончил текущую
+        self.left[ids] -= 1
+        done = ids[self.left[ids] == 0]
+        self.cmd[done] += 1
+        self.left[done] = self.steps[self.cmd[done]]
+
+        self._check_collisions()
+        return True
+
+    def run(self, max_ticks=None):
+        """Выполняет такты, пока есть движущиеся роботы (или до max_ticks тактов)."""
+        while (max_ticks is None or self.tick < max_ticks) and self.step():
+            pass
+
+    def trajectories(self):
+        """
+        Собирает траектории из шагов по тактам: возвращает (offsets, xs, ys), где
+        клетки робота i — xs[offsets[i]:offsets[i + 1]], ys[...] в порядке тактов.
+        """
+        n = self.x.size
+        if not self.moves:
+            empty = np.zeros(0, dtype=np.int64)
+            return np.zeros(n + 1, dtype=np.int64), empty, empty
+        ids = np.concatenate([m[0] for m in self.moves])
+        xs = np.concatenate([m[1] for m in self.moves])
+        ys = np.concatenate([m[2] for m in self.moves])
+        order = np.argsort(ids, kind='stable')  # Устойчивая сортировка сохраняет порядок тактов
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ids, minlength=n), out=offsets[1:])
+        return offsets, xs[order], ys[order]
+
+def load_programs(lines, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+    """
+    Читает программы роботов для поля width x height. Возвращает (numbers, starts, programs, errors):
+    номера строк роботов, стартовые позиции, команды и список (номер строки, текст) неверных строк.
+    """
+    numbers, starts, programs, errors = [], [], [], []
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            start, program = parse_program(line, width, height)
+        except ValueError:
+            errors.append((number, line.strip()))
+            continue
+        numbers.append(number)
+        starts.append(start)
+        programs.append(program)
+    return numbers, starts, programs, errors
+
+def write_report(fleet, numbers, out, final_only=False):
+    """Выводит для каждого робота траекторию (если не final_only) и итог его движения."""
+    offsets, xs, ys = fleet.trajectories()
+    xs, ys = xs.tolist(), ys.tolist()
+    x, y = fleet.x.tolist(), fleet.y.tolist()
+    state, ticks = fleet.state.tolist(), fleet.event_tick.tolist()
+    for i, number in enumerate(numbers):
+        if not final_only:
+            a, b = int(offsets[i]), int(offsets[i + 1])
+            out.write(f"Робот {number}: " + " ".join(f"{xs[k]},{ys[k]}" for k in range(a, b)) + "\n")
+        if state[i] == OUT:
+            out.write(f"Робот {number}: ошибка: выход за границы поля в позиции ({x[i]},{y[i]}) на такте {ticks[i]}.\n")
+        elif state[i] == COLLIDED:
+            out.write(f"Робот {number}: столкновение в позиции ({x[i]},{y[i]}) на такте {ticks[i]}.\n")
+        else:
+            out.write(f"Робот {number}: конечная позиция {x[i]},{y[i]}\n")
+
+def main():
+    """Точка входа: моделирование флота по файлу программ."""
+    parser = argparse.ArgumentParser(description="Моделирование флота роботов на общем поле")
+    parser.add_argument("programs", help="файл программ: строка 'x,y;R,4;D,2' на каждого робота ('-' — stdin)")
+    parser.add_argument("--final-only", action="store_true", help="не выводить траектории, только итог")
+    parser.add_argument("--max-ticks", type=int, default=None, help="ограничение числа тактов")
+    parser.add_argument("--width", type=field_size, default=FIELD_WIDTH,
+                        help=f"ширина поля (по умолчанию {FIELD_WIDTH})")
+    parser.add_argument("--height", type=field_size, default=FIELD_HEIGHT,
+                        help=f"высота поля (по умолчанию {FIELD_HEIGHT})")
+    args = parser.parse_args()
+
+    try:
+        if args.programs == "-":
+            numbers, starts, programs, errors = load_programs(sys.stdin, args.width, args.height)
+        else:
+            with open(args.programs, encoding="utf-8") as f:
+                numbers, starts, programs, errors = load_programs(f, args.width, args.height)
+    except FileNotFoundError:
+        print(f"Файл {args.programs} не найден.")
+        sys.exit(1)
+
+    fleet = Fleet(starts, programs, args.width, args.height)
+    fleet.run(args.max_ticks)
+
+    out = open(sys.stdout.fileno(), "w", buffering=OUTPUT_BUFFER, encoding="utf-8", closefd=False)
+    write_report(fleet, numbers, out, args.final_only)
+    out.write(f"Тактов: {fleet.tick}, роботов: {len(numbers)}, "
+              f"вышли за поле: {int((fleet.state == OUT).sum())}, "
+              f"столкнулись: {int((fleet.state == COLLIDED).sum())}\n")
+    out.close()
+
+    for number, line in errors:
+        print(f"Строка {number}: неверная программа '{line}' "
+              "(нужен формат 'x,y;направление,шаги;...', например 1,1;R,4)", file=sys.stderr)
+    sys.exit(1 if errors else 0)
+
+# Запуск программы
+if __name__ == "__main__":
+    main()
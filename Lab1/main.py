@@ -1,8 +1,11 @@
 # main.py
 
-# Размеры поля (ширина и высота 100x100)
-FIELD_WIDTH = 100
-FIELD_HEIGHT = 100
+import argparse  # Разбор аргументов командной строки
+import sys  # Для быстрого вывода через sys.stdout.write
+
+from robot import FIELD_WIDTH, FIELD_HEIGHT, DIRECTIONS, field_size, read_command, apply_command
+from replay import run_replay
+from visits import VisitTracker, visits_summary
 
 def parse_command(command):
     """
@@ -11,27 +14,25 @@ def parse_command(command):
     Возвращает кортеж (направление, количество шагов)
     """
     try:
-        # Удаляем лишние пробелы и разбиваем по запятой
-        direction, steps = command.strip().split(',')
-        steps = int(steps)           # Преобразуем количество шагов в целое число
-        direction = direction.upper()  # Приводим направление к верхнему регистру (например, 'r' -> 'R')
-
-        # Проверка допустимости направления
-        if direction not in ('L', 'R', 'U', 'D'):
-            raise ValueError("Неверное направление.")
-
-        return direction, steps
-    except:
+        return read_command(command)
+    except ValueError:
         # Если формат команды неправильный — сообщаем об ошибке и завершаем программу
         print("Ошибка: команда должна быть в формате 'направление,шаги' (например, R,4)")
         exit(1)
 
-def move_robot_by_commands():
+def move_robot_by_commands(fast=False, final_only=False, width=FIELD_WIDTH, height=FIELD_HEIGHT, tracker=None):
     """
     Основная логика движения робота.
     Принимает команды от пользователя и пошагово перемещает робота,
     выводя каждую координату и проверяя границы поля.
+
+    - fast: выполнять каждую команду одним отрезком (apply_command), вывод совпадает с пошаговым
+    - final_only: не выводить промежуточные координаты, только конечную позицию при завершении
+    - width, height: размеры поля
+    - tracker: VisitTracker для учёта посещённых клеток (или None)
     """
+    if final_only or tracker is not None:
+        fast = True  # Без вывода шагов пошаговый режим не нужен; посещения учитываются отрезками
     x, y = 1, 1  # Начальные координаты робота
     print(f"Стартовая позиция: {x},{y}")
 
@@ -40,12 +41,32 @@ def move_robot_by_commands():
         command = input("Введите команду (например, R,4) или 'stop' для завершения: ")
         if command.lower() == 'stop':
             # Если пользователь ввёл 'stop', выходим из цикла
+            if final_only:
+                print(f"Конечная позиция: {x},{y}")
+            if tracker is not None:
+                print(visits_summary(tracker))
             print("Завершение программы.")
             break
 
         # Разбираем команду
         direction, steps = parse_command(command)
 
+        if fast:
+            # Команда выполняется целиком: граница поля проверяется один раз на отрезок
+            prev_x, prev_y = x, y
+            x, y, ok = apply_command(x, y, direction, steps, None if final_only else sys.stdout.write,
+                                     width, height)
+            if tracker is not None:
+                # При выходе за поле последняя посещённая клетка — на шаг раньше позиции ошибки
+                dx, dy = (0, 0) if ok else DIRECTIONS[direction]
+                tracker.add_segment(prev_x, prev_y, x - dx, y - dy)
+            if not ok:
+                print(f"Ошибка: выход за границы поля в позиции ({x},{y}).")
+                if tracker is not None:
+                    print(visits_summary(tracker))
+                return  # Завершаем выполнение при ошибке
+            continue
+
         # Выполняем шаги один за другим
         for _ in range(steps):
             # Сохраняем предыдущие координаты (на случай отладки или отката)
@@ -62,7 +83,7 @@ def move_robot_by_commands():
                 y += 1
 
             # Проверяем, не вышел ли робот за границы поля
-            if not (1 <= x <= FIELD_WIDTH and 1 <= y <= FIELD_HEIGHT):
+            if not (1 <= x <= width and 1 <= y <= height):
                 print(f"Ошибка: выход за границы поля в позиции ({x},{y}).")
                 return  # Завершаем выполнение при ошибке
 
@@ -74,7 +95,26 @@ def main():
     Точка входа в программу.
     Запускает перемещение робота по командам пользователя.
     """
-    move_robot_by_commands()
+    parser = argparse.ArgumentParser(description="Перемещение робота по полю по командам 'направление,шаги'")
+    parser.add_argument("--fast", action="store_true",
+                        help="выполнять команду одним отрезком, а не по шагам (вывод тот же)")
+    parser.add_argument("--final-only", action="store_true",
+                        help="выводить только конечную позицию, без координат каждого шага")
+    parser.add_argument("--script", metavar="FILE",
+                        help="выполнить команды из файла без приглашений ввода ('-' — стандартный ввод)")
+    parser.add_argument("--width", type=field_size, default=FIELD_WIDTH,
+                        help=f"ширина поля (по умолчанию {FIELD_WIDTH})")
+    parser.add_argument("--height", type=field_size, default=FIELD_HEIGHT,
+                        help=f"высота поля (по умолчанию {FIELD_HEIGHT})")
+    parser.add_argument("--visits", action="store_true",
+                        help="учитывать посещённые клетки и вывести число посещённых и повторных посещений")
+    args = parser.parse_args()
+    tracker = VisitTracker() if args.visits else None
+    if args.script is not None:
+        sys.exit(run_replay(args.script, final_only=args.final_only,
+                            width=args.width, height=args.height, tracker=tracker))
+    move_robot_by_commands(fast=args.fast, final_only=args.final_only,
+                           width=args.width, height=args.height, tracker=tracker)
 
 # Запуск программы
 if __name__ == "__main__":
@@ -0,0 +1,93 @@
+# robot.py
+# Общая часть всех режимов робота: размеры поля, разбор команды
+# и выполнение команды одним отрезком (без перебора шагов).
+
+# Размеры поля по умолчанию (ширина и высота 100x100)
+FIELD_WIDTH = 100
+FIELD_HEIGHT = 100
+MAX_FIELD_SIZE = 10 ** 6  # Наибольшая допустимая ширина и высота поля
+
+def field_size(text):
+    """
+    Разбирает размер поля (ширину или высоту) из аргумента командной строки:
+    целое число от 1 до MAX_FIELD_SIZE, иначе ValueError.
+    """
+    size = int(text)
+    if not 1 <= size <= MAX_FIELD_SIZE:
+        raise ValueError(f"Размер поля должен быть от 1 до {MAX_FIELD_SIZE}.")
+    return size
+
+def read_command(command):
+    """
+    Разбирает строку команды 'направление,шаги' (например, 'R,4').
+    Возвращает кортеж (направление, количество шагов) или вызывает ValueError,
+    если формат неверный. В отличие от parse_command, программу не завершает.
+    """
+    # Удаляем лишние пробелы и разбиваем по запятой
+    direction, steps = command.strip().split(',')
+    steps = int(steps)           # Преобразуем количество шагов в целое число
+    direction = direction.upper()  # Приводим направление к верхнему регистру (например, 'r' -> 'R')
+
+    # Проверка допустимости направления
+    if direction not in DIRECTIONS:
+        raise ValueError("Неверное направление.")
+
+    return direction, steps
+
+# Смещение по осям для каждого направления
+DIRECTIONS = {'L': (-1, 0), 'R': (1, 0), 'U': (0, -1), 'D': (0, 1)}
+
+def steps_to_border(x, y, direction, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+    """
+    Сколько шагов робот может сделать в направлении direction из (x, y),
+    не выходя за границы поля width x height. Считается арифметически, без перебора шагов.
+    """
+    if direction == 'L':
+        return x - 1
+    if direction == 'R':
+        return width - x
+    if direction == 'U':
+        return y - 1
+    return height - y  # 'D'
+
+def segment_text(x, y, direction, count):
+    """
+    Координаты count шагов из (x, y) в направлении direction — строки 'x,y' через перевод строки.
+    Числа переводятся в текст через map(str, range(...)), а общая часть строк служит разделителем
+    в join, поэтому цикла Python по шагам нет.
+    """
+    if count <= 0:
+        return ""
+    dx, dy = DIRECTIONS[direction]
+    if dx:
+        tail = f",{y}\n"
+        return tail.join(map(str, range(x + dx, x + dx * (count + 1), dx))) + tail
+    head = f"{x},"
+    return head + f"\n{head}".join(map(str, range(y + dy, y + dy * (count + 1), dy))) + "\n"
+
+def apply_command(x, y, direction, steps, write=None, width=FIELD_WIDTH, height=FIELD_HEIGHT):
+    """
+    Выполняет команду целиком как один отрезок.
+
+    - x, y: текущие координаты робота
+    - direction, steps: команда
+    - write: функция вывода строк (например, sys.stdout.write); если None, промежуточные
+      координаты не выводятся (нужна только конечная позиция)
+    - width, height: размеры поля
+
+    Возвращает кортеж (x, y, ok): новые координаты и признак того, что робот остался на поле.
+    При выходе за границы x, y — первая позиция вне поля, как в пошаговом режиме.
+    """
+    dx, dy = DIRECTIONS[direction]
+    done = min(max(steps, 0), steps_to_border(x, y, direction, width, height))  # Шаги, которые точно внутри поля
+
+    if write is not None and done > 0:
+        # Все координаты отрезка формируются одной строкой и выводятся одним вызовом
+        write(segment_text(x, y, direction, done))
+
+    x, y = x + dx * done, y + dy * done
+    if done < steps:
+        # Следующий шаг выводит робота за границы поля
+        return x + dx, y + dy, False
+    return x, y, True
+
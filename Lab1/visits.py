@@ -0,0 +1,134 @@
+# visits.py
+# Учёт посещённых клеток без плотной сетки поля: траектория хранится как набор
+# горизонтальных и вертикальных отрезков (строка -> отрезки по x, столбец -> отрезки по y).
+# Подряд идущие команды в одном направлении склеиваются в один отрезок.
+# Запросы отвечаются слиянием интервалов, поэтому память и время зависят от числа
+# команд, а не от размеров поля (поле может быть 10^6 x 10^6).
+
+from bisect import bisect_left, bisect_right  # Для сжатия координат строк
+
+def merge_intervals(intervals):
+    """Объединяет пересекающиеся и соседние интервалы [a, b] (целые клетки) в отсортированный список."""
+    merged = []
+    for a, b in sorted(intervals):
+        if merged and a <= merged[-1][1] + 1:
+            if b > merged[-1][1]:
+                merged[-1][1] = b
+        else:
+            merged.append([a, b])
+    return [tuple(interval) for interval in merged]
+
+class VisitTracker:
+    """
+    Посещения клеток одним роботом.
+
+    Посещение — каждое попадание робота в клетку: стартовая клетка посещена один раз в начале,
+    а отрезок команды содержит клетки после текущей позиции. Поэтому число посещений клетки
+    равно числу отрезков, в которые она входит (стартовая клетка хранится отрезком длины 1).
+    """
+
+    def __init__(self, x=1, y=1):
+        self.rows = {}     # y -> список [x1, x2] горизонтальных отрезков
+        self.columns = {}  # x -> список [y1, y2] вертикальных отрезков
+        self.total = 0     # Общее число посещений (сумма длин отрезков)
+        self.last = None   # Последний отрезок (направление, список-отрезок) для склеивания
+        self._add(self.rows, y, x, x, None)
+
+    def _add(self, lines, key, a, b, direction):
+        """Добавляет отрезок [a, b] в строку/столбец key или продлевает последний отрезок."""
+        self.total += b - a + 1
+        if self.last is not None and self.last[0] == direction:
+            segment = self.last[1]
+            # Продолжение в ту же сторону: отрезки примыкают друг к другу
+            if direction in ('R', 'D') and segment[1] + 1 == a:
+                segment[1] = b
+                return
+            if direction in ('L', 'U') and segment[0] - 1 == b:
+                segment[0] = a
+                return
+        segment = [a, b]
+        lines.setdefault(key, []).append(segment)
+        self.last = (direction, segment)
+
+    def add_segment(self, x, y, nx, ny):
+        """
+        Учитывает перемещение из (x, y) в (nx, ny) по прямой: посещены все клетки
+        после (x, y) до (nx, ny) включительно. Нулевое перемещение ничего не добавляет.
+        """
+        if nx > x:
+            self._add(self.rows, y, x + 1, nx, 'R')
+        elif nx < x:
+            self._add(self.rows, y, nx, x - 1, 'L')
+        elif ny > y:
+            self._add(self.columns, x, y + 1, ny, 'D')
+        elif ny < y:
+            self._add(self.columns, x, ny, y - 1, 'U')
+
+    def visits(self, x, y):
+        """Сколько раз робот побывал в клетке (x, y)."""
+        count = sum(1 for a, b in self.rows.get(y, ()) if a <= x <= b)
+        return count + sum(1 for a, b in self.columns.get(x, ()) if a <= y <= b)
+
+    def row_cells(self, y):
+        """Посещённые клетки строки y в виде объединённых интервалов [x1, x2]."""
+        points = [(x, x) for x, segments in self.columns.items()
+                  if any(a <= y <= b for a, b in segments)]
+        return merge_intervals([tuple(s) for s in self.rows.get(y, [])] + points)
+
+    def coverage(self):
+        """
+        Число различных посещённых клеток:
+        |горизонтальные| + |вертикальные| - |клетки, покрытые и теми, и другими|.
+        Пересечения считаются заметанием по x с деревом Фенвика по строкам.
+        """
+        rows = {y: merge_intervals(s) for y, s in self.rows.items()}
+        columns = {x: merge_intervals(s) for x, s in self.columns.items()}
+        covered = sum(b - a + 1 for s in rows.values() for a, b in s)
+        covered += sum(b - a + 1 for s in columns.values() for a, b in s)
+        if not rows or not columns:
+            return covered
+
+        # События: 0 — конец горизонтального интервала (на x2 + 1), 1 — начало, 2 — вертикальный запрос
+        ys = sorted(rows)
+        events = []
+        for y, s in rows.items():
+            for a, b in s:
+                events.append((a, 1, y, 0))
+                events.append((b + 1, 0, y, 0))
+        for x, s in columns.items():
+            for a, b in s:
+                events.append((x, 2, a, b))
+        events.sort()
+
+        tree = [0] * (len(ys) + 1)  # Дерево Фенвика: сколько горизонтальных интервалов открыто в строке
+
+        def update(i, delta):
+            i += 1
+            while i < len(tree):
+                tree[i] += delta
+                i += i & -i
+
+        def prefix(i):
+            total = 0
+            while i > 0:
+                total += tree[i]
+                i -= i & -i
+            return total
+
+        crossings = 0
+        for _, kind, a, b in events:
+            if kind == 2:
+                crossings += prefix(bisect_right(ys, b)) - prefix(bisect_left(ys, a))
+            else:
+                update(bisect_left(ys, a), 1 if kind == 1 else -1)
+        return covered - crossings
+
+    def revisits(self):
+        """Сколько раз робот заходил в уже посещённую клетку."""
+        return self.total - self.coverage()
+
+def visits_summary(tracker):
+    """Строка с итогами учёта посещений для вывода."""
+    covered = tracker.coverage()
+    return (f"Посещено клеток: {covered}, всего посещений: {tracker.total}, "
+            f"повторных посещений: {tracker.total - covered}")
@@ -0,0 +1,181 @@
+# batch.py
+# Пакетная обработка множества CSV-файлов в одном процессе-координаторе:
+# файлы распределяются по пулу процессов, результаты печатаются в прежнем текстовом виде
+# и сохраняются в машиночитаемый файл (JSON Lines или CSV).
+# Запуск: python batch.py <каталог|маска|файл>... [-i минуты] [-o отчёт.jsonl] [--workers N]
+
+import argparse  # Для разбора аргументов командной строки
+from collections import Counter  # Частоты значений для сводной статистики
+from concurrent.futures import ProcessPoolExecutor  # Пул процессов
+import csv  # Для отчёта в формате CSV
+from fractions import Fraction  # Точная сумма для среднего
+import glob  # Для раскрытия масок файлов
+import json  # Для отчёта в формате JSON Lines
+import os  # Для работы с путями
+
+from main import iter_data_from_file, print_statistics, stream_statistics
+
+# Поля машиночитаемого отчёта. scope: interval — интервал файла, file — весь файл, total — все файлы
+FIELDS = ["scope", "file", "interval", "start", "end", "count", "mean", "mode", "median"]
+
+
+def expand_inputs(inputs):
+    """Раскрывает каталоги (все *.csv в них) и маски в упорядоченный список файлов без повторов."""
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            matches = sorted(glob.glob(os.path.join(item, "*.csv")))
+        elif glob.has_magic(item):
+            matches = sorted(glob.glob(item))
+        else:
+            matches = [item]
+        files.extend(path for path in matches if path not in files)
+    return files
+
+
+def summarize(counter, start, end):
+    """
+    Сводная статистика по частотам значений: те же поля, что у интервала.
+    Мода — самое частое значение, при равенстве — встреченное раньше (как statistics.mode).
+    """
+    count = sum(counter.values())
+    if count == 0:
+        return None
+    total = sum(Fraction(value) * n for value, n in counter.items())
+    mode = counter.most_common(1)[0][0]
+
+    # Медиана: проходим значения по возрастанию, пока не наберём середину
+    middle = [(count - 1) // 2, count // 2]
+    found = []
+    seen = 0
+    for value in sorted(counter):
+        seen += counter[value]
+        while middle and middle[0] < seen:
+            found.append(value)
+            middle.pop(0)
+    return {"start": start, "end": end, "count": count, "mean": float(total / count),
+            "mode": mode, "median": (found[0] + found[1]) / 2}
+
+
+def analyze_file(path, interval_minutes=5, columnar=False):
+    """
+    Обрабатывает один файл в рабочем процессе.
+    Возвращает (path, статистики интервалов, частоты значений в порядке первого появления).
+    """
+    if columnar:
+        from columnar import batch_statistics, load_columns
+        import numpy as np
+        try:
+            seconds, values = load_columns(path)
+        except FileNotFoundError:
+            print(f"Файл {path} не найден.")
+            return path, [], Counter()
+        unique, first, counts = np.unique(values, return_index=True, return_counts=True)
+        order = np.argsort(first)  # Порядок первого появления значения в файле
+        counter = Counter(dict(zip(unique[order].tolist(), counts[order].tolist())))
+        return path, batch_statistics(seconds, values, interval_minutes), counter
+
+    counter = Counter()
+
+    def counting_reader(filename):
+        # Считаем частоты значений по ходу чтения; при повторном чтении (внешняя сортировка) — заново
+        counter.clear()
+        for record in iter_data_from_file(filename):
+            counter[record[1]] += 1
+            yield record
+
+    stats = stream_statistics(path, interval_minutes, reader=counting_reader)
+    return path, stats, counter
+
+
+def _analyze(job):
+    """Обёртка для пула процессов: job = (path, interval_minutes, columnar)."""
+    return analyze_file(*job)
+
+
+def report_rows(path, stats, summary):
+    """Строки машиночитаемого отчёта для одного файла: интервалы и сводка по файлу."""
+    for i, s in enumerate(stats):
+        yield dict(scope="interval", file=path, interval=i + 1, **s)
+    if summary is not None:
+        yield dict(scope="file", file=path, interval=None, **summary)
+
+
+def _serialize(row):
+    """Приводит значения строки отчёта к виду для JSON/CSV (время — в ISO 8601)."""
+    return {key: value.isoformat() if hasattr(value, "isoformat") else value for key, value in row.items()}
+
+
+class ReportWriter:
+    """Запись строк отчёта в JSON Lines (по умолчанию) или CSV — по расширению файла или явному формату."""
+
+    def __init__(self, path, fmt=None):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if self.fmt == "csv":
+            self.writer = csv.DictWriter(self.file, fieldnames=FIELDS)
+            self.writer.writeheader()
+
+    def write(self, row):
+        row = _serialize(row)
+        if self.fmt == "csv":
+            self.writer.writerow(row)
+        else:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+def run_batch(files, interval_minutes=5, workers=None, output=None, fmt=None, columnar=False):
+    """
+    Обрабатывает files на пуле процессов (результаты приходят в порядке files),
+    печатает текстовый отчёт и пишет машиночитаемый в output (если указан).
+    Возвращает сводную статистику по всем файлам.
+    """
+    writer = ReportWriter(output, fmt) if output else None
+    combined = Counter()
+    start = end = None
+    jobs = [(path, interval_minutes, columnar) for path in files]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))  # Мелкие файлы отдаём пачками
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for path, stats, counter in pool.map(_analyze, jobs, chunksize=chunksize):
+                print(f"===== {path} =====")
+                print_statistics(stats)
+                combined.update(counter)  # Порядок файлов сохраняет порядок первого появления
+                if stats:
+                    start = min(start, stats[0]["start"]) if start else stats[0]["start"]
+                    end = max(end, stats[-1]["end"]) if end else stats[-1]["end"]
+                if writer:
+                    summary = summarize(counter, stats[0]["start"], stats[-1]["end"]) if stats else None
+                    for row in report_rows(path, stats, summary):
+                        writer.write(row)
+        total = summarize(combined, start, end)
+        if total is not None:
+            print(f"===== Итого: {len(files)} файлов =====")
+            print_statistics([total])
+            if writer:
+                writer.write(dict(scope="total", file=None, interval=None, **total))
+        return total
+    finally:
+        if writer:
+            writer.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Пакетный расчёт статистик по интервалам для множества CSV-файлов")
+    parser.add_argument("inputs", nargs="+", help="каталоги, маски (например, 'data/*.csv') или файлы")
+    parser.add_argument("-i", "--interval", type=int, default=5, help="интервал в минутах (по умолчанию 5)")
+    parser.add_argument("-o", "--output", help="машиночитаемый отчёт: .jsonl (JSON Lines) или .csv")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="формат отчёта, если не подходит расширение")
+    parser.add_argument("--workers", type=int, default=None, help="количество процессов (по умолчанию — число ядер)")
+    parser.add_argument("--columnar", action="store_true", help="колоночный режим на NumPy для каждого файла")
+    args = parser.parse_args()
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("Не найдено ни одного CSV-файла.")
+        raise SystemExit(1)
+    run_batch(files, args.interval, args.workers, args.output, args.format, args.columnar)
@@ -0,0 +1,59 @@
+# bench.py
+# Сравнение потокового и колоночного режимов на синтетическом файле.
+# Запуск: python bench.py [количество_строк] [интервал_в_минутах]
+
+import os  # Для удаления временного файла
+import sys  # Для получения аргументов командной строки
+import tempfile  # Для временного CSV-файла
+import time  # Для замера времени
+
+import numpy as np
+
+from columnar import columnar_statistics
+from main import stream_statistics
+
+
+def make_synthetic_file(path, rows, seed=0, seconds=False):
+    """
+    Записывает CSV в формате example.csv: заголовок, затем время (шаг ~0.7 с, кратно 1/256 с)
+    и RR-интервал в единицах 1/256 с. При seconds=True RR-интервал пишется в секундах
+    с тремя знаками (0.703 и т. п.) — дробные значения, на которых проверяется точность среднего.
+    """
+    rng = np.random.default_rng(seed)
+    values = rng.integers(150, 260, size=rows)  # RR-интервалы в s/256
+    times = np.cumsum(values) / 256.0  # Время — накопленная сумма интервалов
+    if seconds:
+        values = np.round(values / 256.0, 3)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("time [s],RR_interval [s]\n" if seconds else "time [s],RR_interval [s/256]\n")
+        block = 1_000_000
+        for i in range(0, rows, block):
+            lines = [f"{t!r},{v}" for t, v in zip(times[i:i + block].tolist(), values[i:i + block].tolist())]
+            f.write("\n".join(lines) + "\n")
+
+
+def measure(func, *args):
+    """Время выполнения func(*args) в секундах и её результат."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    try:
+        # Целые значения, как в example.csv, и дробные: для них среднее должно совпадать до бита
+        for title, seconds in (("целые значения", False), ("дробные значения", True)):
+            print(f"Генерация {rows} строк ({title})...")
+            make_synthetic_file(path, rows, seconds=seconds)
+            stream_time, stream_stats = measure(stream_statistics, path, interval)
+            print(f"Потоковый режим:  {stream_time:8.2f} с ({len(stream_stats)} интервалов)")
+            columnar_time, columnar_stats = measure(columnar_statistics, path, interval)
+            print(f"Колоночный режим: {columnar_time:8.2f} с ({len(columnar_stats)} интервалов)")
+            print("Результаты совпадают" if stream_stats == columnar_stats else "РЕЗУЛЬТАТЫ РАЗЛИЧАЮТСЯ")
+    finally:
+        os.remove(path)
@@ -0,0 +1,97 @@
+# cache.py
+# Бинарный кэш разобранных CSV-файлов: колонки времени и значений сохраняются
+# в .npy-файл и при повторных запусках отображаются в память (mmap) без разбора CSV.
+#
+# Имя записи кэша: <хэш пути>-<хэш размера и времени изменения>.npy.
+# Если исходный файл изменился, меняется вторая часть имени — старая запись
+# не подходит и удаляется при сохранении новой. Общий размер кэша ограничен:
+# при превышении удаляются записи, к которым дольше всего не обращались.
+
+import hashlib  # Для ключей записей кэша
+import os  # Для работы с файлами и путями
+
+import numpy as np
+
+from columnar import load_columns
+
+# Каталог кэша по умолчанию (можно переопределить переменной окружения LAB2_CACHE_DIR)
+DEFAULT_DIR = os.environ.get("LAB2_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "lab2")
+DEFAULT_LIMIT = 1 << 30  # Ограничение общего размера кэша — 1 ГБ
+
+
+def _digest(text):
+    """Короткий хэш строки для имени файла."""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+class ColumnCache:
+    """Кэш колонок (время, значение) для CSV-файлов в каталоге directory не больше limit_bytes."""
+
+    def __init__(self, directory=DEFAULT_DIR, limit_bytes=DEFAULT_LIMIT):
+        self.directory = directory
+        self.limit_bytes = limit_bytes
+
+    def _entry(self, filename):
+        """Префикс записей файла и имя записи для его текущей версии (размер и mtime)."""
+        path = os.path.abspath(filename)
+        st = os.stat(path)  # FileNotFoundError, если исходного файла нет
+        prefix = _digest(path)
+        return prefix, f"{prefix}-{_digest(f'{st.st_size}:{st.st_mtime_ns}')}.npy"
+
+    def load(self, filename):
+        """
+        Возвращает (seconds, values) для файла: из кэша (отображение в память)
+        или разбором CSV с последующим сохранением в кэш.
+        """
+        prefix, name = self._entry(filename)
+        entry = os.path.join(self.directory, name)
+        try:
+            table = np.load(entry, mmap_mode="r")
+            os.utime(entry)  # Отмечаем обращение: вытесняются давно не использованные записи
+            return table[0], table[1]
+        except (OSError, ValueError):
+            pass  # Записи нет или она повреждена — разбираем CSV
+
+        seconds, values = load_columns(filename)
+        self._store(prefix, entry, np.vstack((seconds, values)))
+        return seconds, values
+
+    def _store(self, prefix, entry, table):
+        """Сохраняет таблицу 2 x n атомарно (временный файл + rename) и освобождает место."""
+        os.makedirs(self.directory, exist_ok=True)
+        tmp = f"{entry}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.save(f, table)
+        os.replace(tmp, entry)
+
+        # Устаревшие версии этого же файла больше не понадобятся
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix + "-") and name.endswith(".npy") and name != os.path.basename(entry):
+                self._remove(os.path.join(self.directory, name))
+        self.evict(keep=entry)
+
+    def evict(self, keep=None):
+        """Удаляет самые старые (по времени обращения) записи, пока кэш не уложится в лимит."""
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".npy"):
+                path = os.path.join(self.directory, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue  # Запись удалил параллельный процесс
+                entries.append((st.st_mtime, st.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.limit_bytes:
+                break
+            if path != keep:
+                self._remove(path)
+                total -= size
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass  # Уже удалена или занята (Windows) — попробуем в следующий раз
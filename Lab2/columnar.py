@@ -0,0 +1,187 @@
+# columnar.py
+# Колоночный режим: время и значения загружаются в массивы NumPy,
+# границы интервалов ищутся через searchsorted, а среднее, медиана и мода
+# считаются сразу для всех интервалов без циклов по строкам.
+
+import csv  # Для медленного, но устойчивого разбора «грязных» файлов
+from datetime import datetime, timedelta  # Для вывода границ интервалов в прежнем формате
+
+import numpy as np
+
+BASE_TIME = datetime(2025, 1, 1)  # Та же точка отсчета, что и в main.py
+
+
+def _parse_float(text):
+    """Преобразует строку в float или возвращает None, если это не число."""
+    try:
+        return float(text.strip())
+    except ValueError:
+        return None
+
+
+def load_columns(filename):
+    """
+    Загружает CSV-файл в два массива float64: время в секундах и значения.
+
+    Сначала пробует быстрый разбор np.loadtxt (пропуская строки заголовка);
+    если в файле встречаются неполные или нечисловые строки, переходит
+    к построчному разбору с теми же правилами пропуска, что и read_data_from_file.
+    """
+    # Сколько строк в начале файла не являются числовыми (заголовок)
+    header = 0
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        for row in csv.reader(csvfile):
+            if len(row) >= 2 and _parse_float(row[0]) is not None and _parse_float(row[1]) is not None:
+                break
+            header += 1
+
+    try:
+        table = np.loadtxt(filename, delimiter=',', usecols=(0, 1), skiprows=header,
+                           dtype=np.float64, comments=None, encoding='utf-8', ndmin=2)
+        return table[:, 0].copy(), table[:, 1].copy()
+    except ValueError:
+        pass  # В файле есть некорректные строки — разбираем построчно
+
+    seconds, values = [], []
+    with open(filename, newline='', encoding='utf-8') as csvfile:
+        for row in csv.reader(csvfile):
+            if len(row) < 2:
+                continue
+            s, v = _parse_float(row[0]), _parse_float(row[1])
+            if s is None or v is None:
+                continue
+            seconds.append(s)
+            values.append(v)
+    return np.array(seconds, dtype=np.float64), np.array(values, dtype=np.float64)
+
+
+def to_microseconds(seconds):
+    """
+    Переводит секунды в целые микросекунды так же, как timedelta(seconds=...):
+    целая часть отдельно, дробная округляется к ближайшему чётному. Тогда границы
+    интервалов и время в отчёте совпадают с потоковым режимом до микросекунды.
+    """
+    fraction, whole = np.modf(seconds)
+    return whole.astype(np.int64) * 1_000_000 + np.rint(fraction * 1e6).astype(np.int64)
+
+
+def interval_bounds(times, interval_minutes=5):
+    """
+    Находит индексы начала интервалов в отсортированном массиве времени (в микросекундах).
+    Правило то же, что в split_data: интервал начинается с первой записи не раньше
+    конца предыдущего. Один вызов searchsorted на интервал, а не сравнение на каждую запись.
+    Возвращает массив индексов начала, дополненный длиной массива.
+    """
+    length = interval_minutes * 60 * 1_000_000
+    starts = []
+    i = 0
+    while i < times.size:
+        starts.append(i)
+        i = int(np.searchsorted(times, times[i] + length, side='left'))
+    starts.append(times.size)
+    return np.array(starts, dtype=np.int64)
+
+
+def interval_means(values, starts, counts):
+    """
+    Средние по интервалам, совпадающие со statistics.mean до последнего бита.
+
+    Каждое конечное значение float64 — целое число, умноженное на степень двойки,
+    поэтому после приведения к общему показателю сумма интервала считается точно
+    в целых числах (int64, а если не хватает разрядов — целые Python), и деление
+    на количество округляется один раз, как в statistics.mean.
+    """
+    if not np.isfinite(values).all():
+        return (np.add.reduceat(values, starts) / counts).tolist()  # inf и nan точная сумма не нужна
+
+    fraction, exponent = np.frexp(values)
+    mantissa = (fraction * 2.0 ** 53).astype(np.int64)  # Точно: у float64 53 значащих бита
+    exponent = exponent.astype(np.int64) - 53
+    nonzero = mantissa != 0
+    # Убираем нулевые младшие биты, чтобы целые значения остались небольшими целыми
+    low = mantissa[nonzero] & -mantissa[nonzero]
+    zeros = np.frexp(low.astype(np.float64))[1] - 1
+    mantissa[nonzero] >>= zeros
+    exponent[nonzero] += zeros
+
+    base = int(exponent[nonzero].min()) if nonzero.any() else 0
+    shift = np.where(nonzero, exponent - base, 0)
+    bits = np.frexp(np.abs(mantissa).astype(np.float64))[1] + shift  # Разрядность слагаемых
+    if int(bits.max()) + int(counts.max()).bit_length() < 63:
+        sums = np.add.reduceat(mantissa << shift, starts).tolist()
+    else:
+        sums = np.add.reduceat(mantissa.astype(object) << shift.astype(object), starts).tolist()
+
+    # Деление целых в Python округляется правильно, как float(Fraction)
+    if base >= 0:
+        return [(total << base) / count for total, count in zip(sums, counts.tolist())]
+    return [total / (count << -base) for total, count in zip(sums, counts.tolist())]
+
+
+def batch_statistics(seconds, values, interval_minutes=5):
+    """
+    Вычисляет статистики по интервалам сразу для всех интервалов.
+
+    Возвращает список словарей с ключами start, end, count, mean, mode, median —
+    в том же виде, что calculate_statistics, поэтому подходит для print_statistics.
+    """
+    if seconds.size == 0:
+        return []
+
+    times = to_microseconds(seconds)
+    if np.any(times[1:] < times[:-1]):
+        order = np.argsort(times, kind='stable')  # Устойчивая сортировка, как list.sort
+        times, values = times[order], values[order]
+
+    bounds = interval_bounds(times, interval_minutes)
+    starts, ends = bounds[:-1], bounds[1:]
+    counts = ends - starts
+    group = np.repeat(np.arange(starts.size), counts)  # Номер интервала для каждой записи
+
+    # Среднее: точная сумма по каждому интервалу одним вызовом reduceat
+    means = interval_means(values, starts, counts)
+
+    # Медиана: сортируем значения внутри интервалов (по паре ключей интервал, значение)
+    order = np.lexsort((values, group))
+    sorted_values = values[order]
+    medians = (sorted_values[starts + (counts - 1) // 2] + sorted_values[starts + counts // 2]) / 2
+
+    # Мода: серии одинаковых значений в отсортированных интервалах. Из серий максимальной длины
+    # берём ту, чьё значение раньше всех встретилось в исходных данных (как statistics.mode).
+    run_start = np.ones(values.size, dtype=bool)
+    run_start[1:] = (sorted_values[1:] != sorted_values[:-1]) | (group[order][1:] != group[order][:-1])
+    run_idx = np.flatnonzero(run_start)
+    run_len = np.diff(np.append(run_idx, values.size))
+    run_group = group[order][run_idx]
+    run_first = np.minimum.reduceat(order, run_idx)  # Позиция первого появления значения
+    best = np.lexsort((run_first, -run_len, run_group))
+    first_of_group = np.ones(best.size, dtype=bool)
+    first_of_group[1:] = run_group[best][1:] != run_group[best][:-1]
+    modes = sorted_values[run_idx[best[first_of_group]]]
+
+    stats = []
+    for start, end, count, mean, mode, median in zip(
+            times[starts].tolist(), times[ends - 1].tolist(), counts.tolist(),
+            means, modes.tolist(), medians.tolist()):
+        stats.append({
+            "start": BASE_TIME + timedelta(microseconds=start),
+            "end": BASE_TIME + timedelta(microseconds=end),
+            "count": count,
+            "mean": mean,
+            "mode": mode,
+            "median": median,
+        })
+    return stats
+
+
+def columnar_statistics(filename, interval_minutes=5, loader=load_columns):
+    """
+    Загружает файл колонками и считает статистики по интервалам в пакетном режиме.
+    loader(filename) -> (seconds, values), по умолчанию load_columns (например, ColumnCache.load).
+    """
+    try:
+        seconds, values = loader(filename)
+    except FileNotFoundError:
+        print(f"Файл {filename} не найден.")  # То же сообщение, что и в потоковом режиме
+        return []
+    return batch_statistics(seconds, values, interval_minutes)
@@ -1,42 +1,71 @@
 # lab2_statistics_app/main.py
 
 # Импорт необходимых библиотек
+import argparse  # Для разбора аргументов командной строки
 import csv  # Для чтения CSV-файлов
 from datetime import datetime, timedelta  # Для работы с датами и интервалами времени
 import statistics  # Для расчета статистических характеристик
-import sys  # Для получения аргументов командной строки
-from splitter import split_data  # Импорт функции разбиения интервалов из внешнего модуля
+import sys  # Для сброса буфера вывода в онлайн-режиме
+from splitter import (OutOfOrderError, external_sort, iter_fixed_intervals,  # Разбиение интервалов (внешний модуль)
+                      iter_intervals, iter_sliding_windows)
 
-# ======= ФУНКЦИЯ СЧИТЫВАНИЯ ДАННЫХ ИЗ CSV-ФАЙЛА =======
-def read_data_from_file(filename):
+# Начальная точка отсчета — 1 января 2025 (создаётся один раз, а не для каждой строки)
+BASE_TIME = datetime(2025, 1, 1)
+
+# ======= ФУНКЦИЯ РАЗБОРА ОДНОЙ СТРОКИ CSV =======
+def parse_row(row):
     """
-    Считывает данные из CSV-файла и возвращает список кортежей вида:
-    [(datetime, value), ...]
+    Преобразует строку CSV (список полей) в кортеж (datetime, value).
+    Возвращает None, если в строке меньше двух столбцов или значения некорректны.
+    """
+    if len(row) < 2:
+        return None  # Пропустить строку, если в ней меньше двух столбцов
+    try:
+        seconds = float(row[0].strip())  # Время в секундах с начала (float)
+        value = float(row[1].strip())  # Значение (float)
+    except ValueError:
+        return None  # Пропустить строку, если значения некорректны
+    return BASE_TIME + timedelta(seconds=seconds), value  # Пара (время, значение)
+
+# ======= ФУНКЦИЯ ПОТОКОВОГО СЧИТЫВАНИЯ ДАННЫХ ИЗ CSV-ФАЙЛА =======
+def iter_data_from_file(filename):
+    """
+    Построчно считывает CSV-файл и выдает кортежи (datetime, value) по одному,
+    не храня весь файл в памяти.
 
     Входной CSV-файл должен содержать:
     - В первом столбце: время в секундах от начала отсчета (тип float)
     - Во втором столбце: числовое значение (тип float)
     """
-    data = []  # Инициализация списка для хранения результатов
     try:
         with open(filename, newline='', encoding='utf-8') as csvfile:
             reader = csv.reader(csvfile)  # Создание CSV-ридера
             for row in reader:
-                if len(row) < 2:
-                    continue  # Пропустить строку, если в ней меньше двух столбцов
-                try:
-                    seconds = float(row[0].strip())  # Время в секундах с начала (float)
-                    value = float(row[1].strip())  # Значение (float)
-                    base_time = datetime(2025, 1, 1)  # Начальная точка отсчета — 1 января 2025
-                    dt = base_time + timedelta(seconds=seconds)  # Преобразование секунд в datetime
-                    data.append((dt, value))  # Добавление пары (время, значение) в список
-                except ValueError:
-                    continue  # Пропустить строку, если значения некорректны
+                record = parse_row(row)
+                if record is not None:
+                    yield record
     except FileNotFoundError:
         print(f"Файл {filename} не найден.")  # Сообщение, если файл не найден
     except Exception as e:
         print(f"Ошибка при чтении файла: {e}")  # Общее сообщение об ошибке
-    return data  # Возвращаем считанные данные
+
+# ======= ФУНКЦИЯ СЧИТЫВАНИЯ ДАННЫХ ИЗ КОЛОНОК =======
+def iter_data_from_columns(seconds, values, block=65536):
+    """
+    Выдает кортежи (datetime, value) из массивов времени и значений (например, из кэша),
+    без разбора CSV. Массивы переводятся в числа Python блоками, чтобы не занимать лишнюю память.
+    """
+    for i in range(0, len(seconds), block):
+        for s, v in zip(seconds[i:i + block].tolist(), values[i:i + block].tolist()):
+            yield BASE_TIME + timedelta(seconds=s), v
+
+# ======= ФУНКЦИЯ СЧИТЫВАНИЯ ДАННЫХ ИЗ CSV-ФАЙЛА =======
+def read_data_from_file(filename):
+    """
+    Считывает данные из CSV-файла и возвращает список кортежей вида:
+    [(datetime, value), ...]
+    """
+    return list(iter_data_from_file(filename))
 
 # ======= ФУНКЦИЯ ВЫЧИСЛЕНИЯ СТАТИСТИК =======
 def calculate_statistics(intervals):
@@ -44,7 +73,7 @@ def calculate_statistics(intervals):
     Вычисляет статистические показатели для каждого временного интервала.
 
     Аргумент:
-    - intervals: список списков с парами (datetime, значение)
+    - intervals: список (или генератор) списков с парами (datetime, значение)
 
     Возвращает:
     - список словарей с ключами: start, end, count, mean, mode, median
@@ -53,27 +82,46 @@ def calculate_statistics(intervals):
     for chunk in intervals:
         values = [val for _, val in chunk]  # Извлекаем значения из интервала
         try:
-            chunk_stats = {
-                "start": chunk[0][0],  # Начальное время интервала
-                "end": chunk[-1][0],   # Конечное время интервала
-                "count": len(values),  # Количество значений
-                "mean": statistics.mean(values),  # Среднее значение
-                "mode": statistics.mode(values),  # Мода (наиболее частое значение)
-                "median": statistics.median(values)  # Медиана
-            }
+            mode = statistics.mode(values)  # Мода (наиболее частое значение)
         except statistics.StatisticsError:
             # Обработка ошибки, если мода не может быть определена (несколько одинаково частых значений)
-            chunk_stats = {
-                "start": chunk[0][0],
-                "end": chunk[-1][0],
-                "count": len(values),
-                "mean": statistics.mean(values),
-                "mode": None,
-                "median": statistics.median(values)
-            }
+            mode = None
+        chunk_stats = {
+            "start": chunk[0][0],  # Начальное время интервала
+            "end": chunk[-1][0],   # Конечное время интервала
+            "count": len(values),  # Количество значений
+            "mean": statistics.mean(values),  # Среднее значение
+            "mode": mode,
+            "median": statistics.median(values)  # Медиана
+        }
         stats.append(chunk_stats)  # Добавление результатов в общий список
     return stats
 
+# ======= ПОТОКОВАЯ ОБРАБОТКА ФАЙЛА =======
+def stream_statistics(filename, interval_minutes=5, reader=iter_data_from_file, mode="drift", step_minutes=1):
+    """
+    Считает статистики по интервалам за один проход по файлу: чтение, разбиение
+    и расчёт идут генераторами, в памяти одновременно находится только один интервал.
+    Если файл не упорядочен по времени, он перечитывается через внешнюю сортировку.
+    reader(filename) — генератор записей (datetime, value), по умолчанию iter_data_from_file.
+
+    Режимы разбиения (mode):
+    - drift: как split_data — интервал начинается с первой записи после предыдущего;
+    - fixed: фиксированная сетка по времени суток (iter_fixed_intervals);
+    - sliding: скользящие окна с шагом step_minutes (iter_sliding_windows).
+    """
+    def compute(records):
+        if mode == "sliding":
+            return list(iter_sliding_windows(records, interval_minutes, step_minutes))
+        split = iter_fixed_intervals if mode == "fixed" else iter_intervals
+        return calculate_statistics(split(records, interval_minutes))
+
+    try:
+        return compute(reader(filename))
+    except OutOfOrderError:
+        # Данные не упорядочены: сортируем их порциями во временных файлах и сливаем
+        return compute(external_sort(reader(filename)))
+
 # ======= ФУНКЦИЯ ВЫВОДА РЕЗУЛЬТАТОВ НА ЭКРАН =======
 def print_statistics(stats):
     """
@@ -83,25 +131,82 @@ def print_statistics(stats):
     - stats: список словарей со статистическими данными
     """
     for i, s in enumerate(stats):  # Перебираем все интервалы
-        print(f"Интервал {i + 1} ({s['start']} - {s['end']}):")
-        print(f"  Кол-во значений: {s['count']}")
-        print(f"  Среднее значение: {s['mean']:.2f}")
-        print(f"  Мода: {s['mode'] if s['mode'] is not None else 'Не определена'}")
-        print(f"  Медиана: {s['median']:.2f}")
-        print()  # Пустая строка между интервалами
+        print_interval(i + 1, s)
+
+def print_interval(number, s):
+    """Выводит статистику одного интервала с порядковым номером number."""
+    print(f"Интервал {number} ({s['start']} - {s['end']}):")
+    print(f"  Кол-во значений: {s['count']}")
+    print(f"  Среднее значение: {s['mean']:.2f}")
+    print(f"  Мода: {s['mode'] if s['mode'] is not None else 'Не определена'}")
+    print(f"  Медиана: {s['median']:.2f}")
+    print()  # Пустая строка между интервалами
 
 # ======= ОСНОВНАЯ ТОЧКА ВХОДА =======
 if __name__ == "__main__":
-    # Проверяем наличие аргументов командной строки
-    if len(sys.argv) < 2:
-        print("Использование: python main.py <имя_файла> [интервал_в_минутах]")
-        sys.exit(1)  # Завершаем выполнение, если нет обязательного аргумента
-
-    filename = sys.argv[1]  # Получаем имя файла из аргумента
-    interval = int(sys.argv[2]) if len(sys.argv) > 2 else 5  # Интервал разбиения (по умолчанию 5 минут)
-
-    # Последовательность шагов:
-    data = read_data_from_file(filename)  # Считываем и преобразуем данные
-    intervals = split_data(data, interval_minutes=interval)  # Делим данные по времени
-    stats = calculate_statistics(intervals)  # Расчёт статистик для каждого интервала
-    print_statistics(stats)  # Вывод статистик на экран
+    # Разбор аргументов: имя файла, интервал в минутах (по умолчанию 5) и режим обработки
+    parser = argparse.ArgumentParser(description="Статистики по временным интервалам из CSV-файла")
+    parser.add_argument("filename", help="CSV-файл: время в секундах, значение ('-' — stdin в онлайн-режиме)")
+    parser.add_argument("interval", nargs="?", type=int, default=5, help="интервал в минутах (по умолчанию 5)")
+    parser.add_argument("--columnar", action="store_true",
+                        help="колоночный режим на NumPy: пакетный расчёт по всем интервалам")
+    parser.add_argument("--online", action="store_true",
+                        help="онлайн-режим: выводить интервал сразу после его закрытия (файл или stdin)")
+    parser.add_argument("--follow", action="store_true",
+                        help="следить за дописываемым файлом, как tail -f (включает --online)")
+    parser.add_argument("--mode", choices=("drift", "fixed", "sliding"), default="drift",
+                        help="разбиение: drift — от первой записи (по умолчанию), fixed — фиксированная сетка, "
+                             "sliding — скользящие окна")
+    parser.add_argument("--step", type=float, default=1,
+                        help="шаг скользящих окон в минутах (по умолчанию 1)")
+    parser.add_argument("--cache", action="store_true",
+                        help="сохранять разобранные колонки в бинарный кэш и брать их оттуда при повторных запусках")
+    parser.add_argument("--cache-dir", default=None, help="каталог кэша (по умолчанию ~/.cache/lab2)")
+    parser.add_argument("--cache-limit", type=int, default=1024, help="ограничение размера кэша в МБ (по умолчанию 1024)")
+    args = parser.parse_args()
+    if args.mode != "drift" and (args.online or args.follow or args.columnar or args.filename == "-"):
+        parser.error("режимы fixed и sliding поддерживаются только при обычной потоковой обработке")
+    if args.step <= 0:
+        parser.error("шаг --step должен быть положительным")
+
+    # Кэш колонок: повторный анализ того же файла (например, с другим интервалом) идёт без разбора CSV
+    loader = reader = None
+    if args.cache:
+        from cache import DEFAULT_DIR, ColumnCache  # NumPy нужен только при работе с кэшем
+        column_cache = ColumnCache(args.cache_dir or DEFAULT_DIR, args.cache_limit * 1024 * 1024)
+        loader = column_cache.load
+
+        def reader(filename):
+            try:
+                seconds, values = column_cache.load(filename)
+            except FileNotFoundError:
+                print(f"Файл {filename} не найден.")
+                return
+            yield from iter_data_from_columns(seconds, values)
+
+    if args.online or args.follow or args.filename == "-":
+        # Онлайн-режим: каждая запись обновляет накопители открытого интервала,
+        # статистика печатается в момент закрытия интервала
+        from online import run_online
+        closed = 0
+
+        def on_close(s):
+            global closed
+            closed += 1
+            print_interval(closed, s)
+            sys.stdout.flush()  # Чтобы интервал был виден сразу, даже при выводе в канал
+
+        run_online(args.filename, args.interval, parse_row, on_close, follow=args.follow)
+    elif args.columnar:
+        # Колоночный режим: файл загружается в массивы, статистики считаются векторно
+        from columnar import columnar_statistics  # NumPy нужен только в этом режиме
+        if loader:
+            stats = columnar_statistics(args.filename, interval_minutes=args.interval, loader=loader)
+        else:
+            stats = columnar_statistics(args.filename, interval_minutes=args.interval)
+        print_statistics(stats)  # Вывод статистик на экран
+    else:
+        # Чтение, разбиение по времени и расчёт статистик — потоком за один проход
+        stats = stream_statistics(args.filename, interval_minutes=args.interval,
+                                  reader=reader or iter_data_from_file, mode=args.mode, step_minutes=args.step)
+        print_statistics(stats)  # Вывод статистик на экран
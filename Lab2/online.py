@@ -0,0 +1,159 @@
+# online.py
+# Онлайн-режим: записи поступают по одной (растущий файл или stdin), а статистика
+# интервала выдаётся сразу, как только правило split_data его закрывает.
+# Для каждого открытого интервала хранятся только накопители:
+#   - количество и точная сумма (для среднего);
+#   - две кучи для медианы (добавление за O(log n));
+#   - счётчики значений и текущая мода (обновление за O(1)).
+
+from collections import Counter  # Частоты значений для моды
+from datetime import timedelta  # Для вычисления конца интервала
+from fractions import Fraction  # Точная сумма: среднее совпадает со statistics.mean
+import csv  # Для разбора строк CSV
+import heapq  # Кучи для потоковой медианы
+import sys  # Для чтения из stdin
+import time  # Для ожидания новых строк в режиме слежения за файлом
+
+
+class RunningMedian:
+    """
+    Потоковая медиана на двух кучах: в lower (max-куча, значения со знаком минус)
+    хранится меньшая половина, в upper (min-куча) — большая.
+    """
+
+    def __init__(self):
+        self.lower = []  # Меньшая половина (max-куча через отрицание)
+        self.upper = []  # Большая половина (min-куча)
+
+    def add(self, value):
+        """Добавляет значение за O(log n), сохраняя баланс куч (lower длиннее upper не более чем на 1)."""
+        if self.lower and value > -self.lower[0]:
+            heapq.heappush(self.upper, value)
+        else:
+            heapq.heappush(self.lower, -value)
+        if len(self.lower) > len(self.upper) + 1:
+            heapq.heappush(self.upper, -heapq.heappop(self.lower))
+        elif len(self.upper) > len(self.lower):
+            heapq.heappush(self.lower, -heapq.heappop(self.upper))
+
+    def median(self):
+        """Медиана по тем же правилам, что statistics.median."""
+        if len(self.lower) > len(self.upper):
+            return -self.lower[0]
+        return (-self.lower[0] + self.upper[0]) / 2
+
+
+class IntervalAccumulator:
+    """Накопитель статистик одного открытого интервала."""
+
+    def __init__(self, start, end_time):
+        self.start = start  # Время первой записи интервала
+        self.last = start  # Время последней записи интервала
+        self.end_time = end_time  # Граница: записи с временем >= end_time закрывают интервал
+        self.count = 0
+        self.total = Fraction(0)  # Точная сумма значений
+        self.median = RunningMedian()
+        self.counts = Counter()
+        self.first_seen = {}  # Порядковый номер первого появления значения
+        self.mode = None
+        self.mode_count = 0
+
+    def add(self, dt, value):
+        """Учитывает запись (dt, value) в накопителях."""
+        self.last = dt
+        self.count += 1
+        self.total += Fraction(value)
+        self.median.add(value)
+
+        # Мода как у statistics.mode: наибольшая частота, при равенстве — значение, встреченное раньше
+        self.first_seen.setdefault(value, self.count)
+        self.counts[value] += 1
+        c = self.counts[value]
+        if c > self.mode_count or (c == self.mode_count and self.first_seen[value] < self.first_seen[self.mode]):
+            self.mode, self.mode_count = value, c
+
+    def statistics(self):
+        """Возвращает словарь в формате calculate_statistics."""
+        return {
+            "start": self.start,
+            "end": self.last,
+            "count": self.count,
+            "mean": float(self.total / self.count),
+            "mode": self.mode,
+            "median": self.median.median(),
+        }
+
+
+class OnlineIntervals:
+    """
+    Инкрементальное разбиение на интервалы с расчётом статистик.
+    Закрытый интервал сразу передаётся в on_close(stats).
+    """
+
+    def __init__(self, on_close, interval_minutes=5):
+        self.on_close = on_close
+        self.length = timedelta(minutes=interval_minutes)
+        self.current = None  # Открытый интервал
+
+    def add(self, dt, value):
+        """Добавляет запись; если она выходит за границу открытого интервала, тот закрывается."""
+        # Запись с более ранним временем (нарушение порядка) остаётся в открытом интервале:
+        # вернуться к уже выданным интервалам в онлайн-режиме нельзя
+        if self.current is None or dt >= self.current.end_time:
+            self.flush()
+            self.current = IntervalAccumulator(dt, dt + self.length)
+        self.current.add(dt, value)
+
+    def flush(self):
+        """Закрывает открытый интервал (например, в конце потока)."""
+        if self.current is not None:
+            self.on_close(self.current.statistics())
+            self.current = None
+
+
+def follow_lines(path, poll_interval=0.5):
+    """
+    Перебирает строки растущего файла, как tail -f: после конца файла ждёт новых данных.
+    Незавершённая последняя строка (без перевода строки) откладывается до дозаписи.
+    """
+    with open(path, newline='', encoding='utf-8') as f:
+        pending = ""
+        while True:
+            chunk = f.readline()
+            if not chunk:
+                time.sleep(poll_interval)
+                continue
+            pending += chunk
+            if pending.endswith("\n"):
+                yield pending
+                pending = ""
+
+
+def read_lines(source, follow=False):
+    """Источник строк: stdin (source == '-'), файл целиком или растущий файл (follow=True)."""
+    if source == "-":
+        yield from sys.stdin
+    elif follow:
+        yield from follow_lines(source)
+    else:
+        with open(source, newline='', encoding='utf-8') as f:
+            yield from f
+
+
+def run_online(source, interval_minutes, parse_row, on_close, follow=False):
+    """
+    Читает строки из source, разбирает их parse_row и подаёт в OnlineIntervals.
+    По окончании потока (или по Ctrl+C в режиме слежения) закрывает последний интервал.
+    """
+    engine = OnlineIntervals(on_close, interval_minutes)
+    try:
+        for row in csv.reader(read_lines(source, follow)):
+            record = parse_row(row)
+            if record is not None:
+                engine.add(*record)
+    except FileNotFoundError:
+        print(f"Файл {source} не найден.")
+    except KeyboardInterrupt:
+        pass  # Остановка слежения за файлом
+    finally:
+        engine.flush()
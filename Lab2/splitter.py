@@ -1,5 +1,11 @@
 # splitter.py
-from datetime import timedelta  # Импортируем timedelta для вычислений с временем
+from collections import deque  # Очередь записей скользящего окна
+from datetime import datetime, timedelta  # Импортируем timedelta для вычислений с временем
+from fractions import Fraction  # Точная сумма значений окна
+import bisect  # Упорядоченный список значений окна для медианы
+import heapq  # Для слияния отсортированных порций и кучи кандидатов в моду
+import pickle  # Для записи порций во временные файлы
+import tempfile  # Для временных файлов внешней сортировки
 
 def split_data(data, interval_minutes=5):
     """
@@ -34,3 +40,247 @@ def split_data(data, interval_minutes=5):
         intervals.append(current_chunk)  # Добавляем последний непустой интервал
 
     return intervals  # Возвращаем список интервалов
+
+
+class OutOfOrderError(ValueError):
+    """Исключение: во входном потоке встретилась запись раньше предыдущей по времени."""
+
+
+def iter_intervals(records, interval_minutes=5):
+    """
+    Потоковый вариант split_data для данных, уже упорядоченных по времени.
+
+    Аргументы:
+    - records: итерируемый объект с кортежами (datetime, значение), например генератор чтения файла
+    - interval_minutes: продолжительность интервала в минутах (по умолчанию 5)
+
+    Возвращает генератор интервалов (списков кортежей) по тем же правилам, что и split_data.
+    В памяти хранится только текущий интервал. Если запись нарушает порядок,
+    выбрасывается OutOfOrderError — тогда данные нужно предварительно отсортировать (external_sort).
+    """
+    length = timedelta(minutes=interval_minutes)  # Длительность интервала
+    current_chunk = []  # Текущий интервал, который заполняется
+    end_time = None  # Конец текущего интервала
+    prev_time = None  # Время предыдущей записи для проверки порядка
+
+    for dt, value in records:
+        if prev_time is not None and dt < prev_time:
+            raise OutOfOrderError(f"Запись {dt} идёт после {prev_time}")
+        prev_time = dt
+        if end_time is not None and dt < end_time:
+            current_chunk.append((dt, value))  # Добавляем в текущий интервал
+        else:
+            if current_chunk:
+                yield current_chunk  # Отдаём завершённый интервал
+            current_chunk = [(dt, value)]  # Начинаем новый интервал с текущего значения
+            end_time = dt + length
+
+    if current_chunk:
+        yield current_chunk  # Последний непустой интервал
+
+
+def external_sort(records, run_size=100_000):
+    """
+    Сортирует поток записей (datetime, значение) по времени с ограниченной памятью.
+
+    Записи читаются порциями по run_size, каждая порция сортируется и сбрасывается
+    во временный файл, затем файлы сливаются через heapq.merge. Сортировка устойчивая,
+    как и list.sort в split_data: записи с одинаковым временем сохраняют исходный порядок.
+    """
+    runs = []  # Временные файлы с отсортированными порциями
+    try:
+        run = []
+        for record in records:
+            run.append(record)
+            if len(run) >= run_size:
+                runs.append(_dump_run(run))
+                run = []
+        if run:
+            runs.append(_dump_run(run))
+        yield from heapq.merge(*(_load_run(f) for f in runs), key=lambda x: x[0])
+    finally:
+        for f in runs:
+            f.close()  # Временные файлы удаляются при закрытии
+
+
+# Сколько записей сериализуется за раз во временный файл (столько же читается при слиянии)
+_RUN_BLOCK = 4096
+
+
+def _dump_run(run):
+    """Сортирует порцию и записывает её во временный файл блоками."""
+    run.sort(key=lambda x: x[0])
+    f = tempfile.TemporaryFile()
+    for i in range(0, len(run), _RUN_BLOCK):
+        pickle.dump(run[i:i + _RUN_BLOCK], f, protocol=pickle.HIGHEST_PROTOCOL)
+    f.seek(0)
+    return f
+
+
+def _load_run(f):
+    """Читает порцию из временного файла по одному блоку."""
+    while True:
+        try:
+            block = pickle.load(f)
+        except EOFError:
+            return
+        yield from block
+
+
+# Начало отсчёта сетки фиксированных интервалов: полночь, поэтому интервалы,
+# на которые делятся сутки (1, 5, 15, 60 минут...), совпадают с «круглым» временем в любых файлах
+GRID_ORIGIN = datetime(2000, 1, 1)
+
+
+def iter_fixed_intervals(records, interval_minutes=5, origin=GRID_ORIGIN):
+    """
+    Разбивает упорядоченный поток на интервалы фиксированной сетки:
+    [origin + k * длительность, origin + (k + 1) * длительность).
+
+    В отличие от split_data, границы не зависят от первой записи, поэтому интервалы
+    разных записей совпадают и их можно сопоставлять и объединять.
+    Возвращает генератор непустых интервалов; при нарушении порядка — OutOfOrderError.
+    """
+    length = timedelta(minutes=interval_minutes)
+    current_chunk = []
+    current_bucket = None  # Номер ячейки сетки текущего интервала
+    prev_time = None
+
+    for dt, value in records:
+        if prev_time is not None and dt < prev_time:
+            raise OutOfOrderError(f"Запись {dt} идёт после {prev_time}")
+        prev_time = dt
+        bucket = (dt - origin) // length
+        if bucket != current_bucket:
+            if current_chunk:
+                yield current_chunk
+            current_chunk = []
+            current_bucket = bucket
+        current_chunk.append((dt, value))
+
+    if current_chunk:
+        yield current_chunk
+
+
+# Во сколько раз куча кандидатов в моду может превысить число различных значений окна,
+# прежде чем она будет перестроена без устаревших записей
+_MODE_HEAP_SLACK = 4
+
+
+class WindowStats:
+    """
+    Статистики скользящего окна с добавлением справа и удалением слева:
+    - количество и точная сумма — O(1) на операцию;
+    - медиана — упорядоченный список (поиск bisect за O(log n), сдвиг — memmove);
+    - мода — счётчики и куча кандидатов с ленивым удалением устаревших записей, O(log n).
+      Устаревшие записи, не дошедшие до вершины кучи, удаляются перестройкой кучи, когда она
+      становится в _MODE_HEAP_SLACK раз больше числа значений окна: память зависит от окна,
+      а не от длины потока, а перестройка в среднем стоит O(1) на операцию.
+    Результаты совпадают с statistics.mean / median / mode для значений окна.
+    """
+
+    def __init__(self):
+        self.records = deque()  # Записи окна (позиция, время, значение) в порядке времени
+        self.total = Fraction(0)
+        self.sorted_values = []
+        self.positions = {}  # Значение -> очередь позиций его записей в окне
+        self.mode_heap = []  # Кандидаты в моду: (-частота, первая позиция, значение)
+        self.next_position = 0
+
+    def __len__(self):
+        return len(self.records)
+
+    def push(self, dt, value):
+        """Добавляет запись в конец окна."""
+        position = self.next_position
+        self.next_position += 1
+        self.records.append((position, dt, value))
+        self.total += Fraction(value)
+        bisect.insort(self.sorted_values, value)
+        queue = self.positions.setdefault(value, deque())
+        queue.append(position)
+        self._push_candidate(value, queue)
+
+    def pop_before(self, start):
+        """Удаляет из начала окна записи с временем раньше start."""
+        while self.records and self.records[0][1] < start:
+            _, _, value = self.records.popleft()
+            self.total -= Fraction(value)
+            del self.sorted_values[bisect.bisect_left(self.sorted_values, value)]
+            queue = self.positions[value]
+            queue.popleft()  # Удаляется самая ранняя запись этого значения
+            if queue:
+                self._push_candidate(value, queue)
+            else:
+                del self.positions[value]
+
+    def _push_candidate(self, value, queue):
+        """Добавляет в кучу актуальную запись для value; при избытке устаревших записей перестраивает кучу."""
+        heapq.heappush(self.mode_heap, (-len(queue), queue[0], value))
+        if len(self.mode_heap) > _MODE_HEAP_SLACK * (len(self.positions) + 1):
+            self.mode_heap = [(-len(q), q[0], v) for v, q in self.positions.items()]
+            heapq.heapify(self.mode_heap)
+
+    def mode(self):
+        """Самое частое значение окна; при равенстве — встреченное в окне раньше."""
+        while True:
+            neg_count, first, value = self.mode_heap[0]
+            queue = self.positions.get(value)
+            if queue and len(queue) == -neg_count and queue[0] == first:
+                return value
+            heapq.heappop(self.mode_heap)  # Устаревший кандидат
+
+    def statistics(self):
+        """Словарь статистик окна в формате calculate_statistics."""
+        count = len(self.records)
+        values = self.sorted_values
+        return {
+            "start": self.records[0][1],
+            "end": self.records[-1][1],
+            "count": count,
+            "mean": float(self.total / count),
+            "mode": self.mode(),
+            "median": (values[(count - 1) // 2] + values[count // 2]) / 2,
+        }
+
+
+def iter_sliding_windows(records, interval_minutes=5, step_minutes=1):
+    """
+    Скользящие окна длительностью interval_minutes с шагом step_minutes по упорядоченному потоку.
+    Окна начинаются от первой записи: [t0 + k * шаг, t0 + k * шаг + длительность).
+
+    Возвращает генератор словарей статистик для каждого непустого окна. Соседние окна
+    не пересчитываются заново: записи добавляются справа и удаляются слева (WindowStats).
+    При нарушении порядка выбрасывается OutOfOrderError.
+    """
+    length = timedelta(minutes=interval_minutes)
+    step = timedelta(minutes=step_minutes)
+    window = WindowStats()
+    start = end = None  # Границы текущего окна
+    prev_time = None
+
+    for dt, value in records:
+        if prev_time is not None and dt < prev_time:
+            raise OutOfOrderError(f"Запись {dt} идёт после {prev_time}")
+        prev_time = dt
+        if start is None:
+            start, end = dt, dt + length
+        while dt >= end:
+            if window:
+                yield window.statistics()  # Окно закрыто: следующая запись уже за его концом
+            if not window or window.records[-1][1] < start + step:
+                # После сдвига окно опустеет — сразу переходим к первому окну, содержащему dt
+                k = max(1, (dt - end) // step + 1)
+            else:
+                k = 1
+            start += k * step
+            end += k * step
+            window.pop_before(start)
+        if dt >= start:  # Запись может попасть в промежуток между окнами, если шаг больше длины
+            window.push(dt, value)
+
+    # Хвост: окна, начинающиеся не позже последней записи
+    while window:
+        yield window.statistics()
+        start += step
+        window.pop_before(start)
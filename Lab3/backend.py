@@ -0,0 +1,232 @@
+#!/usr/bin/python3
+
+# Выбор реализации решета (бэкенда). Все бэкенды предоставляют одну и ту же функцию
+#   calculate_primes_bits(bits, lo, hi)
+# с той же битовой раскладкой, что и в calculate_primes.c (бит i — нечётное число 2 * i + 1),
+# поэтому PrimeSieve, кэш на диске и параллельный режим работают с любым из них.
+#
+# Порядок выбора (от быстрого к медленному):
+#   native — библиотека из calculate_primes.c через ctypes (ищется рядом с программой
+#            или собирается компилятором C, если он есть);
+#   numpy  — сегментированное решето на NumPy;
+#   python — сегментированное решето на чистом Python.
+
+import ctypes
+import os
+import shutil
+import subprocess
+import sys
+
+try:
+    import numpy as np
+except ImportError:  # NumPy необязателен: без него остаётся бэкенд python
+    np = None
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(HERE, "calculate_primes.c")
+
+# Сколько нечётных чисел обрабатывается за один сегмент в бэкендах на Python
+SEGMENT = 1 << 20
+
+BACKENDS = ("native", "numpy", "python")
+
+
+def library_name():
+    """Имя разделяемой библиотеки для текущей платформы."""
+    if sys.platform == "win32":
+        return "calculate_primes.dll"
+    if sys.platform == "darwin":
+        return "libcalculate_primes.dylib"
+    return "calculate_primes.so"
+
+
+def find_compiler():
+    """Ищет компилятор C: переменная окружения CC, затем cc, gcc, clang."""
+    for name in (os.environ.get("CC"), "cc", "gcc", "clang"):
+        if name and shutil.which(name):
+            return shutil.which(name)
+    return None
+
+
+def build_library(path):
+    """
+    Собирает calculate_primes.c в разделяемую библиотеку path.
+    Сборка идёт во временный файл, который затем переименовывается, чтобы
+    параллельно запущенные копии программы не загрузили недособранную библиотеку.
+    """
+    compiler = find_compiler()
+    if compiler is None:
+        raise OSError("не найден компилятор C (задайте переменную CC)")
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    command = [compiler, "-O2", "-shared", "-o", tmp_path, SOURCE]
+    if sys.platform != "win32":
+        command[2:2] = ["-fPIC"]
+        command.append("-lm")
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise OSError(f"ошибка сборки {SOURCE}: {result.stderr.strip()}")
+    os.replace(tmp_path, path)
+    return path
+
+
+class NativeBackend:
+    """Решето из calculate_primes.c, загруженное через ctypes."""
+
+    name = "native"
+
+    def __init__(self, path):
+        self.path = path
+        self.lib = ctypes.CDLL(path)
+        # void calculate_primes_bits(unsigned char bits[], long long lo, long long hi)
+        # (AttributeError, если библиотека собрана из старой версии calculate_primes.c)
+        self.lib.calculate_primes_bits.argtypes = [ctypes.POINTER(ctypes.c_ubyte),
+                                                   ctypes.c_longlong, ctypes.c_longlong]
+        self.lib.calculate_primes_bits.restype = None
+        self.calculate_primes_bits = self.lib.calculate_primes_bits
+
+    def __str__(self):
+        return f"{self.name} ({self.path})"
+
+    @classmethod
+    def load(cls, build=True):
+        """
+        Загружает библиотеку рядом с программой. Если её нет, она старше calculate_primes.c
+        или не содержит calculate_primes_bits, пробует собрать её заново (при build=True).
+        """
+        path = os.path.join(HERE, library_name())
+        stale = (not os.path.exists(path)
+                 or os.path.exists(SOURCE) and os.path.getmtime(SOURCE) > os.path.getmtime(path))
+        if stale and build and os.path.exists(SOURCE) and find_compiler():
+            build_library(path)
+        try:
+            return cls(path)
+        except AttributeError:
+            if not build:
+                raise OSError(f"{path} не содержит calculate_primes_bits")
+            return cls(build_library(path))
+
+
+def _base_primes(root):
+    """Нечётные простые числа до root включительно (обычное решето на bytearray)."""
+    composite = bytearray(root + 1)
+    for i in range(3, int(root ** 0.5) + 1, 2):
+        if not composite[i]:
+            composite[i * i::2 * i] = b"\x01" * len(range(i * i, root + 1, 2 * i))
+    return [i for i in range(3, root + 1, 2) if not composite[i]]
+
+
+def _first_multiple(p, seg):
+    """Индекс бита первого нечётного кратного p (не меньше p * p), попадающего в сегмент seg."""
+    low = 2 * seg + 1
+    start = max(p * p, (low + p - 1) // p * p)
+    if start % 2 == 0:
+        start += p
+    return start // 2
+
+
+def _store(bits, first, last, packed):
+    """
+    Записывает упакованные биты индексов [first & ~7, last | 7] в bits,
+    сохраняя биты крайних байтов, лежащие вне [first, last].
+    """
+    lo_byte, hi_byte = first >> 3, last >> 3
+    head = int(packed[0])
+    tail = int(packed[-1])
+    # Маски битов, которые относятся к диапазону, в первом и последнем байтах
+    head_mask = (0xFF << (first & 7)) & 0xFF
+    tail_mask = 0xFF >> (7 - (last & 7))
+    if lo_byte == hi_byte:
+        mask = head_mask & tail_mask
+        bits[lo_byte] = (bits[lo_byte] & ~mask & 0xFF) | (head & mask)
+        return
+    ctypes.memmove(ctypes.addressof(bits) + lo_byte + 1, bytes(packed[1:-1]), hi_byte - lo_byte - 1)
+    bits[lo_byte] = (bits[lo_byte] & ~head_mask & 0xFF) | (head & head_mask)
+    bits[hi_byte] = (bits[hi_byte] & ~tail_mask & 0xFF) | (tail & tail_mask)
+
+
+def _index_range(lo, hi):
+    """Индексы битов первого и последнего нечётного числа из [lo, hi] (или None)."""
+    lo = max(lo, 0)
+    if hi < 1 or lo > hi:
+        return None
+    first, last = lo // 2, (hi - 1) // 2
+    return (first, last) if first <= last else None
+
+
+class PythonBackend:
+    """Сегментированное решето на чистом Python (работает везде, но медленнее остальных)."""
+
+    name = "python"
+
+    def __str__(self):
+        return self.name
+
+    def calculate_primes_bits(self, bits, lo, hi):
+        bounds = _index_range(lo, hi)
+        if bounds is None:
+            return
+        first, last = bounds
+        base = _base_primes(int(hi ** 0.5) + 1)
+        # Таблица для упаковки: b"\x00"/b"\x01" -> b"0"/b"1"
+        to_digits = bytes.maketrans(b"\x00\x01", b"01")
+        for seg in range(first & ~7, last + 1, SEGMENT):
+            seg_end = min(seg + SEGMENT - 1, last | 7)
+            flags = bytearray(b"\x01") * (seg_end - seg + 1)
+            for p in base:
+                if p * p > 2 * seg_end + 1:
+                    break
+                start = _first_multiple(p, seg) - seg
+                if start < len(flags):
+                    flags[start::p] = bytes(len(range(start, len(flags), p)))
+            if seg == 0:
+                flags[0] = 0  # 1 — не простое число
+            # Упаковка: младший бит каждого байта — первый флаг (как у np.packbits(bitorder="little"))
+            value = int(flags.translate(to_digits)[::-1], 2)
+            packed = value.to_bytes(len(flags) // 8, "little")
+            _store(bits, max(first, seg), min(last, seg_end), packed)
+
+
+class NumpyBackend:
+    """Сегментированное решето на NumPy: вычёркивание кратных срезами массива."""
+
+    name = "numpy"
+
+    def __str__(self):
+        return self.name
+
+    def calculate_primes_bits(self, bits, lo, hi):
+        bounds = _index_range(lo, hi)
+        if bounds is None:
+            return
+        first, last = bounds
+        base = _base_primes(int(hi ** 0.5) + 1)
+        for seg in range(first & ~7, last + 1, SEGMENT):
+            seg_end = min(seg + SEGMENT - 1, last | 7)
+            flags = np.ones(seg_end - seg + 1, dtype=np.uint8)
+            for p in base:
+                if p * p > 2 * seg_end + 1:
+                    break
+                flags[_first_multiple(p, seg) - seg::p] = 0
+            if seg == 0:
+                flags[0] = 0  # 1 — не простое число
+            packed = np.packbits(flags, bitorder="little")
+            _store(bits, max(first, seg), min(last, seg_end), packed)
+
+
+def select_backend(preferred="auto"):
+    """
+    Возвращает бэкенд решета. При preferred="auto" выбирается самый быстрый из доступных:
+    native, затем numpy, затем python. Явно запрошенный недоступный бэкенд вызывает OSError.
+    """
+    if preferred in ("auto", "native"):
+        try:
+            return NativeBackend.load()
+        except OSError:
+            if preferred == "native":
+                raise
+    if preferred in ("auto", "numpy"):
+        if np is not None:
+            return NumpyBackend()
+        if preferred == "numpy":
+            raise OSError("NumPy не установлен")
+    return PythonBackend()
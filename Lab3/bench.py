@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+
+# Микробенчмарк бэкендов: время построения решета и подсчёта пар Гольдбаха.
+# Запуск: python bench.py [предел_решета] [конец_диапазона_для_исходного_цикла]
+
+import ctypes
+import sys
+import time
+
+from backend import BACKENDS, select_backend
+from goldbach import goldbach_lines, naive_lines
+from sieve import PrimeSieve, bits_size
+
+
+def measure(func, *args):
+    """Время выполнения func(*args) в секундах и её результат."""
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    limit = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    small = int(sys.argv[2]) if len(sys.argv) > 2 else 20_000
+
+    # Решето: все доступные бэкенды на одном пределе, результат сверяется с первым
+    print(f"Решето до {limit}:")
+    reference = None
+    for name in BACKENDS:
+        try:
+            backend = select_backend(name)
+        except OSError as e:
+            print(f"  {name:8} недоступен: {e}")
+            continue
+        bits = (ctypes.c_ubyte * bits_size(limit))()
+        elapsed, _ = measure(backend.calculate_primes_bits, bits, 0, limit)
+        same = reference is None or bytes(bits) == reference
+        reference = reference or bytes(bits)
+        print(f"  {name:8} {elapsed:8.3f} с{'' if same else '  (РАСХОЖДЕНИЕ!)'}")
+
+    # Подсчёт пар: векторизованный движок против исходного цикла на небольшом диапазоне
+    sieve = PrimeSieve(limit, select_backend())
+    print(f"Подсчёт пар на [4, {small}]:")
+    fast, fast_lines = measure(lambda: list(goldbach_lines(sieve, 4, small)))
+    slow, slow_lines = measure(lambda: list(naive_lines(sieve, 4, small)))
+    print(f"  {'numpy':8} {fast:8.3f} с")
+    print(f"  {'python':8} {slow:8.3f} с{'' if fast_lines == slow_lines else '  (РАСХОЖДЕНИЕ!)'}")
+    elapsed, _ = measure(lambda: sum(1 for _ in goldbach_lines(sieve, 4, limit)))
+    print(f"Подсчёт пар на [4, {limit}] (numpy): {elapsed:.3f} с")
+
+
+if __name__ == "__main__":
+    main()
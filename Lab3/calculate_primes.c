@@ -1,3 +1,7 @@
+#include <math.h>
+#include <stdlib.h>
+#include <string.h>
+
 #include "calculate_primes.h"
 
 /* Функция реализует решето Эратосфена для нахождения простых чисел */
@@ -18,6 +22,90 @@ void calculate_primes(int primes[], int n) {
     }
 }
 
+/* Размер сегмента в битах: 32 КБ битовой карты помещаются в кэш L1 */
+#define SEGMENT_BITS (32768LL * 8)
+
+/* Установить / сбросить бит с номером i в битовой карте */
+#define SET_BIT(bits, i) ((bits)[(i) >> 3] |= (unsigned char)(1u << ((i) & 7)))
+#define CLEAR_BIT(bits, i) ((bits)[(i) >> 3] &= (unsigned char)~(1u << ((i) & 7)))
+
+/* Целый квадратный корень (наибольшее r, такое что r * r <= n) */
+static long long isqrt_ll(long long n) {
+    long long r = (long long)sqrt((double)n);
+    while (r * r > n) r--;
+    while ((r + 1) * (r + 1) <= n) r++;
+    return r;
+}
+
+/* Сегментированное решето только по нечётным числам с упаковкой в биты.
+   Бит с номером i соответствует нечётному числу 2 * i + 1 (1 — простое, 0 — составное).
+   Заполняются только биты нечётных чисел из [lo, hi]; остальные биты не трогаются,
+   поэтому уже готовое решето можно дорастить до большего предела вызовом с lo = старый предел + 1.
+   Массив bits должен вмещать не меньше hi / 16 + 1 байт. */
+void calculate_primes_bits(unsigned char bits[], long long lo, long long hi) {
+    if (lo < 0) lo = 0;
+    if (hi < 1 || lo > hi) return;
+
+    long long first = lo / 2;        /* Индекс первого нечётного числа >= lo */
+    long long last = (hi - 1) / 2;   /* Индекс последнего нечётного числа <= hi */
+    if (first > last) return;
+
+    /* Базовые нечётные простые до sqrt(hi) — обычным решетом (их немного: до 31623 для hi = 10^9) */
+    long long root = isqrt_ll(hi);
+    unsigned char *composite = calloc((size_t)(root / 2 + 1), 1);
+    long long *base = malloc(sizeof(long long) * (size_t)(root / 2 + 1));
+    long long base_count = 0;
+    if (composite == NULL || base == NULL) {
+        free(composite);
+        free(base);
+        return;
+    }
+    for (long long i = 3; i <= root; i += 2) {
+        if (!composite[i / 2]) {
+            base[base_count++] = i;
+            for (long long j = i * i; j <= root; j += 2 * i) {
+                composite[j / 2] = 1;
+            }
+        }
+    }
+
+    /* Обрабатываем диапазон сегментами, чтобы рабочая часть битовой карты оставалась в кэше */
+    for (long long seg = first; seg <= last; seg += SEGMENT_BITS) {
+        long long seg_end = seg + SEGMENT_BITS - 1;
+        if (seg_end > last) seg_end = last;
+
+        /* Помечаем все числа сегмента как простые: края побитно, середину — memset */
+        long long i = seg;
+        for (; i <= seg_end && (i & 7) != 0; i++) SET_BIT(bits, i);
+        long long full = (seg_end + 1 - i) >> 3;
+        if (full > 0) {
+            memset(bits + (i >> 3), 0xFF, (size_t)full);
+            i += full << 3;
+        }
+        for (; i <= seg_end; i++) SET_BIT(bits, i);
+
+        /* Вычёркиваем нечётные кратные каждого базового простого p.
+           Соседние нечётные кратные p отличаются на 2p, то есть на p в индексах битов. */
+        long long seg_low = 2 * seg + 1;
+        long long seg_high = 2 * seg_end + 1;
+        for (long long b = 0; b < base_count; b++) {
+            long long p = base[b];
+            if (p * p > seg_high) break;
+            long long start = ((seg_low + p - 1) / p) * p;  /* Первое кратное p >= seg_low */
+            if (start < p * p) start = p * p;
+            if (start % 2 == 0) start += p;                  /* Нужны только нечётные кратные */
+            for (long long j = start / 2; j <= seg_end; j += p) {
+                CLEAR_BIT(bits, j);
+            }
+        }
+    }
+
+    if (first == 0) CLEAR_BIT(bits, 0); /* 1 — не простое число */
+
+    free(composite);
+    free(base);
+}
+
 
 /* Комментарии к процессу:
 	1) С начала помечаем все элементы массива как 1 (как простые числа)
@@ -4,6 +4,10 @@
 /* Объявление функции calculate_primes */
 void calculate_primes(int primes[], int n);
 
+/* Сегментированное битовое решето по нечётным числам:
+   бит i массива bits соответствует числу 2 * i + 1, заполняется диапазон [lo, hi] */
+void calculate_primes_bits(unsigned char bits[], long long lo, long long hi);
+
 #endif // CALCULATE_PRIMES_H
 
 /*Основная задача calculate_primes.h
@@ -0,0 +1,181 @@
+#!/usr/bin/python3
+
+# Векторизованный подсчёт разложений Гольдбаха для всех чётных k из [n, m].
+# Вместо двойного цикла по k и x работаем сразу со всем решетом через NumPy:
+#   - количество пар считается свёрткой индикатора простых чисел с самим собой (FFT),
+#     причём берутся только те части решета, которые нужны для k из [n, m];
+#   - первая пара ищется перебором малых простых x сразу для всех ещё не найденных k.
+
+import ctypes
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy goldbach_lines работает исходным циклом
+    np = None
+
+# Чем считаются пары: векторизованно на NumPy или исходным циклом
+PAIR_BACKEND = "numpy" if np is not None else "python"
+
+
+def as_indicator(primes, m):
+    """
+    Приводит решето к массиву NumPy uint8 длины m + 1 (1 — простое, 0 — составное).
+    Принимает битовое решето PrimeSieve, массив ctypes, массив NumPy или любую последовательность 0/1.
+    """
+    if hasattr(primes, "indicator"):
+        return primes.indicator(0, m)  # PrimeSieve распаковывает биты сам
+    if isinstance(primes, ctypes.Array):
+        arr = np.ctypeslib.as_array(primes)  # ctypes-массив c_int без копирования
+    else:
+        arr = np.asarray(primes)
+    return (arr[:m + 1] != 0).astype(np.uint8)
+
+
+def _convolve(a, b):
+    """Линейная свёртка двух массивов 0/1 через FFT; результат округляется до целых."""
+    length = a.size + b.size - 1
+    size = 1 << (length - 1).bit_length()  # Степень двойки, не меньшая длины результата
+    spectrum = np.fft.rfft(a, size) * np.fft.rfft(b, size)
+    return np.rint(np.fft.irfft(spectrum, size)[:length]).astype(np.int64)
+
+
+def _pair_counts(p, n, m):
+    """
+    Считает разложения k = x + y (x <= y, оба простые) для всех чётных k из [n, m]
+    по решету, распакованному в массив p (длины не меньше m + 1).
+    Возвращает два массива одинаковой длины: ks (чётные k) и counts (количество пар).
+    """
+    if n % 2 != 0:
+        n += 1  # Работаем только с чётными k
+    ks = np.arange(n, m + 1, 2, dtype=np.int64)
+    if ks.size == 0:
+        return ks, np.zeros(0, dtype=np.int64)
+    h = n // 2
+
+    # Пары с x, y >= n/2: свёртка окна p[h..m-h] с самим собой даёт упорядоченные пары,
+    # каждая пара x != y посчитана дважды, пара x == k/2 — один раз
+    window = p[h:m - h + 1].astype(np.float64)
+    ordered = _convolve(window, window)
+    counts = (ordered[ks - n] + p[ks // 2]) // 2
+
+    # Пары с x < n/2: тогда y = k - x > n/2, и каждая пара встречается ровно один раз
+    if h > 2:
+        counts += _convolve(p[:h].astype(np.float64), p[h:m + 1].astype(np.float64))[ks - h]
+    return ks, counts
+
+
+def count_pairs(primes, n, m):
+    """
+    Считает разложения k = x + y (x <= y, оба простые) для всех чётных k из [n, m].
+
+    Возвращает три массива одинаковой длины:
+    - ks: чётные числа k
+    - counts: количество пар для каждого k
+    - first_x: наименьшее x в паре (0, если пар нет)
+    """
+    p = as_indicator(primes, m)
+    ks, counts = _pair_counts(p, n, m)
+    return ks, counts, first_pairs(p, ks, counts)
+
+
+def first_pairs(primes, ks, counts):
+    """
+    Находит для каждого k наименьшее простое x <= k/2, для которого k - x тоже простое
+    (0, если пар нет). primes — массив 0/1 или битовое решето PrimeSieve: его биты
+    читаются напрямую, поэтому время и память пропорциональны числу k, а не их величине.
+    Перебираем простые x по возрастанию и на каждом шаге проверяем сразу все
+    оставшиеся k; найденные k выбывают, поэтому набор быстро сокращается.
+    """
+    first_x = np.zeros(ks.size, dtype=np.int64)
+    pending = np.nonzero(counts > 0)[0]  # Индексы k, у которых пара точно есть
+    if pending.size == 0:
+        return first_x
+
+    limit = int(ks[pending[-1]]) // 2
+    if isinstance(primes, np.ndarray):
+        candidates = np.flatnonzero(primes[:limit + 1])
+        is_prime = lambda values: primes[values] != 0
+    else:
+        candidates = primes.primes(0, limit)  # Распаковываются только блоки с перебираемыми x
+        is_prime = primes.is_prime_array
+    for x in candidates:
+        rest = ks[pending]
+        hit = (rest >= 2 * x) & is_prime(rest - x)
+        first_x[pending[hit]] = x
+        pending = pending[~hit]
+        if pending.size == 0:
+            break
+    return first_x
+
+
+def format_lines(ks, counts, first_x):
+    """Строки отчёта "k count first_x first_y" для k, у которых есть хотя бы одна пара."""
+    found = counts > 0
+    for k, count, x in zip(ks[found].tolist(), counts[found].tolist(), first_x[found].tolist()):
+        yield f"{k} {count} {x} {k - x}"
+
+
+def goldbach_lines(primes, n, m):
+    """
+    Формирует строки отчёта "k count first_x first_y" для чётных k из [n, m],
+    у которых есть хотя бы одна пара (тот же формат, что и в main.py).
+    """
+    if np is None:
+        yield from naive_lines(primes, n, m)
+        return
+    yield from format_lines(*count_pairs(primes, n, m))
+
+
+def naive_lines(primes, n, m):
+    """
+    Исходный алгоритм из main.py: двойной цикл по k и x.
+    Оставлен как эталон для проверки векторизованной версии.
+    """
+    if n % 2 != 0:
+        n += 1
+    for k in range(n, m + 1, 2):
+        count = 0
+        first_x = 0
+        first_y = 0
+        for x in range(2, k // 2 + 1):
+            if primes[x] and primes[k - x]:
+                count += 1
+                if count == 1:
+                    first_x = x
+                    first_y = k - x
+        if count > 0:
+            yield f"{k} {count} {first_x} {first_y}"
+
+
+def simple_sieve(n):
+    """Решето Эратосфена на NumPy (используется для самопроверки без библиотеки на C)."""
+    primes = np.ones(n + 1, dtype=np.uint8)
+    primes[:2] = 0
+    for i in range(2, int(n ** 0.5) + 1):
+        if primes[i]:
+            primes[i * i::i] = 0
+    return primes
+
+
+def check(ranges=((4, 100), (5, 1000), (998, 3000), (4, 6))):
+    """
+    Сравнивает векторизованный подсчёт с исходным циклом на небольших диапазонах.
+    Возвращает True, если все строки совпали.
+    """
+    ok = True
+    for n, m in ranges:
+        primes = simple_sieve(m)
+        expected = list(naive_lines(primes, n, m))
+        actual = list(goldbach_lines(primes, n, m))
+        if expected != actual:
+            print(f"Расхождение на диапазоне [{n}, {m}]")
+            ok = False
+        else:
+            print(f"[{n}, {m}]: совпадает ({len(actual)} строк)")
+    return ok
+
+
+if __name__ == "__main__":
+    # Самопроверка: python goldbach.py
+    if not check():
+        exit(1)
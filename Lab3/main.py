@@ -1,20 +1,41 @@
 #!/usr/bin/python3
 
-import ctypes
+import argparse
+import sys
 
-# Загрузка библиотеки calculate_primes.dll
-try:
-    lib = ctypes.CDLL('./calculate_primes.dll')
-except OSError as e:
-    print(f"Ошибка загрузки calculate_primes.dll: {e}")
-    exit(1)
+from backend import BACKENDS, select_backend
+from goldbach import PAIR_BACKEND, goldbach_lines
+from sieve import PrimeSieve
+from sieve_cache import DEFAULT_PATH, load_sieve
 
-# Определение сигнатуры функции calculate_primes
-# void calculate_primes(int primes[], int n)
-lib.calculate_primes.argtypes = [ctypes.POINTER(ctypes.c_int), ctypes.c_int]
-lib.calculate_primes.restype = None
+def parse_args():
+    # Параметры командной строки
+    parser = argparse.ArgumentParser(description="Разложения чётных чисел из [n, m] в сумму двух простых")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="количество процессов для параллельного подсчёта (по умолчанию 1)")
+    parser.add_argument("--backend", choices=("auto",) + BACKENDS, default="auto",
+                        help="реализация решета (по умолчанию самая быстрая из доступных)")
+    parser.add_argument("--cache", default=DEFAULT_PATH,
+                        help=f"файл кэша решета (по умолчанию {DEFAULT_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="не использовать кэш решета на диске")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers должно быть не меньше 1")
+    return args
 
 def main():
+    args = parse_args()
+
+    # Выбор реализации решета: библиотека на C (при необходимости собирается), NumPy или чистый Python
+    try:
+        backend = select_backend(args.backend)
+    except OSError as e:
+        print(f"Ошибка загрузки бэкенда {args.backend}: {e}")
+        exit(1)
+    # Сообщаем о выбранных бэкендах в stderr, чтобы не смешивать с отчётом
+    print(f"Решето: {backend}; подсчёт пар: {PAIR_BACKEND}", file=sys.stderr)
+
     # Ввод двух чётных чисел n и m
     print("Введите два четных числа n и m (4 <= n < m < 10 000 000):")
     try:
@@ -32,28 +53,35 @@ def main():
     if n % 2 != 0:
         n += 1
 
-    # Создание массива для простых чисел
-    primes = (ctypes.c_int * (m + 1))()  # Массив размером m+1, инициализирован нулями
-    # Вызов функции calculate_primes для заполнения массива
-    lib.calculate_primes(primes, m)
+    # Битовое решето до m: функция calculate_primes_bits заполняет по биту на каждое нечётное число.
+    # По умолчанию решето берётся из кэша на диске и досчитывается только при большем m
+    if args.no_cache:
+        primes = PrimeSieve(m, backend)
+    else:
+        primes = load_sieve(m, backend, args.cache)
 
-    # Перебор всех чётных чисел k в диапазоне от n до m
-    for k in range(n, m + 1, 2):
-        count = 0  # Счётчик пар простых чисел
-        first_x = 0  # Первое простое число в паре
-        first_y = 0  # Второе простое число в паре
-
-        # Перебор чисел x от 2 до k/2
-        for x in range(2, k // 2 + 1):
-            if primes[x] and primes[k - x]:  # Если x и k-x простые
-                count += 1
-                if count == 1:  # Сохраняем первую пару
-                    first_x = x
-                    first_y = k - x
+    # Параллельный режим: отрезки k считаются в нескольких процессах (см. parallel.py),
+    # блоки текста приходят по порядку k, поэтому вывод совпадает с последовательным
+    if args.workers > 1:
+        try:
+            from parallel import parallel_blocks  # Нужен NumPy: импортируем только в этом режиме
+        except ImportError as e:
+            print(f"Параллельный режим недоступен: {e}")
+            exit(1)
+        for block in parallel_blocks(primes, n, m, args.workers):
+            sys.stdout.write(block)
+        return
 
-        # Вывод результата, если найдены пары
-        if count > 0:
-            print(f"{k} {count} {first_x} {first_y}")
+    # Подсчёт пар сразу для всех чётных k в диапазоне от n до m (векторизованно, см. goldbach.py)
+    # и вывод строк "k count first_x first_y" пачками, чтобы не вызывать print на каждую строку
+    batch = []
+    for line in goldbach_lines(primes, n, m):
+        batch.append(line)
+        if len(batch) >= 65536:
+            sys.stdout.write("\n".join(batch) + "\n")
+            batch.clear()
+    if batch:
+        sys.stdout.write("\n".join(batch) + "\n")
 
 if __name__ == "__main__":
     main()
@@ -62,11 +90,17 @@ if __name__ == "__main__":
 # 1) Программа запрашивает два числа n и m от пользователя.
 # 2) Проверяется, что 4 <= n < m < 10 000 000.
 # 3) Если n нечётное, оно увеличивается до ближайшего чётного.
-# 4) Создаётся массив ctypes для хранения индикаторов простых чисел.
-# 5) Функция calculate_primes из calculate_primes.dll заполняет массив primes.
-# 6) Для каждого чётного k от n до m:
-#    - Перебираются x от 2 до k/2.
-#    - Если x и k-x простые (primes[x] и primes[k-x] равны 1), увеличивается счётчик.
-#    - Первая найденная пара сохраняется в first_x и first_y.
+# 4) Создаётся битовое решето PrimeSieve (sieve.py): один бит на нечётное число вместо int на каждое.
+# 5) Функция calculate_primes_bits заполняет его сегментами по 32 КБ. Реализацию выбирает backend.py:
+#    библиотека из calculate_primes.c (ищется или собирается под текущую платформу), NumPy или Python.
+#    Готовое решето сохраняется в файл кэша (sieve_cache.py) с пределом и контрольной суммой;
+#    следующие запуски отображают файл в память, а при большем m досчитывают только новые числа.
+# 6) Для всех чётных k от n до m сразу (модуль goldbach.py):
+#    - Количество пар x + y = k считается свёрткой массива primes с самим собой через FFT.
+#    - Первая пара ищется перебором малых простых x одновременно для всех k.
 #    - Если пары найдены, выводится строка: k count first_x first_y.
-# 7) Перебор до k/2 предотвращает дублирование пар (например, 3+7 и 7+3 для k=10).
\ No newline at end of file
+# 7) Учитываются только пары с x <= k/2, чтобы не было дублей (например, 3+7 и 7+3 для k=10).
+# 8) С ключом --workers N свёртку (БПФ по схеме «четыре шага», по полосам матрицы) и поиск
+#    первой пары по отрезкам k делят N процессов; решето и массив свёртки передаются им
+#    через разделяемую память, а не копируются в каждый процесс.
+# 9) Исходный двойной цикл сохранён в goldbach.naive_lines; сверка: python goldbach.py
\ No newline at end of file
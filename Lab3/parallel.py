@@ -0,0 +1,152 @@
+#!/usr/bin/python3
+
+# Параллельный подсчёт разложений Гольдбаха. Вся тяжёлая работа делится между процессами:
+#
+# 1. Количество пар — свёртка индикатора нечётных простых с самим собой. Она считается
+#    через БПФ по схеме «четыре шага»: массив длины N = N1 * N2 рассматривается как
+#    матрица N1 x N2, и преобразование сводится к БПФ по столбцам, умножению на
+#    поворачивающие множители и БПФ по строкам. Столбцы (и строки) независимы, поэтому
+#    каждый проход делится на полосы между процессами без обменов, кроме границы прохода.
+#    Спектр возводится в квадрат прямо в проходе по строкам, там же делается обратное БПФ
+#    по строкам, а третий проход — обратное БПФ по столбцам. Работа та же, что у одного
+#    БПФ длины N, и делится поровну, поэтому время свёртки убывает почти линейно
+#    с числом процессов (пока хватает ядер и пропускной способности памяти).
+# 2. Диапазон [n, m] делится на отрезки по k: процессы берут количества пар из общей
+#    свёртки, ищут первую пару и формируют строки отчёта; работа отрезка пропорциональна
+#    его ширине.
+#
+# Битовое решето и массив свёртки лежат в разделяемой памяти (multiprocessing.shared_memory)
+# и читаются без копирования; главный процесс только раздаёт задания и выводит блоки.
+# Решето хранит только нечётные числа, и свёртка строится по ним же: пара x + y = k
+# из нечётных простых — это индексы (x - 1) / 2 + (y - 1) / 2 = k / 2 - 1, поэтому длина
+# свёртки ~m, а не ~2m. Единственная пара с чётным простым — 2 + 2 = 4.
+# Результаты собираются строго в порядке k, поэтому вывод совпадает с последовательным.
+
+import ctypes
+from multiprocessing import Pool, shared_memory
+
+import numpy as np
+
+from goldbach import first_pairs, format_lines
+from sieve import PrimeSieve
+
+# Решето и матрица свёртки, подключённые к разделяемой памяти, в каждом рабочем процессе
+_shared = None
+_sieve = None
+_shared_grid = None
+_grid = None  # Матрица N1 x N2 (complex128) — массив свёртки длины N по строкам
+
+# Сколько полос (отрезков) приходится на один процесс: мелкая нарезка выравнивает нагрузку
+# и позволяет выводить первые блоки, пока считаются следующие
+SHARDS_PER_WORKER = 4
+MIN_SHARD = 10_000
+
+
+def shard_ranges(n, m, parts):
+    """Делит чётные k из [n, m] на не более чем parts смежных отрезков [a, b]."""
+    if n % 2 != 0:
+        n += 1
+    total = (m - n) // 2 + 1  # Количество чётных k
+    if total <= 0:
+        return []
+    parts = max(1, min(parts, total))
+    ranges = []
+    for i in range(parts):
+        a = n + 2 * (total * i // parts)
+        b = n + 2 * (total * (i + 1) // parts - 1)
+        ranges.append((a, b))
+    return ranges
+
+
+def _strips(size, parts):
+    """Делит 0..size на не более чем parts смежных полос [lo, hi)."""
+    parts = max(1, min(parts, size))
+    return [(size * i // parts, size * (i + 1) // parts) for i in range(parts)]
+
+
+def _init_worker(name, limit, grid_name, shape):
+    """Подключает рабочий процесс к решету и матрице свёртки в разделяемой памяти (один раз на процесс)."""
+    global _shared, _sieve, _shared_grid, _grid
+    _shared = shared_memory.SharedMemory(name=name)
+    bits = (ctypes.c_ubyte * _shared.size).from_buffer(_shared.buf)
+    _sieve = PrimeSieve(limit, bits=bits)
+    _shared_grid = shared_memory.SharedMemory(name=grid_name)
+    _grid = np.ndarray(shape, dtype=np.complex128, buffer=_shared_grid.buf)
+
+
+def _twiddles(rows, lo, hi, sign):
+    """Поворачивающие множители exp(sign * 2πi * k1 * n2 / N) для столбцов lo..hi-1."""
+    size = _grid.size
+    turns = np.outer(np.arange(rows, dtype=np.int64), np.arange(lo, hi, dtype=np.int64)) % size
+    return np.exp(sign * 2j * np.pi / size * turns)
+
+
+def _convolution_pass(task):
+    """
+    Один проход БПФ «в четыре шага» над полосой матрицы:
+    - "forward": БПФ по столбцам lo..hi-1 и умножение на поворачивающие множители;
+    - "rows": БПФ по строкам lo..hi-1, квадрат спектра и обратное БПФ по строкам;
+    - "inverse": обратные множители и обратное БПФ по столбцам lo..hi-1.
+    """
+    kind, lo, hi = task
+    rows = _grid.shape[0]
+    if kind == "forward":
+        _grid[:, lo:hi] = np.fft.fft(_grid[:, lo:hi], axis=0) * _twiddles(rows, lo, hi, -1)
+    elif kind == "rows":
+        spectrum = np.fft.fft(_grid[lo:hi], axis=1)
+        spectrum *= spectrum
+        _grid[lo:hi] = np.fft.ifft(spectrum, axis=1)
+    else:
+        _grid[:, lo:hi] = np.fft.ifft(_grid[:, lo:hi] * _twiddles(rows, lo, hi, 1), axis=0)
+
+
+def _scan_shard(bounds):
+    """Берёт количества пар из свёртки, находит первые пары для отрезка k и возвращает его строки."""
+    a, b = bounds
+    ks = np.arange(a, b + 1, 2, dtype=np.int64)
+    half = ks // 2
+    # Упорядоченные пары нечётных простых: x != y посчитаны дважды, x == k/2 — один раз
+    ordered = np.rint(_grid.reshape(-1).real[half - 1]).astype(np.int64)
+    counts = (ordered + ((half % 2 == 1) & _sieve.is_prime_array(half))) // 2
+    counts[ks == 4] = 1  # 4 = 2 + 2 — единственная пара с чётным простым
+    lines = "\n".join(format_lines(ks, counts, first_pairs(_sieve, ks, counts)))
+    return lines + "\n" if lines else ""
+
+
+def parallel_blocks(sieve, n, m, workers):
+    """
+    Перебирает блоки текста отчёта для [n, m] в порядке возрастания k,
+    распределяя свёртку и отрезки по workers процессам.
+    """
+    if n % 2 != 0:
+        n += 1
+    if n > m:
+        return
+    odd = (m + 1) // 2  # Нечётные числа 1, 3, ..., не больше m
+    size = 1 << (2 * odd - 2).bit_length()  # Длина БПФ без наложения: не меньше длины свёртки
+    shape = (1 << (size.bit_length() - 1) // 2, size >> (size.bit_length() - 1) // 2)
+
+    shm = shared_memory.SharedMemory(create=True, size=len(sieve.bits))
+    shm_grid = shared_memory.SharedMemory(create=True, size=size * 16)
+    try:
+        shm.buf[:len(sieve.bits)] = memoryview(sieve.bits).cast("B")  # Одна копия решета на все процессы
+        grid = np.ndarray(size, dtype=np.complex128, buffer=shm_grid.buf)
+        grid[:] = 0
+        # Бит i решета — число 2i + 1, поэтому индикатор нечётных простых — это распакованные биты
+        packed = np.frombuffer(sieve.bits, dtype=np.uint8)[:(odd + 7) // 8]
+        grid.real[:odd] = np.unpackbits(packed, bitorder="little")[:odd]
+        del grid, packed
+
+        strips = workers * SHARDS_PER_WORKER
+        with Pool(workers, initializer=_init_worker, initargs=(shm.name, sieve.limit, shm_grid.name, shape)) as pool:
+            # Проходы идут по очереди: каждый следующий читает результат предыдущего целиком
+            pool.map(_convolution_pass, [("forward", lo, hi) for lo, hi in _strips(shape[1], strips)])
+            pool.map(_convolution_pass, [("rows", lo, hi) for lo, hi in _strips(shape[0], strips)])
+            pool.map(_convolution_pass, [("inverse", lo, hi) for lo, hi in _strips(shape[1], strips)])
+            parts = min(strips, max(1, (m - n) // MIN_SHARD))
+            # imap возвращает результаты в порядке отрезков, независимо от порядка завершения
+            yield from pool.imap(_scan_shard, shard_ranges(n, m, parts))
+    finally:
+        for block in (shm, shm_grid):
+            block.close()
+            block.unlink()
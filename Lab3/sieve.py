@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+
+# Обёртка над битовым решетом calculate_primes_bits (calculate_primes.c или бэкенд из backend.py).
+# Храним только нечётные числа, по одному биту на число: для m = 10^7 это ~625 КБ
+# вместо ~40 МБ у массива int, а для m = 10^9 — около 62 МБ.
+
+import ctypes
+
+try:
+    import numpy as np
+except ImportError:  # Без NumPy недоступен только метод indicator
+    np = None
+
+
+def bits_size(limit):
+    """Количество байт битовой карты для чисел от 0 до limit (бит i — число 2 * i + 1)."""
+    return limit // 16 + 1
+
+
+class PrimeSieve:
+    """
+    Решето Эратосфена до limit включительно, упакованное в биты (только нечётные числа).
+
+    Поддерживает тот же доступ, что и прежний массив ctypes: primes[i] возвращает 1 или 0,
+    поэтому код, написанный для массива int, работает без изменений.
+    """
+
+    def __init__(self, limit, backend=None, bits=None):
+        self.limit = limit
+        if bits is None:
+            # Новое решето: выделяем битовую карту (инициализирована нулями) и заполняем её
+            bits = (ctypes.c_ubyte * bits_size(limit))()
+            backend.calculate_primes_bits(bits, 0, limit)
+        # Иначе bits — уже готовая битовая карта (например, в разделяемой памяти другого процесса)
+        self.bits = bits
+
+    def is_prime(self, i):
+        """Проверяет, является ли i простым числом (0 <= i <= limit)."""
+        if i < 0 or i > self.limit:
+            raise IndexError(f"Число {i} вне диапазона решета [0, {self.limit}]")
+        if i % 2 == 0:
+            return i == 2
+        j = i >> 1
+        return (self.bits[j >> 3] >> (j & 7)) & 1 == 1
+
+    def is_prime_array(self, values):
+        """
+        Векторная проверка: массив NumPy bool для массива чисел values (0 <= values <= limit).
+        Биты читаются прямо из битовой карты, без распаковки диапазона.
+        """
+        values = np.asarray(values, dtype=np.int64)
+        j = values >> 1
+        packed = np.frombuffer(self.bits, dtype=np.uint8)
+        odd = ((packed[j >> 3] >> (j & 7)) & 1).astype(bool)
+        return np.where(values & 1 == 1, odd, values == 2)
+
+    def __getitem__(self, i):
+        return 1 if self.is_prime(i) else 0
+
+    def __len__(self):
+        return self.limit + 1
+
+    def primes(self, lo=0, hi=None):
+        """Перебирает простые числа из [lo, hi] по возрастанию."""
+        hi = self.limit if hi is None else min(hi, self.limit)
+        if lo <= 2 <= hi:
+            yield 2
+        lo = max(lo, 3)
+        if lo > hi:
+            return
+        if np is None:
+            yield from (i for i in range(lo | 1, hi + 1, 2) if self.is_prime(i))
+            return
+        # Распаковываем биты только нужного куска, блоками, чтобы не выделять память на весь диапазон
+        step = 1 << 20
+        for block in range(lo, hi + 1, step):
+            for p in self.indicator(block, min(block + step - 1, hi)).nonzero()[0]:
+                yield block + int(p)
+
+    def indicator(self, lo=0, hi=None):
+        """
+        Возвращает массив NumPy uint8 для чисел lo..hi: 1 — простое, 0 — нет.
+        Нужен векторизованному подсчёту в goldbach.py.
+        """
+        hi = self.limit if hi is None else min(hi, self.limit)
+        if lo > hi:
+            return np.zeros(0, dtype=np.uint8)
+        result = np.zeros(hi - lo + 1, dtype=np.uint8)
+        first_odd = lo | 1
+        if first_odd <= hi:
+            first, last = first_odd >> 1, (hi - 1) >> 1
+            packed = np.frombuffer(self.bits, dtype=np.uint8)[first >> 3:(last >> 3) + 1]
+            odd = np.unpackbits(packed, bitorder="little")[first & 7:(first & 7) + last - first + 1]
+            result[first_odd - lo::2] = odd
+        if lo <= 2 <= hi:
+            result[2 - lo] = 1
+        return result
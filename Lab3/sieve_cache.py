@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+
+# Кэш битового решета на диске. Формат файла:
+#   заголовок: магическая строка (8 байт), предел limit (uint64), CRC32 битовой карты (uint32), 4 байта резерва;
+#   далее битовая карта calculate_primes_bits для чисел 0..limit.
+# При повторных запусках файл отображается в память (mmap), и решето не пересчитывается.
+# Если нужен больший предел, старая карта копируется и досчитывается только новый хвост.
+
+import ctypes
+import mmap
+import os
+import struct
+import zlib
+
+from sieve import PrimeSieve, bits_size
+
+MAGIC = b"PSIEVE01"
+HEADER = struct.Struct("<8sQI4x")
+
+# Файл кэша по умолчанию — рядом с программой
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "primes.sieve")
+
+
+def _checksum(mm, limit):
+    """CRC32 битовой карты решета до limit."""
+    with memoryview(mm) as view:
+        return zlib.crc32(view[HEADER.size:HEADER.size + bits_size(limit)])
+
+
+def _open_cached(path):
+    """
+    Открывает файл кэша и отображает его в память.
+    Возвращает (limit, mmap) или None, если файла нет или он повреждён.
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < HEADER.size:
+                return None
+            # ACCESS_COPY: страницы читаются лениво, а запись (её не бывает) не попала бы в файл
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (OSError, ValueError):
+        return None
+
+    magic, limit, crc = HEADER.unpack_from(mm, 0)
+    if magic != MAGIC or size < HEADER.size + bits_size(limit) or _checksum(mm, limit) != crc:
+        mm.close()
+        return None
+    return limit, mm
+
+
+def _wrap(limit, mm):
+    """Создаёт PrimeSieve поверх битовой карты в отображённом файле (без копирования)."""
+    bits = (ctypes.c_ubyte * bits_size(limit)).from_buffer(mm, HEADER.size)
+    return PrimeSieve(limit, bits=bits)
+
+
+def _build(path, m, backend, cached):
+    """
+    Строит (или досчитывает) решето до m во временном файле и атомарно заменяет им кэш.
+    cached — результат _open_cached для старого файла или None.
+    """
+    old_limit = 0
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w+b") as f:
+        if cached is not None:
+            old_limit, old_mm = cached
+            f.write(old_mm[:HEADER.size + bits_size(old_limit)])  # Готовая часть решета
+            old_mm.close()
+        f.truncate(HEADER.size + bits_size(m))  # Новые байты заполняются нулями
+        mm = mmap.mmap(f.fileno(), 0)
+
+    bits = (ctypes.c_ubyte * bits_size(m)).from_buffer(mm, HEADER.size)
+    # Досчитываем только числа, которых ещё нет в кэше
+    backend.calculate_primes_bits(bits, old_limit + 1 if old_limit else 0, m)
+    HEADER.pack_into(mm, 0, MAGIC, m, _checksum(mm, m))
+    mm.flush()
+
+    # Замена через rename: другие процессы, уже открывшие старый файл, продолжают читать его
+    try:
+        os.replace(tmp_path, path)
+    except OSError:
+        pass  # Например, старый файл занят в Windows — кэш обновится при следующем запуске
+    return PrimeSieve(m, bits=bits)
+
+
+def load_sieve(m, backend, path=DEFAULT_PATH):
+    """
+    Возвращает решето с пределом не меньше m, используя файл кэша path.
+    Повреждённый или отсутствующий кэш строится заново, слишком короткий — досчитывается.
+    """
+    cached = _open_cached(path)
+    if cached is not None and cached[0] >= m:
+        return _wrap(*cached)
+    return _build(path, m, backend, cached)
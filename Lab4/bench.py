@@ -0,0 +1,103 @@
+# bench.py
+# Замер jsontool validate на каталоге синтетических JSON-файлов и проверка результатов:
+# синтаксис всегда, схема (--schema и --schema --each) — если установлен пакет jsonschema.
+# Запуск: python bench.py [количество_файлов] [элементов_в_файле]
+
+import contextlib  # Для перехвата отчёта run_validate
+import io  # Для перехвата отчёта run_validate
+import json  # Для генерации файлов и разбора отчёта
+import os  # Для путей
+import random  # Для случайных данных
+import shutil  # Для удаления временного каталога
+import sys  # Для аргументов командной строки
+import tempfile  # Для временного каталога
+import time  # Для замера времени
+
+from jsoncore import jsonschema
+from jsontool import expand_inputs, run_validate
+
+SCHEMA = {
+    "type": "array",
+    "items": {
+        "type": "object",
+        "properties": {"id": {"type": "integer"}, "email": {"type": "string", "pattern": "@"}},
+        "required": ["id", "email"],
+    },
+}
+
+def make_files(directory, count, items, seed=0):
+    """
+    Записывает count файлов по items объектов. Примерно каждый десятый файл с ошибкой синтаксиса,
+    каждый пятый — с элементом, не подходящим под SCHEMA. Возвращает пути файлов.
+    """
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        records = [{"id": n, "email": f"user{n}@example.com", "tags": ["a", "b"]} for n in range(items)]
+        if rng.random() < 0.2:
+            records[rng.randrange(items)]["email"] = rng.choice([None, "без собаки"])
+        text = json.dumps(records, ensure_ascii=False, indent=2)
+        if rng.random() < 0.1:
+            text = text[:-2]  # Обрезанный файл
+        path = os.path.join(directory, f"{i:05}.json")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(text)
+        paths.append(path)
+    return paths
+
+def expected_failures(paths, validator=None, each=False):
+    """Файлы с ошибками, найденные загрузкой json.load и (если задан validator) проверкой схемы целиком."""
+    failed = set()
+    for path in paths:
+        try:
+            with open(path, encoding="utf-8") as file:
+                value = json.load(file)
+        except json.JSONDecodeError:
+            failed.add(path)
+            continue
+        if validator is None:
+            continue
+        instances = value if each and isinstance(value, list) else [value]
+        if not all(map(validator.is_valid, instances)):
+            failed.add(path)
+    return failed
+
+def measure(title, paths, schema_path=None, each=False):
+    """Запускает run_validate (отчёт jsonl перехватывается), печатает время и возвращает файлы с ошибками."""
+    report = io.StringIO()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(report):
+        run_validate(paths, schema_path, each, jsonl=True)
+    print(f"{title}: {time.perf_counter() - start:8.2f} с")
+    return {result["file"] for result in map(json.loads, report.getvalue().splitlines()) if not result["ok"]}
+
+def check(title, got, expected):
+    print(f"{title}: " + ("результаты совпадают" if got == expected else "РЕЗУЛЬТАТЫ РАЗЛИЧАЮТСЯ"))
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    items = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    directory = tempfile.mkdtemp()
+    try:
+        print(f"Генерация {count} файлов по {items} элементов...")
+        make_files(directory, count, items)
+        paths = expand_inputs([directory])
+        check("Синтаксис", measure("Синтаксис", paths), expected_failures(paths))
+
+        if jsonschema is None:
+            print("Пакет jsonschema не установлен: проверка --schema пропущена.")
+        else:
+            schema_path = os.path.join(directory, "schema.txt")  # Не *.json, чтобы не попасть в список файлов
+            with open(schema_path, "w", encoding="utf-8") as file:
+                json.dump(SCHEMA, file)
+            validator = jsonschema.validators.validator_for(SCHEMA)(SCHEMA)
+            check("--schema", measure("--schema", paths, schema_path), expected_failures(paths, validator))
+            each_schema_path = os.path.join(directory, "each.txt")
+            with open(each_schema_path, "w", encoding="utf-8") as file:
+                json.dump(SCHEMA["items"], file)
+            item_validator = jsonschema.validators.validator_for(SCHEMA)(SCHEMA["items"])
+            check("--schema --each", measure("--schema --each", paths, each_schema_path, each=True),
+                  expected_failures(paths, item_validator, each=True))
+    finally:
+        shutil.rmtree(directory)
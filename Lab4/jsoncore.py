@@ -0,0 +1,210 @@
+# jsoncore.py
+# Ядро редактора JSON без графического интерфейса: загрузка файла с форматированием
+# по частям, проверка текста, сохранение, проверка файлов по JSON Schema и запросы
+# по пути. Используется окном main2.py и командной строкой jsontool.py.
+
+import json  # Разбор JSON
+import os  # Для временного файла при сохранении
+import re  # Разбор пути запроса
+from functools import lru_cache  # Кэш скомпилированных схем
+from itertools import islice  # Ограничение числа выводимых ошибок
+
+from jsonstream import JSONStreamFormatter, JSONStreamReader, check_json
+
+try:
+    import jsonschema
+except ImportError:  # jsonschema необязателен: без него недоступна только проверка по схеме
+    jsonschema = None
+
+MAX_ERRORS = 20  # Сколько ошибок схемы сообщать для одного файла
+
+# Шаг пути запроса: .ключ, .*, [индекс], [*] или ["ключ с любыми символами"]
+QUERY_STEP = re.compile(r'\.(\*|[^.\[\]"]+)|\[(\*|\d+)\]|\[("(?:[^"\\]|\\.)*")\]')
+ANY = object()  # Шаг пути, подходящий к любому элементу
+
+def load_parts(path, cancel=None):
+    """
+    Читает JSON-файл path и выдаёт пары (часть отформатированного текста, доля прочитанного файла).
+    Текст совпадает с json.dumps(json.load(f), indent=4, ensure_ascii=False).
+    Останавливается, если установлено событие cancel; при ошибке в JSON бросает json.JSONDecodeError.
+    """
+    size = os.path.getsize(path) or 1  # Размер файла для доли прочитанного
+    with open(path, 'rb') as file:
+        formatter = JSONStreamFormatter(file)
+        for part in formatter:
+            if cancel is not None and cancel.is_set():
+                return
+            yield part, formatter.bytes_read / size
+
+def check_text(text, cancel=None):
+    """Проверяет JSON-текст по частям. Возвращает json.JSONDecodeError или None, если ошибок нет."""
+    try:
+        check_json(text, cancel)
+    except json.JSONDecodeError as e:
+        return e
+    return None
+
+def save_text(path, text):
+    """Записывает текст во временный файл и заменяет им path, чтобы сбой не оставил обрезанный файл."""
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+def json_path(parts):
+    """Путь к значению в том же виде, что и в запросах: $.users[3].email."""
+    text = "$"
+    for part in parts:
+        if isinstance(part, int):
+            text += f"[{part}]"
+        elif re.fullmatch(r'[^.\[\]"*]+', part):
+            text += f".{part}"
+        else:
+            text += f"[{json.dumps(part, ensure_ascii=False)}]"
+    return text
+
+@lru_cache(maxsize=16)
+def _compiled_schema(schema_path, mtime_ns):
+    with open(schema_path, encoding='utf-8') as file:
+        schema = json.load(file)
+    validator_class = jsonschema.validators.validator_for(schema)
+    validator_class.check_schema(schema)  # Ошибка в самой схеме — сразу, а не на каждом файле
+    return validator_class(schema, format_checker=validator_class.FORMAT_CHECKER)
+
+def load_validator(schema_path):
+    """
+    Скомпилированный валидатор для схемы из файла schema_path. Валидатор создаётся один раз
+    на процесс (и заново, если файл схемы изменился). Нужен пакет jsonschema.
+    """
+    if jsonschema is None:
+        raise RuntimeError("для проверки по схеме нужен пакет jsonschema (pip install jsonschema)")
+    schema_path = os.path.abspath(schema_path)
+    return _compiled_schema(schema_path, os.stat(schema_path).st_mtime_ns)
+
+def _schema_errors(validator, instance, prefix=()):
+    """Ошибки схемы для значения instance: пары (путь, сообщение), не больше MAX_ERRORS + 1."""
+    errors = islice(validator.iter_errors(instance), MAX_ERRORS + 1)
+    return [(json_path(list(prefix) + list(error.absolute_path)), error.message) for error in errors]
+
+def _each_errors(validator, reader):
+    """Ошибки схемы для каждого элемента корневого массива (или для корня, если это не массив)."""
+    errors = []
+    reader.start()
+    if reader.peek() != "[":
+        errors += _schema_errors(validator, reader.decode())
+    else:
+        for i in reader.elements():
+            if len(errors) > MAX_ERRORS:
+                reader.skip()  # Ошибок достаточно, остаётся проверить синтаксис
+            else:
+                errors += _schema_errors(validator, reader.decode(), (i,))
+    reader.finish()
+    return errors
+
+def validate_file(path, schema_path=None, each=False):
+    """
+    Проверяет файл path: синтаксис JSON и, если задан schema_path, соответствие схеме.
+    each — схеме должен соответствовать каждый элемент корневого массива (файл не загружается
+    в память целиком). Возвращает словарь: file, ok и errors — список пар (где, сообщение).
+    Ошибки в самой схеме не относятся к файлу и передаются вызывающему.
+    """
+    validator = load_validator(schema_path) if schema_path is not None else None
+    result = {"file": path, "ok": True, "errors": []}
+    try:
+        if validator is None or each:
+            # Синтаксис (и схема для каждого элемента) проверяется за один проход по частям
+            with open(path, 'rb') as file:
+                if validator is None:
+                    for _ in JSONStreamFormatter(file, formatting=False):
+                        pass
+                else:
+                    result["errors"] += _each_errors(validator, JSONStreamReader(file))
+        else:
+            with open(path, encoding='utf-8') as file:
+                result["errors"] += _schema_errors(validator, json.load(file))
+    except json.JSONDecodeError as e:
+        result["errors"].append((f"строка {e.lineno}, столбец {e.colno}", e.msg))
+    except Exception as e:  # Файл не читается, не UTF-8 и т.п.
+        result["errors"].append(("файл", str(e)))
+    if len(result["errors"]) > MAX_ERRORS:
+        result["errors"][MAX_ERRORS:] = [("...", f"показаны первые {MAX_ERRORS} ошибок")]
+    result["ok"] = not result["errors"]
+    return result
+
+def parse_query(query):
+    """
+    Разбирает путь запроса ($.users[*].email, $[0]["ключ с пробелом"]) в список шагов:
+    строка — ключ объекта, число — индекс массива, ANY — любой элемент.
+    """
+    text = query[1:] if query.startswith("$") else query
+    steps = []
+    pos = 0
+    while pos < len(text):
+        match = QUERY_STEP.match(text, pos)
+        if match is None:
+            raise ValueError(f"Неверный путь запроса: {query}")
+        key, index, quoted = match.groups()
+        if key is not None:
+            steps.append(ANY if key == "*" else key)
+        elif index is not None:
+            steps.append(ANY if index == "*" else int(index))
+        else:
+            steps.append(json.loads(quoted))
+        pos = match.end()
+    return steps
+
+def _walk_value(value, steps):
+    """Выдаёт значения по шагам пути steps внутри уже разобранного значения."""
+    if not steps:
+        yield value
+        return
+    step, rest = steps[0], steps[1:]
+    if step is ANY:
+        for child in (value.values() if isinstance(value, dict) else value if isinstance(value, list) else ()):
+            yield from _walk_value(child, rest)
+    elif isinstance(step, int):
+        if isinstance(value, list) and step < len(value):
+            yield from _walk_value(value[step], rest)
+    elif isinstance(value, dict) and step in value:
+        yield from _walk_value(value[step], rest)
+
+def _walk_stream(reader, steps, exact=True):
+    """
+    Выдаёт значения по шагам пути steps для значения в текущей позиции reader.
+    exact — выше на пути не было шага ANY: тогда найденное значение единственное, и после
+    него чтение останавливается (reader остаётся посреди документа); иначе значение
+    прочитывается до конца.
+    """
+    if not steps:
+        yield reader.decode()
+        return
+    if not reader.is_container():
+        reader.skip()
+        return
+    ok, value = reader.decode_small()
+    if ok:
+        yield from _walk_value(value, steps)
+        return
+    step, rest = steps[0], steps[1:]
+    for key in reader.elements():
+        if step is ANY or key == step:
+            yield from _walk_stream(reader, rest, exact and step is not ANY)
+            if exact and step is not ANY:
+                return
+        else:
+            reader.skip()
+
+def query_file(path, steps):
+    """
+    Выдаёт значения из файла path, найденные по шагам пути steps (см. parse_query).
+    Файл читается порциями и один раз: контейнеры, которые помещаются в порцию (например,
+    отдельные записи), разбираются целиком, большие — по элементам. Путь без [*] читает
+    файл только до найденного значения. В большом объекте с повторяющимися ключами
+    $.ключ находит первое значение, а .* — все.
+    """
+    with open(path, 'rb') as file:
+        reader = JSONStreamReader(file)
+        reader.start()
+        yield from _walk_stream(reader, steps)
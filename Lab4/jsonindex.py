@@ -0,0 +1,137 @@
+# jsonindex.py
+# Индекс JSON-файла по смещениям в байтах для просмотра в виде дерева.
+# Файл отображается в память и не разбирается целиком: открытие файла находит только
+# начало корневого значения, а элементы массива или объекта находятся при раскрытии
+# узла и только столько, сколько нужно показать (по страницам). Значение узла — это
+# смещение его начала в файле; вложенные контейнеры пропускаются подсчётом скобок,
+# без создания объектов Python.
+
+import json  # Разбор ключей и небольших значений
+import mmap  # Отображение файла в память
+import re  # Поиск границ значений в байтах
+from array import array  # Компактный список смещений элементов
+
+PREVIEW_SIZE = 80  # Сколько символов значения показывать в строке дерева
+
+WHITESPACE = re.compile(rb'[ \t\n\r]*')
+STRING = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+SCALAR = re.compile(rb'[^ \t\n\r,:\]}]*')  # Число, true, false, null (до разделителя)
+# Строки (внутри них скобки не считаются) и скобки — для пропуска вложенных контейнеров
+STRUCTURE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}]', re.DOTALL)
+
+KINDS = {ord("{"): "object", ord("["): "array", ord('"'): "string"}
+
+class Children:
+    """Найденные элементы контейнера: смещения значений и (для объекта) ключи."""
+
+    def __init__(self, is_object, pos):
+        self.is_object = is_object
+        self.offsets = array('q')  # Смещения начала значений элементов
+        self.keys = [] if is_object else None
+        self.pos = pos  # С какого смещения продолжать поиск
+        self.done = False  # Все элементы найдены
+
+    def __len__(self):
+        return len(self.offsets)
+
+class JSONIndex:
+    """Ленивый индекс JSON-файла path. Узлы дерева задаются смещениями значений в файле."""
+
+    def __init__(self, path):
+        with open(path, 'rb') as file:
+            self.mm = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)  # Пустой файл — ValueError
+        self.size = len(self.mm)
+        self.root = self._skip_whitespace(0)
+        if self.root >= self.size:
+            raise ValueError("Файл не содержит JSON")
+        self.children_cache = {}  # Смещение контейнера -> Children
+
+    def close(self):
+        self.mm.close()
+
+    def _skip_whitespace(self, pos):
+        return WHITESPACE.match(self.mm, pos).end()
+
+    def _error(self, message, pos):
+        return ValueError(f"{message} (байт {pos})")
+
+    def kind(self, offset):
+        """Тип значения: object, array, string или scalar (число, true, false, null)."""
+        return KINDS.get(self.mm[offset], "scalar")
+
+    def value_end(self, offset):
+        """Смещение сразу после значения, начинающегося в offset."""
+        first = self.mm[offset]
+        if first == ord('"'):
+            match = STRING.match(self.mm, offset)
+            if match is None:
+                raise self._error("Незакрытая строка", offset)
+            return match.end()
+        if first not in (ord("{"), ord("[")):
+            end = SCALAR.match(self.mm, offset).end()
+            if end == offset:
+                raise self._error("Ожидалось значение", offset)
+            return end
+        depth = 0
+        for match in STRUCTURE.finditer(self.mm, offset):
+            char = self.mm[match.start()]
+            if char == ord('"'):
+                continue
+            depth += 1 if char in (ord("{"), ord("[")) else -1
+            if depth == 0:
+                return match.end()
+        raise self._error("Незакрытый контейнер", offset)
+
+    def children(self, offset, count):
+        """Элементы контейнера в offset: находит не меньше count первых элементов (или все)."""
+        children = self.children_cache.get(offset)
+        if children is None:
+            children = Children(self.kind(offset) == "object", offset + 1)
+            self.children_cache[offset] = children
+        mm = self.mm
+        pos = children.pos
+        while not children.done and len(children) < count:
+            pos = self._skip_whitespace(pos)
+            if pos >= self.size:
+                raise self._error("Незакрытый контейнер", offset)
+            char = mm[pos]
+            if char in (ord("]"), ord("}")):
+                children.done = True
+                pos += 1
+                break
+            if len(children):
+                if char != ord(","):
+                    raise self._error("Ожидалась запятая", pos)
+                pos = self._skip_whitespace(pos + 1)
+            if children.is_object:
+                end = self.value_end(pos) if mm[pos:pos + 1] == b'"' else pos
+                if end == pos:
+                    raise self._error("Ожидался ключ в кавычках", pos)
+                children.keys.append(json.loads(mm[pos:end]))
+                pos = self._skip_whitespace(end)
+                if mm[pos:pos + 1] != b":":
+                    raise self._error("Ожидалось двоеточие", pos)
+                pos = self._skip_whitespace(pos + 1)
+            if pos >= self.size:
+                raise self._error("Ожидалось значение", pos)
+            children.offsets.append(pos)
+            pos = self.value_end(pos)
+        children.pos = pos
+        return children
+
+    def has_children(self, offset):
+        """Есть ли у контейнера в offset хотя бы один элемент."""
+        end = self._skip_whitespace(offset + 1)
+        return end < self.size and self.mm[end] not in (ord("]"), ord("}"))
+
+    def preview(self, offset):
+        """Короткое представление значения для строки дерева (без чтения всего значения)."""
+        kind = self.kind(offset)
+        if kind in ("object", "array"):
+            # Начало контейнера как есть, с пробелами, сжатыми до одного
+            raw = self.mm[offset:offset + PREVIEW_SIZE * 4].decode('utf-8', errors='replace')
+            text = " ".join(raw.split())
+        else:
+            raw = self.mm[offset:min(self.value_end(offset), offset + PREVIEW_SIZE * 4)]
+            text = raw.decode('utf-8', errors='replace')
+        return text if len(text) <= PREVIEW_SIZE else text[:PREVIEW_SIZE] + "…"
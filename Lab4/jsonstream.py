@@ -0,0 +1,249 @@
+# jsonstream.py
+# Потоковое форматирование JSON: файл читается порциями, а отформатированный текст
+# выдаётся по частям, поэтому его можно показывать, не дожидаясь разбора всего файла.
+#
+# Результат совпадает с json.dumps(json.load(f), indent=4, ensure_ascii=False).
+# Массив или объект, который целиком помещается в прочитанную порцию, разбирается
+# одним вызовом JSONDecoder.raw_decode; больший контейнер разбирается по элементам,
+# так что в памяти не бывает больше нескольких порций файла. Единственное отличие
+# от json.load: повторяющиеся ключи в таких больших объектах выводятся все, как в файле
+# (json.load оставил бы последнее значение).
+#
+# JSONStreamReader — общая часть: чтение порциями и разбор по значениям. На нём же
+# построены запросы по пути в jsoncore.py, которым не нужно форматирование.
+
+import codecs  # Пошаговое декодирование UTF-8 из двоичного файла
+import io  # Проверка уже загруженного текста как файла
+import json  # Разбор отдельных значений и их форматирование
+import re  # Пропуск пробелов
+
+READ_SIZE = 1 << 20  # Сколько байт читать за раз (1 МБ)
+INDENT = 4  # Отступ, как в json.dumps(..., indent=4)
+ERROR_MARGIN = 16  # Ошибка дальше этого числа символов от конца буфера не связана с обрывом данных
+
+NUMBER_CHARS = "0123456789.eE+-"  # Символы, которыми может продолжаться число
+WHITESPACE = re.compile(r'[ \t\n\r]*')  # Пробельные символы JSON
+
+class JSONStreamReader:
+    """
+    Читает JSON из файла file (двоичного, в UTF-8, или текстового) порциями и разбирает его
+    по значениям: вызывающий сам решает, разобрать значение целиком, пропустить его или
+    перебрать элементы контейнера. При ошибке в JSON бросается json.JSONDecodeError
+    с позицией в исходном файле.
+    """
+
+    def __init__(self, file, read_size=READ_SIZE):
+        self.file = file
+        self.read_size = read_size
+        self.decoder = codecs.getincrementaldecoder('utf-8')()
+        self.json_decoder = json.JSONDecoder()
+        self.buf = ""  # Прочитанный, но ещё не разобранный текст
+        self.pos = 0  # Позиция разбора в buf
+        self.eof = False
+        self.bytes_read = 0  # Для индикатора загрузки (для текстового файла — символы)
+        # Сколько символов, строк и символов последней строки отброшено из начала buf (для позиций ошибок)
+        self.char_base = 0
+        self.line_base = 0
+        self.col_base = 0
+
+    def _read_more(self):
+        """Отбрасывает разобранное начало буфера и дочитывает файл (не меньше, чем уже в буфере)."""
+        dropped = self.buf[:self.pos]
+        newlines = dropped.count("\n")
+        if newlines:
+            self.line_base += newlines
+            self.col_base = len(dropped) - dropped.rfind("\n") - 1
+        else:
+            self.col_base += len(dropped)
+        self.char_base += len(dropped)
+        self.buf = self.buf[self.pos:]
+        self.pos = 0
+
+        # Размер порции растёт вместе с буфером, чтобы большое значение не перечитывалось много раз
+        data = self.file.read(max(self.read_size, len(self.buf)))
+        self.bytes_read += len(data)
+        self.eof = not data
+        self.buf += self.decoder.decode(data, final=self.eof) if isinstance(data, bytes) else data
+
+    def _error(self, error):
+        """Переводит позицию ошибки в буфере в позицию в файле."""
+        lineno = self.line_base + error.lineno
+        colno = error.colno + (self.col_base if error.lineno == 1 else 0)
+        pos = self.char_base + error.pos
+        result = json.JSONDecodeError(error.msg, error.doc, error.pos)
+        result.lineno, result.colno, result.pos = lineno, colno, pos
+        result.args = (f"{error.msg}: line {lineno} column {colno} (char {pos})",)
+        return result
+
+    def _fail(self, message):
+        raise self._error(json.JSONDecodeError(message, self.buf, self.pos))
+
+    def peek(self):
+        """Следующий символ (пустая строка в конце файла)."""
+        while self.pos >= len(self.buf) and not self.eof:
+            self._read_more()
+        return self.buf[self.pos:self.pos + 1]
+
+    def _skip_whitespace(self):
+        while True:
+            self.pos = WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf) or self.eof:
+                return
+            self._read_more()
+
+    def _decode_buffered(self):
+        """
+        Разбирает значение с текущей позиции, если оно целиком есть в буфере.
+        Возвращает (True, значение) или (False, ошибка разбора или None, если значение оборвано).
+        """
+        try:
+            value, end = self.json_decoder.raw_decode(self.buf, self.pos)
+        except json.JSONDecodeError as e:
+            # Ошибка в середине буфера — настоящая; у конца буфера значение могло просто оборваться
+            truncated = e.pos >= len(self.buf) - ERROR_MARGIN or e.msg.startswith("Unterminated string")
+            return False, None if truncated and not self.eof else e
+        # Значение на границе буфера могло оборваться: оно закончено, только если за ним что-то есть,
+        # а за числом — символ, которым число не может продолжаться ("3" и ".5" в разных порциях)
+        complete = end < len(self.buf) and not (
+            self.buf[end] in NUMBER_CHARS and isinstance(value, (int, float)) and not isinstance(value, bool))
+        if not (complete or self.eof):
+            return False, None
+        self.pos = end
+        return True, value
+
+    def start(self):
+        """Переходит к корневому значению документа."""
+        self._skip_whitespace()
+
+    def finish(self):
+        """Проверяет, что после корневого значения в документе ничего нет."""
+        self._skip_whitespace()
+        if self.pos < len(self.buf):
+            self._fail("Extra data")
+
+    def is_container(self):
+        """Начинается ли с текущей позиции массив или объект."""
+        return self.peek() in ("[", "{")
+
+    def decode(self):
+        """Разбирает одно значение с текущей позиции, дочитывая файл, пока значение не закончится."""
+        while True:
+            ok, result = self._decode_buffered()
+            if ok:
+                return result
+            if result is not None:
+                raise self._error(result) from None
+            self._read_more()
+
+    def decode_small(self):
+        """
+        Разбирает контейнер с текущей позиции, если он целиком помещается в прочитанную порцию.
+        Возвращает (True, значение) или (False, None): тогда контейнер нужно перебирать по элементам.
+        """
+        ok, value = self._decode_buffered()
+        return (True, value) if ok else (False, None)
+
+    def skip(self):
+        """Пропускает значение с текущей позиции, не держа в памяти больше нескольких порций."""
+        if not self.is_container():
+            self.decode()
+        elif not self.decode_small()[0]:
+            for _ in self.elements():
+                self.skip()
+
+    def elements(self):
+        """
+        Перебирает элементы массива или объекта с текущей позиции: выдаёт индекс элемента
+        или ключ и останавливается перед его значением. Значение должен прочитать вызывающий
+        (decode, skip или снова elements) до перехода к следующему элементу.
+        """
+        opening = self.buf[self.pos]
+        closing = "]" if opening == "[" else "}"
+        self.pos += 1
+        self._skip_whitespace()
+        if self.peek() == closing:
+            self.pos += 1
+            return
+
+        index = 0
+        while True:
+            if opening == "{":
+                if self.peek() != '"':
+                    self._fail("Expecting property name enclosed in double quotes")
+                key = self.decode()
+                self._skip_whitespace()
+                if self.peek() != ":":
+                    self._fail("Expecting ':' delimiter")
+                self.pos += 1
+                self._skip_whitespace()
+                yield key
+            else:
+                yield index
+            index += 1
+
+            self._skip_whitespace()
+            next_char = self.peek()
+            self.pos += 1
+            if next_char == closing:
+                return
+            if next_char != ",":
+                self.pos -= 1
+                self._fail("Expecting ',' delimiter")
+            self._skip_whitespace()
+
+class JSONStreamFormatter(JSONStreamReader):
+    """
+    Форматирует JSON из файла file по частям: итерация выдаёт строки, которые вместе
+    составляют отформатированный документ. При ошибке в JSON бросается json.JSONDecodeError
+    с позицией в исходном файле. С formatting=False документ только проверяется: итерация
+    выдаёт лишь разделители элементов больших контейнеров.
+    """
+
+    def __init__(self, file, read_size=READ_SIZE, formatting=True):
+        super().__init__(file, read_size)
+        self.formatting = formatting
+
+    def __iter__(self):
+        self.start()
+        yield from self._value(0)
+        self.finish()
+
+    def _value(self, indent):
+        """Выдаёт отформатированное значение; indent — отступ строки, в которой оно начинается."""
+        if self.is_container():
+            ok, value = self.decode_small()
+            if not ok:
+                # Контейнер не помещается в буфер (или в нём ошибка): разбираем его по элементам
+                yield from self._container(indent)
+                return
+        else:
+            value = self.decode()
+        if not self.formatting:
+            return
+        text = json.dumps(value, indent=INDENT, ensure_ascii=False)
+        yield text.replace("\n", "\n" + " " * indent) if indent else text
+
+    def _container(self, indent):
+        """Выдаёт массив или объект, разбирая его элементы по одному."""
+        opening = self.buf[self.pos]
+        closing = "]" if opening == "[" else "}"
+        inner = " " * (indent + INDENT)
+        empty = True
+        for key in self.elements():
+            yield (opening + "\n" if empty else ",\n") + inner
+            empty = False
+            if opening == "{":
+                yield json.dumps(key, ensure_ascii=False) + ": "
+            yield from self._value(indent + INDENT)
+        yield opening + closing if empty else "\n" + " " * indent + closing
+
+def check_json(text, cancel=None):
+    """
+    Проверяет JSON-текст по частям: ни один вызов разбора не занимает больше READ_SIZE символов,
+    поэтому проверка в фоновом потоке не останавливает надолго другие потоки.
+    Бросает json.JSONDecodeError при ошибке; возвращает False, если проверка прервана событием cancel.
+    """
+    for _ in JSONStreamFormatter(io.StringIO(text), formatting=False):
+        if cancel is not None and cancel.is_set():
+            return False
+    return True
@@ -0,0 +1,124 @@
+# jsontool.py
+# Проверка и запросы к JSON-файлам из командной строки, без окна редактора.
+# Проверка: файлы распределяются по пулу процессов; схема компилируется один раз в каждом процессе.
+#   python jsontool.py validate <каталог|маска|файл>... [--schema схема.json] [--each] [--workers N] [--jsonl]
+# Запрос: значения по пути выводятся по одному в строке (JSON); файл читается порциями, один раз.
+#   python jsontool.py query '$[*].email' <файл>... [-H]
+
+import argparse  # Для разбора аргументов командной строки
+from concurrent.futures import ProcessPoolExecutor  # Пул процессов
+import glob  # Для раскрытия масок файлов
+import json  # Для вывода результатов
+import os  # Для работы с путями
+import sys  # Для кода завершения
+
+from jsoncore import load_validator, parse_query, query_file, validate_file
+
+def expand_inputs(inputs):
+    """Раскрывает каталоги (все *.json в них) и маски в упорядоченный список файлов без повторов."""
+    files = {}  # Словарь сохраняет порядок добавления: повтор отбрасывается за O(1)
+    for item in inputs:
+        if os.path.isdir(item):
+            files.update(dict.fromkeys(sorted(glob.glob(os.path.join(item, "*.json")))))
+        elif glob.has_magic(item):
+            files.update(dict.fromkeys(sorted(glob.glob(item))))
+        else:
+            files[item] = None
+    return list(files)
+
+def _init_worker(schema_path):
+    """Компилирует схему в рабочем процессе один раз: дальше валидатор берётся из кэша jsoncore."""
+    if schema_path is not None:
+        load_validator(schema_path)
+
+def _validate(job):
+    return validate_file(*job)
+
+def run_validate(files, schema_path=None, each=False, workers=None, jsonl=False):
+    """
+    Проверяет files на пуле процессов (результаты приходят в порядке files) и печатает отчёт:
+    текстовый или по строке JSON на файл (jsonl). Возвращает число файлов с ошибками.
+    """
+    jobs = [(path, schema_path, each) for path in files]
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 4))
+    failed = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(schema_path,)) as pool:
+        for result in pool.map(_validate, jobs, chunksize=chunksize):
+            failed += not result["ok"]
+            if jsonl:
+                print(json.dumps(result, ensure_ascii=False))
+            elif result["ok"]:
+                print(f"OK: {result['file']}")
+            else:
+                print(f"Ошибка: {result['file']}")
+                for where, message in result["errors"]:
+                    print(f"    {where}: {message}")
+    if not jsonl:
+        print(f"Проверено файлов: {len(files)}, с ошибками: {failed}")
+    return failed
+
+def run_query(query, files, with_filename=False):
+    """Печатает значения по пути query из files, по одному в строке. Возвращает число найденных значений."""
+    steps = parse_query(query)
+    found = 0
+    for path in files:
+        prefix = f"{path}:" if with_filename else ""
+        try:
+            for value in query_file(path, steps):
+                print(prefix + json.dumps(value, ensure_ascii=False))
+                found += 1
+        except BrokenPipeError:
+            raise  # Вывод закрыт (например, | head): прекращаем весь запрос
+        except Exception as e:  # Файл не найден, пустой или с ошибкой в JSON
+            print(f"{path}: ошибка: {e}", file=sys.stderr)
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description="Проверка JSON-файлов и запросы к ним")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    validate = commands.add_parser("validate", help="проверить синтаксис и (необязательно) схему")
+    validate.add_argument("inputs", nargs="+", help="каталоги, маски (например, 'data/*.json') или файлы")
+    validate.add_argument("--schema", help="файл JSON Schema (нужен пакет jsonschema)")
+    validate.add_argument("--each", action="store_true",
+                          help="схеме должен соответствовать каждый элемент корневого массива")
+    validate.add_argument("--workers", type=int, default=None, help="количество процессов (по умолчанию — число ядер)")
+    validate.add_argument("--jsonl", action="store_true", help="отчёт по строке JSON на файл")
+
+    query = commands.add_parser("query", help="вывести значения по пути, например '$[*].email'")
+    query.add_argument("path", help="путь: $.ключ, $[индекс], [*] — любой элемент, [\"ключ\"]")
+    query.add_argument("inputs", nargs="+", help="каталоги, маски или файлы")
+    query.add_argument("-H", "--with-filename", action="store_true", help="добавлять имя файла к значениям")
+    args = parser.parse_args()
+
+    files = expand_inputs(args.inputs)
+    if not files:
+        print("Не найдено ни одного JSON-файла.")
+        sys.exit(2)
+
+    if args.command == "validate":
+        if args.schema is not None:
+            try:
+                load_validator(args.schema)  # Ошибки в схеме сообщаем один раз, до запуска процессов
+            except RuntimeError as e:  # Не установлен jsonschema
+                print(f"Проверка по схеме недоступна: {e}")
+                sys.exit(2)
+            except Exception as e:
+                print(f"Ошибка в схеме {args.schema}: {e}")
+                sys.exit(2)
+        sys.exit(1 if run_validate(files, args.schema, args.each, args.workers, args.jsonl) else 0)
+
+    try:
+        found = run_query(args.path, files, args.with_filename)
+    except ValueError as e:  # Неверный путь запроса
+        print(e)
+        sys.exit(2)
+    except BrokenPipeError:
+        # Чтобы Python не сообщал об ошибке при сбросе stdout на выходе
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    sys.exit(0 if found else 1)
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,22 @@
 import tkinter as tk  # Импорт библиотеки tkinter для создания графического интерфейса
 from tkinter import filedialog, messagebox, scrolledtext  # Импорт дополнительных модулей tkinter для диалогов, сообщений и прокручиваемого текста
+from tkinter import ttk  # Дерево (Treeview) для просмотра больших документов
 import json  # Импорт модуля json для работы с JSON файлами
 import os  # Импорт модуля os для проверки существования файлов
+import queue  # Очередь для передачи текста из фонового потока загрузки
+import threading  # Фоновый поток загрузки, чтобы окно не зависало на больших файлах
+import time  # Ограничение времени вставки текста за один шаг
+
+from jsonindex import JSONIndex  # Индекс файла по смещениям для ленивого дерева
+from jsoncore import check_text, load_parts, save_text  # Загрузка, проверка и сохранение JSON без интерфейса
+
+INSERT_CHUNK = 1 << 18  # Сколько символов фоновый поток передаёт в окно за раз
+QUEUE_SIZE = 16  # Сколько частей может ждать вставки (ограничивает память при медленной вставке)
+POLL_MS = 20  # Как часто окно забирает готовый текст (мс)
+POLL_BUDGET = 0.05  # Сколько секунд за один шаг можно тратить на вставку текста
+TREE_PAGE = 200  # Сколько элементов контейнера добавлять в дерево за раз
+DEBOUNCE_MS = 500  # Через сколько мс после последней правки запускается проверка JSON
+CHECK_CHUNK = 1 << 18  # Сколько символов текста окно передаёт на проверку за раз
 
 class JSONEditor:
     def __init__(self, root):
@@ -30,6 +45,12 @@ class JSONEditor:
         self.text_area = scrolledtext.ScrolledText(self.root, wrap=tk.WORD, height=25)
         # wrap=tk.WORD - перенос слов, height=25 - высота в строках
         self.text_area.pack(pady=10, padx=10, fill=tk.BOTH, expand=True)  # Размещаем с отступами, растягивая по ширине и высоте
+        self.text_area.tag_configure("error", background="#ffc0c0")  # Подсветка места ошибки в JSON
+        self.text_area.bind("<<Modified>>", self._on_text_modified)  # Проверка JSON после правок
+
+        # Метка с результатом фоновой проверки JSON (строка и столбец ошибки)
+        self.check_label = tk.Label(self.root, text="", anchor=tk.W)
+        self.check_label.pack(padx=10, fill=tk.X)  # Размещаем под текстовым полем
 
         # Фрейм для кнопок управления (загрузка, проверка, сохранение)
         self.button_frame = tk.Frame(self.root)
@@ -47,6 +68,45 @@ class JSONEditor:
         self.save_button = tk.Button(self.button_frame, text="Сохранить", command=self.save_json)
         self.save_button.pack(side=tk.LEFT, padx=5)  # Размещаем слева с отступом
 
+        # Кнопка "Отмена" для прерывания загрузки (доступна только во время загрузки)
+        self.cancel_button = tk.Button(self.button_frame, text="Отмена", command=self.cancel_load, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, padx=5)  # Размещаем слева с отступом
+
+        # Кнопка "Дерево" для переключения между текстом и деревом
+        self.tree_button = tk.Button(self.button_frame, text="Дерево", command=self.toggle_tree)
+        self.tree_button.pack(side=tk.LEFT, padx=5)  # Размещаем слева с отступом
+
+        # Метка с ходом загрузки
+        self.status_label = tk.Label(self.button_frame, text="")
+        self.status_label.pack(side=tk.LEFT, padx=5)  # Размещаем справа от кнопок
+
+        # Состояние загрузки: очередь с текстом от фонового потока и флаг отмены
+        self.load_queue = None
+        self.load_cancel = None
+
+        # Дерево для просмотра файла (показывается вместо текстового поля кнопкой "Дерево")
+        self.tree_frame = tk.Frame(self.root)
+        self.tree = ttk.Treeview(self.tree_frame, columns=("value",))
+        self.tree.heading("#0", text="Ключ")  # Колонка с ключами и индексами
+        self.tree.heading("value", text="Значение")  # Колонка с кратким значением
+        self.tree_scroll = ttk.Scrollbar(self.tree_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=self._on_tree_scroll)
+        self.tree_scroll.pack(side=tk.RIGHT, fill=tk.Y)
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.tree.bind("<<TreeviewOpen>>", self._on_tree_open)  # Узлы заполняются при раскрытии
+
+        # Состояние дерева: индекс файла и узлы дерева
+        self.index = None  # JSONIndex открытого в дереве файла
+        self.tree_nodes = {}  # Узел дерева -> смещение его значения в файле
+        self.tree_unopened = set()  # Узлы-контейнеры, элементы которых еще не добавлены
+        self.tree_more = {}  # Строка "ещё..." -> узел, следующую страницу элементов которого она заменяет
+
+        # Состояние фоновой проверки JSON
+        self.text_version = 0  # Номер версии текста, растет при каждом изменении
+        self.check_after = None  # Отложенный запуск проверки
+        self.check_cancel = None  # Флаг отмены идущей проверки
+        self.check_result = None  # (версия, текст, ошибка или None) последней завершенной проверки
+
     def browse_file(self):
         # Метод для выбора JSON файла через диалоговое окно
         file_path = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")])
@@ -66,40 +126,317 @@ class JSONEditor:
             messagebox.showerror("Ошибка", "Файл не существует!")  # Выводим ошибку
             return
 
+        self.cancel_load()  # Прерываем предыдущую загрузку, если она еще идет
+        self._cancel_check()  # Проверка прежнего текста больше не нужна
+        self.text_area.delete(1.0, tk.END)  # Очищаем текстовое поле
+        # Пока идет загрузка, текст нельзя редактировать, проверять и сохранять
+        self.text_area.config(state=tk.DISABLED)
+        for button in (self.validate_button, self.save_button):
+            button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.status_label.config(text="Загрузка: 0%")
+
+        # Файл разбирается и форматируется в фоновом потоке, а окно забирает готовый текст по частям
+        self.load_queue = queue.Queue(QUEUE_SIZE)
+        self.load_cancel = threading.Event()
+        worker = threading.Thread(target=self._load_worker, args=(file_path, self.load_queue, self.load_cancel),
+                                  daemon=True)
+        worker.start()
+        self.root.after(POLL_MS, self._poll_load, self.load_queue)
+
+    def _load_worker(self, file_path, load_queue, cancel):
+        # Фоновый поток: читает файл по частям и передает отформатированный текст в очередь.
+        # Элементы очереди: ("text", текст, доля загруженного), ("done",) или ("error", сообщение)
+        def put(item):
+            # Очередь ограничена: ждем, пока окно заберет текст, но не дольше отмены загрузки
+            while not cancel.is_set():
+                try:
+                    load_queue.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    pass
+
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:  # Открываем файл для чтения
-                json_data = json.load(file)  # Загружаем JSON в Python объект
-                self.text_area.delete(1.0, tk.END)  # Очищаем текстовое поле
-                # Форматируем JSON с отступами и вставляем в текстовое поле
-                self.text_area.insert(tk.END, json.dumps(json_data, indent=4, ensure_ascii=False))
-                # indent=4 - отступы для читаемости, ensure_ascii=False - поддержка не-ASCII символов
+            parts = []  # Накопленные части текста
+            length = 0
+            for part, progress in load_parts(file_path, cancel):
+                parts.append(part)
+                length += len(part)
+                if length >= INSERT_CHUNK:
+                    put(("text", "".join(parts), progress))
+                    parts, length = [], 0
+            if cancel.is_set():  # Пользователь отменил загрузку
+                return
+            put(("text", "".join(parts), 1.0))
+            put(("done",))
         except json.JSONDecodeError:  # Обрабатываем ошибку некорректного JSON
-            messagebox.showerror("Ошибка", "Некорректный JSON файл!")
+            put(("error", "Некорректный JSON файл!"))
         except Exception as e:  # Обрабатываем другие возможные ошибки
+            put(("error", f"Ошибка при загрузке: {str(e)}"))
+
+    def _poll_load(self, load_queue):
+        # Забирает готовый текст из очереди и вставляет его в текстовое поле,
+        # не дольше POLL_BUDGET за раз, чтобы окно продолжало откликаться
+        if load_queue is not self.load_queue:  # Загрузка отменена или начата заново
+            return
+        deadline = time.monotonic() + POLL_BUDGET
+        while time.monotonic() < deadline:
+            try:
+                item = load_queue.get_nowait()
+            except queue.Empty:
+                break
+            if item[0] == "text":
+                self.text_area.config(state=tk.NORMAL)
+                self.text_area.insert(tk.END, item[1])  # Дописываем очередную часть в конец
+                self.text_area.config(state=tk.DISABLED)
+                self.status_label.config(text=f"Загрузка: {item[2]:.0%}")
+            elif item[0] == "done":
+                self._finish_load("")
+                self._schedule_check()  # Проверяем загруженный текст
+                return
+            else:
+                # Частично загруженный текст не является корректным JSON — убираем его
+                self._finish_load("")
+                self.text_area.delete(1.0, tk.END)
+                messagebox.showerror("Ошибка", item[1])
+                return
+        self.root.after(POLL_MS, self._poll_load, load_queue)
+
+    def cancel_load(self):
+        # Метод для прерывания загрузки: фоновый поток останавливается, загруженная часть удаляется
+        if self.load_queue is None:  # Загрузка не идет
+            return
+        self.load_cancel.set()
+        self._finish_load("Загрузка отменена")
+        self.text_area.delete(1.0, tk.END)
+
+    def _finish_load(self, status):
+        # Возвращает окно в обычное состояние после загрузки
+        self.load_queue = None
+        self.load_cancel = None
+        self.text_area.config(state=tk.NORMAL)
+        for button in (self.validate_button, self.save_button):
+            button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.status_label.config(text=status)
+
+    def toggle_tree(self):
+        # Метод для переключения между текстовым полем и деревом
+        if self.tree_frame.winfo_ismapped():  # Сейчас показано дерево
+            self.tree_frame.pack_forget()
+            self.text_area.pack(pady=10, padx=10, fill=tk.BOTH, expand=True, before=self.check_label)
+            self.tree_button.config(text="Дерево")
+            return
+        if self.show_tree():
+            self.text_area.pack_forget()
+            self.tree_frame.pack(pady=10, padx=10, fill=tk.BOTH, expand=True, before=self.check_label)
+            self.tree_button.config(text="Текст")
+
+    def show_tree(self):
+        # Метод для открытия файла в дереве. Файл не читается целиком: элементы
+        # контейнеров находятся по индексу при раскрытии узлов, по TREE_PAGE за раз
+        file_path = self.path_entry.get()  # Получаем путь из поля ввода
+        if not file_path:  # Проверяем, не пустое ли поле
+            messagebox.showerror("Ошибка", "Укажите путь к файлу!")  # Выводим ошибку
+            return False
+
+        if not os.path.exists(file_path):  # Проверяем, существует ли файл
+            messagebox.showerror("Ошибка", "Файл не существует!")  # Выводим ошибку
+            return False
+
+        try:
+            index = JSONIndex(file_path)  # Находит только начало корневого значения
+        except Exception as e:  # Пустой или нечитаемый файл
             messagebox.showerror("Ошибка", f"Ошибка при загрузке: {str(e)}")
+            return False
+        if self.index is not None:
+            self.index.close()
+        self.index = index
+
+        # Очищаем дерево и добавляем корневой узел
+        self.tree.delete(*self.tree.get_children())
+        self.tree_nodes.clear()
+        self.tree_unopened.clear()
+        self.tree_more.clear()
+        self._add_tree_node("", os.path.basename(file_path), index.root)
+        return True
+
+    def _add_tree_node(self, parent, text, offset):
+        # Добавляет узел для значения по смещению offset; у непустого контейнера
+        # добавляется пустой дочерний узел, чтобы узел можно было раскрыть
+        item = self.tree.insert(parent, tk.END, text=text, values=(self.index.preview(offset),))
+        self.tree_nodes[item] = offset
+        if self.index.kind(offset) in ("object", "array") and self.index.has_children(offset):
+            self.tree.insert(item, tk.END, text="")
+            self.tree_unopened.add(item)
+        return item
+
+    def _add_tree_page(self, item):
+        # Добавляет в узел item следующую страницу элементов его контейнера
+        offset = self.tree_nodes[item]
+        shown = len(self.tree.get_children(item))
+        try:
+            children = self.index.children(offset, shown + TREE_PAGE)
+            for i in range(shown, min(len(children), shown + TREE_PAGE)):
+                key = children.keys[i] if children.is_object else f"[{i}]"
+                self._add_tree_node(item, key, children.offsets[i])
+        except ValueError as e:  # Ошибка в структуре JSON
+            messagebox.showerror("Ошибка", f"Некорректный JSON: {str(e)}")
+            return
+        if not children.done:
+            # Следующая страница добавится, когда строка "ещё..." станет видна
+            more = self.tree.insert(item, tk.END, text="ещё...")
+            self.tree_more[more] = item
+
+    def _on_tree_open(self, event):
+        # При первом раскрытии узла заменяем пустой дочерний узел первой страницей элементов
+        item = self.tree.focus()
+        if item in self.tree_unopened:
+            self.tree_unopened.discard(item)
+            self.tree.delete(*self.tree.get_children(item))
+            self._add_tree_page(item)
+
+    def _on_tree_scroll(self, first, last):
+        # При прокрутке дерева подгружаем страницы, строки "ещё..." которых стали видны
+        self.tree_scroll.set(first, last)
+        for more in list(self.tree_more):
+            if more in self.tree_more and self.tree.bbox(more):
+                self._open_more(more)
+
+    def _open_more(self, more):
+        # Заменяет строку "ещё..." следующей страницей элементов
+        item = self.tree_more.pop(more)
+        self.tree.delete(more)
+        self._add_tree_page(item)
+
+    def _on_text_modified(self, event):
+        # Текст изменился: запоминаем новую версию и откладываем проверку до паузы в правках
+        if not self.text_area.edit_modified():  # Событие вызвано сбросом флага изменений
+            return
+        self.text_area.edit_modified(False)
+        self.text_version += 1
+        if self.load_queue is None:  # Во время загрузки текст проверяется после ее окончания
+            self._schedule_check()
+
+    def _schedule_check(self):
+        # Запускает проверку через DEBOUNCE_MS, если за это время текст больше не изменится
+        if self.check_after is not None:
+            self.root.after_cancel(self.check_after)
+        self.check_after = self.root.after(DEBOUNCE_MS, self._start_check)
+
+    def _cancel_check(self):
+        # Отменяет отложенную и идущую проверку и убирает ее результат с экрана
+        if self.check_after is not None:
+            self.root.after_cancel(self.check_after)
+            self.check_after = None
+        if self.check_cancel is not None:
+            self.check_cancel.set()
+            self.check_cancel = None
+        self.check_label.config(text="")
+        self.text_area.tag_remove("error", 1.0, tk.END)
+
+    def _start_check(self):
+        # Запускает проверку текущего текста: окно передает текст частями, а проверяет его фоновый поток
+        self.check_after = None
+        if self.check_cancel is not None:
+            self.check_cancel.set()  # Прерываем проверку устаревшего текста
+        cancel = threading.Event()
+        self.check_cancel = cancel
+        self._read_check_text(self.text_version, cancel, "1.0", [])
+
+    def _read_check_text(self, version, cancel, start, parts):
+        # Получает текст поля частями по CHECK_CHUNK символов (это можно делать только в потоке окна),
+        # не дольше POLL_BUDGET за раз, чтобы окно не замирало на большом тексте.
+        # Правка во время чтения прерывает его: проверка нового текста запустится после паузы
+        if cancel.is_set() or version != self.text_version:
+            return
+        deadline = time.monotonic() + POLL_BUDGET
+        while time.monotonic() < deadline:
+            end = self.text_area.index(f"{start} + {CHECK_CHUNK} chars")
+            parts.append(self.text_area.get(start, end))
+            start = end
+            if self.text_area.compare(end, ">=", tk.END):
+                result = {}
+                worker = threading.Thread(target=self._check_worker, args=(parts, cancel, result), daemon=True)
+                worker.start()
+                self.root.after(POLL_MS, self._poll_check, worker, version, cancel, result)
+                return
+        self.root.after(1, self._read_check_text, version, cancel, start, parts)
+
+    def _check_worker(self, parts, cancel, result):
+        # Фоновый поток: собирает текст из частей и проверяет его по частям, чтобы не задерживать поток окна
+        result["text"] = "".join(parts)
+        parts.clear()
+        try:
+            result["error"] = check_text(result["text"], cancel)  # Ошибка в JSON или None
+        except Exception as e:  # Слишком глубокая вложенность и т.п.
+            result["error"] = e
+
+    def _poll_check(self, worker, version, cancel, result):
+        # Ждет окончания проверки и показывает ее результат, если текст с тех пор не изменился
+        if worker.is_alive():
+            self.root.after(POLL_MS, self._poll_check, worker, version, cancel, result)
+            return
+        if cancel.is_set() or version != self.text_version:  # Результат устарел
+            return
+        self.check_cancel = None
+        error = result["error"]
+        # Проверенный текст запоминается для кнопок "Проверить" и "Сохранить": пока текст не изменился,
+        # они не получают его из поля и не разбирают заново
+        self.check_result = (version, result["text"], error)
+        self.text_area.tag_remove("error", 1.0, tk.END)
+        if error is None:
+            self.check_label.config(text="JSON корректен", fg="dark green")
+        elif isinstance(error, json.JSONDecodeError):
+            # Показываем место ошибки и подсвечиваем символ, на котором разбор остановился
+            self.check_label.config(text=f"Ошибка в строке {error.lineno}, столбце {error.colno}: {error.msg}",
+                                    fg="red")
+            self.text_area.tag_add("error", f"{error.lineno}.{error.colno - 1}")
+        else:
+            self.check_label.config(text=f"Ошибка проверки: {str(error)}", fg="red")
+
+    def _current_check(self):
+        # Результат фоновой проверки, если он относится к текущему тексту, иначе None
+        if self.check_result is not None and self.check_result[0] == self.text_version:
+            return self.check_result
+        return None
 
     def validate_json(self):
-        # Метод для проверки корректности JSON в текстовом поле
+        # Метод для проверки корректности JSON в текстовом поле.
+        # Если текущий текст уже проверен в фоне, используется результат этой проверки
+        result = self._current_check()
         try:
-            json_text = self.text_area.get(1.0, tk.END)  # Получаем весь текст
-            json.loads(json_text)  # Пытаемся разобрать текст как JSON
+            if result is None:
+                json_text = self.text_area.get(1.0, tk.END)  # Получаем весь текст
+                error = check_text(json_text)  # Пытаемся разобрать текст как JSON
+            else:
+                error = result[2]
+            if error is not None:
+                raise error
             messagebox.showinfo("Успех", "JSON корректен!")  # Успех, если нет ошибок
         except json.JSONDecodeError as e:  # Обрабатываем ошибку синтаксиса JSON
             messagebox.showerror("Ошибка", f"Некорректный JSON: {str(e)}")
 
     def save_json(self):
         # Метод для сохранения отредактированного JSON
+        result = self._current_check()
         try:
-            json_text = self.text_area.get(1.0, tk.END)  # Получаем текст из поля
-            json.loads(json_text)  # Проверяем корректность JSON перед сохранением
+            if result is not None and result[2] is None:
+                json_text = result[1]  # Текст уже проверен в фоне: не получаем и не разбираем его заново
+            elif result is not None and isinstance(result[2], json.JSONDecodeError):
+                raise result[2]
+            else:
+                json_text = self.text_area.get(1.0, tk.END)  # Получаем текст из поля
+                error = check_text(json_text)  # Проверяем корректность JSON перед сохранением
+                if error is not None:
+                    raise error
             # Открываем диалог для выбора пути сохранения
             save_path = filedialog.asksaveasfilename(
                 defaultextension=".json",  # Автоматически добавляем .json
                 filetypes=[("JSON files", "*.json")]  # Фильтр для .json файлов
             )
             if save_path:  # Если пользователь выбрал путь
-                with open(save_path, 'w', encoding='utf-8') as file:  # Открываем файл для записи
-                    file.write(json_text)  # Записываем текст
+                save_text(save_path, json_text)  # Записываем текст (через временный файл)
                 messagebox.showinfo("Успех", "Файл успешно сохранен!")  # Сообщаем об успехе
         except json.JSONDecodeError:  # Обрабатываем ошибку некорректного JSON
             messagebox.showerror("Ошибка", "Некорректный JSON! Проверьте синтаксис.")
@@ -0,0 +1,128 @@
+import contextlib  # Для перенаправления вывода редактора в буфер
+import sys  # Для stdin и сообщений в stderr
+import time  # Для замера скорости
+from itertools import islice  # Чтение скрипта порциями
+from typing import Iterable, List, Optional, TextIO
+
+from commands import parse_command
+
+# Пакетный режим: команды читаются из файла (или stdin) без приглашений ввода и выполняются
+# так же, как в интерактивном режиме, с тем же выводом. Скрипт читается порциями по CHUNK
+# строк: каждая порция разбирается в список операций (метод редактора, аргументы),
+# соседние вставки в одну строку объединяются, затем операции выполняются подряд.
+# В конце в stderr выводится число команд и скорость выполнения.
+
+OUTPUT_BUFFER = 1 << 20  # Размер буфера ввода и вывода (1 МБ)
+CHUNK = 1 << 16  # Сколько строк скрипта разбирается за раз
+MAX_PARSED = 1 << 16  # Сколько различных строк запоминать
+
+EXIT = (None, ())  # Операция для команды exit: выполнение прекращается
+
+def compile_commands(editor, lines: Iterable[str], parsed: dict) -> List[tuple]:
+    """
+    Разбирает строки скрипта в список операций (метод, аргументы) для editor.
+    Ошибки разбора становятся операциями вывода сообщения, чтобы оно появилось в том же месте,
+    что и в интерактивном режиме. parsed — кэш уже разобранных строк.
+    """
+    operations = []
+    for line in lines:
+        operation = parsed.get(line)
+        if operation is None:
+            try:
+                command = parse_command(line)
+            except ValueError as e:
+                operation = (print, (str(e),))
+            else:
+                if command is None:
+                    continue  # Пустая строка
+                cmd, args = command
+                operation = EXIT if cmd == "exit" else (editor.commands[cmd], args)
+            if len(parsed) < MAX_PARSED:
+                parsed[line] = operation
+        operations.append(operation)
+    return operations
+
+def _mergeable_row(insert, operation: tuple) -> Optional[int]:
+    """Номер строки для вставки (операции с методом insert), которую можно объединить с соседними, иначе None."""
+    handler, args = operation
+    if handler != insert:
+        return None
+    _, row, col = args
+    # Вставки с ошибкой в номере строки или позиции выполняются отдельно, чтобы вывести сообщение
+    if row is None or row < 1 or (col is not None and col < 0):
+        return None
+    return row
+
+def coalesce(editor, operations: List[tuple]) -> List[tuple]:
+    """
+    Объединяет идущие подряд вставки в одну и ту же строку в одну операцию insert_run:
+    строка документа изменяется один раз, а история отмены остаётся такой же, как при
+    выполнении вставок по одной.
+    """
+    insert = editor.insert
+    result = []
+    i = 0
+    while i < len(operations):
+        row = _mergeable_row(insert, operations[i])
+        j = i + 1
+        if row is not None:
+            while j < len(operations) and _mergeable_row(insert, operations[j]) == row:
+                j += 1
+        if j - i > 1:
+            edits = [(text, col) for _, (text, _, col) in operations[i:j]]
+            result.append((editor.insert_run, (row, edits)))
+        else:
+            result.append(operations[i])
+        i = j
+    return result
+
+def execute_commands(editor, lines: Iterable[str]) -> int:
+    """
+    Выполняет команды из итерируемого lines (по одной на строку) до конца или до команды exit.
+    Возвращает число выполненных команд (без пустых строк).
+    """
+    parsed = {}  # Разобранные строки: в скриптах команды часто повторяются
+    executed = 0
+    lines = iter(lines)
+    while True:
+        chunk = list(islice(lines, CHUNK))
+        if not chunk:
+            return executed
+        operations = compile_commands(editor, chunk, parsed)
+        for handler, args in coalesce(editor, operations):
+            if handler is None:
+                return executed + operations.index(EXIT) + 1  # Команды до exit и сама exit
+            try:
+                handler(*args)
+            except ValueError:
+                print("Ошибка: Неверный формат аргументов.")
+            except Exception as e:
+                print(f"Ошибка: {e}")
+        executed += len(operations)
+
+def run_script(editor, source: str) -> int:
+    """
+    Запускает пакетный режим для файла source ('-' — стандартный ввод).
+    Возвращает код завершения: 0 — скрипт выполнен, 1 — файл не найден.
+    """
+    # Отдельный буферизованный поток поверх дескриптора stdout: вывод сбрасывается блоками по 1 МБ
+    sys.stdout.flush()
+    out: TextIO = open(sys.stdout.fileno(), "w", buffering=OUTPUT_BUFFER, encoding="utf-8", closefd=False)
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(out):
+            if source == "-":
+                executed = execute_commands(editor, sys.stdin)
+            else:
+                with open(source, encoding="utf-8", buffering=OUTPUT_BUFFER) as f:
+                    executed = execute_commands(editor, f)
+    except FileNotFoundError:
+        out.close()
+        print(f"Файл {source} не найден.", file=sys.stderr)
+        return 1
+    out.close()
+
+    elapsed = time.perf_counter() - start
+    rate = f" ({executed / elapsed:,.0f} команд/с)" if elapsed > 0 else ""
+    print(f"Выполнено команд: {executed} за {elapsed:.2f} с{rate}", file=sys.stderr)
+    return 0
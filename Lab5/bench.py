@@ -0,0 +1,78 @@
+import contextlib  # Для подавления вывода редактора во время замеров
+import os  # Для временного файла
+import random  # Для случайных правок
+import sys  # Для аргументов командной строки
+import tempfile  # Для временного файла
+import time  # Для замера времени
+
+from main import TextEditor
+
+# Замер правок и undo/redo на большом файле.
+# Запуск: python bench.py [размер_файла_в_МБ] [количество_правок]
+
+def make_file(path: str, size_mb: int) -> int:
+    """Записывает файл из строк по ~50 символов общим размером size_mb МБ; возвращает число строк."""
+    line = "x" * 49
+    count = size_mb * 1024 * 1024 // (len(line) + 1)
+    with open(path, "w", encoding="utf-8") as f:
+        block = 100_000
+        for i in range(0, count, block):
+            f.write("\n".join(line for _ in range(min(block, count - i))) + "\n")
+    return count
+
+def peak_memory_mb() -> str:
+    """Пиковый объём памяти процесса (там, где его можно узнать)."""
+    try:
+        import resource  # Есть только в Unix
+    except ImportError:
+        return "неизвестно"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # В Linux ru_maxrss в КБ, в macOS — в байтах
+    return f"{peak / (1024 * 1024 if sys.platform == 'darwin' else 1024):.0f} МБ"
+
+def timed(title: str, action, count: int = 0) -> None:
+    """Выполняет action(), подавляя вывод, и печатает время и скорость (если задано число операций)."""
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        action()
+    elapsed = time.perf_counter() - start
+    rate = f" ({count / elapsed:,.0f} операций/с)" if count else ""
+    print(f"{title}: {elapsed:.2f} с{rate}")
+
+def main():
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    random.seed(0)
+
+    fd, path = tempfile.mkstemp(suffix=".txt")
+    os.close(fd)
+    try:
+        lines = make_file(path, size_mb)
+        print(f"Файл: {size_mb} МБ, {lines} строк; правок: {edits}")
+
+        start = time.perf_counter()
+        editor = TextEditor(path)
+        print(f"Загрузка: {time.perf_counter() - start:.2f} с")
+
+        def edit():
+            for _ in range(edits):
+                kind = random.random()
+                n = len(editor.lines)
+                if kind < 0.6:
+                    editor.insert("edit", random.randint(1, n), random.randint(0, 60))
+                elif kind < 0.8:
+                    editor.delete_row(random.randint(1, n))
+                else:
+                    editor.swap_rows(random.randint(1, n), random.randint(1, n))
+
+        timed("Правки", edit, edits)
+        print(f"В истории правок: {len(editor.history)}, объём истории: {editor.history.size / 1024 / 1024:.1f} МБ")
+        timed("Отмена всех правок", lambda: [editor.undo() for _ in range(edits)], edits)
+        timed("Повтор всех правок", lambda: [editor.redo() for _ in range(edits)], edits)
+        timed("Сохранение", editor.save_file)
+        print(f"Пиковая память: {peak_memory_mb()}")
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
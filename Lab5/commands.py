@@ -0,0 +1,57 @@
+import re  # Регулярное выражение для деления команды на части
+from typing import List, Optional, Tuple
+
+# Разбор команд редактора. Команда превращается в пару (имя, аргументы), например
+# ("insert", ("text", 2, None)) или ("swap", (1, 3)); выполняет её TextEditor.execute.
+#
+# Текст в кавычках может содержать пробелы: он продолжается до кавычки, за которой
+# идёт пробел или конец строки, поэтому кавычки внутри текста допустимы: insert "a "b"" 1.
+
+Command = Tuple[str, tuple]
+
+# Текст в кавычках (до кавычки перед пробелом или концом строки) или часть без пробелов
+TOKEN = re.compile(r'"(?:[^"]|"(?!\s|$))*"(?=\s|$)|\S+')
+
+BAD_FORMAT = "Ошибка: Неверный формат аргументов."
+
+def split_command(line: str) -> List[str]:
+    """Делит строку команды на части по пробелам, не разделяя текст в кавычках."""
+    if '"' not in line:
+        return line.split()  # Быстрый путь: кавычек нет
+    return TOKEN.findall(line)
+
+def _numbers(parts: List[str]) -> List[int]:
+    """Переводит номера строк и позиции в числа."""
+    try:
+        return [int(part) for part in parts]
+    except ValueError:
+        raise ValueError(BAD_FORMAT) from None
+
+def parse_command(line: str) -> Optional[Command]:
+    """
+    Разбирает строку команды. Возвращает (имя, аргументы) или None для пустой строки.
+    При ошибке бросает ValueError с сообщением для пользователя.
+    """
+    parts = split_command(line)
+    if not parts:
+        return None
+
+    cmd = parts[0].lower()  # Команды не зависят от регистра
+    if cmd == "insert":
+        # Текст должен быть заключен в кавычки
+        if len(parts) < 2 or parts[1][0] != '"' or parts[1][-1] != '"':
+            raise ValueError('Ошибка: Текст должен быть в двойных кавычках.')
+        # Номер строки и позиция курсора необязательны
+        row, col = (_numbers(parts[2:4]) + [None, None])[:2]
+        return cmd, (parts[1][1:-1], row, col)
+    if cmd == "delrow":
+        if len(parts) < 2:
+            raise ValueError("Ошибка: Укажите номер строки.")
+        return cmd, tuple(_numbers(parts[1:2]))
+    if cmd == "swap":
+        if len(parts) < 3:
+            raise ValueError("Ошибка: Укажите два номера строк.")
+        return cmd, tuple(_numbers(parts[1:3]))
+    if cmd in ("del", "undo", "redo", "save", "compact", "exit"):
+        return cmd, ()
+    raise ValueError(f"Неизвестная команда: {cmd}")
@@ -0,0 +1,225 @@
+import random  # Случайные приоритеты узлов декартова дерева
+from typing import Iterator, Optional, Sequence, Tuple  # Типы для аннотаций
+
+# Модель документа: таблица фрагментов (piece table) по строкам.
+# Документ — последовательность фрагментов, каждый фрагмент ссылается на отрезок строк
+# в одном из буферов: исходные строки файла, список строк, добавленных одной правкой,
+# или «пустые строки» (для добавления строк без выделения памяти под каждую).
+# У каждой правки свой маленький буфер: когда строка заменяется снова, на прежний буфер
+# больше не ссылается ни один фрагмент, и его память освобождается (общий буфер,
+# который только дописывается, рос бы с каждой правкой, даже если строки уже нет).
+# Фрагменты хранятся в декартовом дереве по неявному ключу (номеру строки), поэтому
+# поиск, вставка и удаление строки выполняются за O(log n) от числа фрагментов.
+# Узлы дерева не изменяются после создания (изменение копирует путь от корня),
+# поэтому копия документа создаётся за O(1) и не зависит от будущих правок.
+# Строки отображённого файла, число которых ещё не известно (у буфера есть метод reach),
+# лежат в «хвосте» после дерева и переносятся в дерево по мере обращения к ним:
+# правка строки в начале большого файла не требует просмотра всего файла.
+
+class BlankLines:
+    """Буфер, в котором любая строка пустая: заполнение документа пустыми строками без копирования."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [""] * len(range(*index.indices(index.stop)))
+        return ""
+
+BLANK = BlankLines()
+
+class _Node:
+    """Узел дерева: фрагмент (буфер, начало, количество строк) и размер поддерева в строках."""
+
+    __slots__ = ("buffer", "start", "count", "priority", "left", "right", "size")
+
+    def __init__(self, buffer: Sequence[str], start: int, count: int, priority: float,
+                 left: Optional["_Node"] = None, right: Optional["_Node"] = None):
+        self.buffer = buffer
+        self.start = start
+        self.count = count
+        self.priority = priority
+        self.left = left
+        self.right = right
+        self.size = count + _size(left) + _size(right)
+
+    def with_children(self, left: Optional["_Node"], right: Optional["_Node"]) -> "_Node":
+        """Копия узла с другими потомками (сам узел не изменяется)."""
+        return _Node(self.buffer, self.start, self.count, self.priority, left, right)
+
+def _size(node: Optional[_Node]) -> int:
+    return node.size if node is not None else 0
+
+def _merge(a: Optional[_Node], b: Optional[_Node]) -> Optional[_Node]:
+    """Соединяет два дерева: все строки a идут перед строками b."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    if a.priority > b.priority:
+        return a.with_children(a.left, _merge(a.right, b))
+    return b.with_children(_merge(a, b.left), b.right)
+
+def _split(node: Optional[_Node], k: int) -> Tuple[Optional[_Node], Optional[_Node]]:
+    """Делит дерево на первые k строк и остальные (фрагмент на границе режется на два)."""
+    if node is None:
+        return None, None
+    left_size = _size(node.left)
+    if k <= left_size:
+        a, b = _split(node.left, k)
+        return a, node.with_children(b, node.right)
+    if k >= left_size + node.count:
+        a, b = _split(node.right, k - left_size - node.count)
+        return node.with_children(node.left, a), b
+    # Граница внутри фрагмента узла: левая часть остаётся в узле, правая становится новым узлом
+    cut = k - left_size
+    head = _Node(node.buffer, node.start, cut, node.priority, node.left, None)
+    tail = _Node(node.buffer, node.start + cut, node.count - cut, random.random())
+    return head, _merge(tail, node.right)
+
+def _piece(buffer: Sequence[str], start: int, count: int) -> Optional[_Node]:
+    """Дерево из одного фрагмента (или пустое, если строк нет)."""
+    return _Node(buffer, start, count, random.random()) if count > 0 else None
+
+class Document:
+    """Документ из строк с вставкой, удалением и заменой строки за O(log n)."""
+
+    def __init__(self, lines: Optional[Sequence[str]] = None):
+        self.root = None
+        self.tail = None  # (буфер, начало): строки буфера от начала до конца, ещё не перенесённые в дерево
+        if hasattr(lines, "reach"):
+            self.tail = (lines, 0)  # Отображённый файл: строки считаются по мере обращения
+        elif lines:
+            self.root = _piece(lines, 0, len(lines))
+
+    def copy(self) -> "Document":
+        """Копия документа за O(1): деревья и буферы строк не изменяются после создания."""
+        other = Document.__new__(Document)
+        other.root = self.root
+        other.tail = self.tail
+        return other
+
+    def _reach(self, count: Optional[int] = None) -> None:
+        """Переносит строки хвоста в дерево, пока в нём не будет count строк (None — все строки)."""
+        if self.tail is None or (count is not None and _size(self.root) >= count):
+            return
+        buffer, start = self.tail
+        known = len(buffer) if count is None else buffer.reach(start + count - _size(self.root))
+        self.root = _merge(self.root, _piece(buffer, start, known - start))
+        self.tail = None if buffer.complete and known == buffer.count else (buffer, known)
+
+    def __len__(self) -> int:
+        self._reach()
+        return _size(self.root)
+
+    def has_line(self, index: int) -> bool:
+        """Есть ли в документе строка index (файл просматривается только до неё, а не целиком)."""
+        self._reach(index + 1)
+        return 0 <= index < _size(self.root)
+
+    def _check(self, index: int) -> None:
+        if not self.has_line(index):
+            raise IndexError("номер строки вне документа")
+
+    def __getitem__(self, index: int) -> str:
+        """Строка с номером index (с 0; отрицательные номера считаются с конца, как у списка)."""
+        if index < 0:
+            index += len(self)
+        self._check(index)
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if index < left_size:
+                node = node.left
+            elif index < left_size + node.count:
+                return node.buffer[node.start + index - left_size]
+            else:
+                index -= left_size + node.count
+                node = node.right
+
+    def _added_piece(self, texts: Sequence[str]) -> Optional[_Node]:
+        """Фрагмент из новых строк texts в собственном буфере."""
+        return _piece(list(texts), 0, len(texts))
+
+    def __setitem__(self, index: int, text: str) -> None:
+        """Заменяет строку index на text."""
+        self._check(index)
+        head, rest = _split(self.root, index)
+        _, tail = _split(rest, 1)
+        self.root = _merge(_merge(head, self._added_piece([text])), tail)
+
+    def insert_lines(self, index: int, texts: Sequence[str]) -> None:
+        """Вставляет строки texts перед строкой index (index == len(self) — в конец)."""
+        self._reach(index)
+        head, tail = _split(self.root, index)
+        self.root = _merge(_merge(head, self._added_piece(texts)), tail)
+
+    def append_blank(self, count: int) -> None:
+        """Добавляет count пустых строк в конец одним фрагментом."""
+        self._reach()
+        self.root = _merge(self.root, _piece(BLANK, 0, count))
+
+    def truncate(self, count: int) -> None:
+        """Оставляет только первые count строк."""
+        self._reach(count)
+        self.root, _ = _split(self.root, count)
+        self.tail = None
+
+    def delete(self, index: int) -> None:
+        """Удаляет строку index."""
+        self._check(index)
+        head, rest = _split(self.root, index)
+        _, tail = _split(rest, 1)
+        self.root = _merge(head, tail)
+
+    def swap(self, i: int, j: int) -> None:
+        """Меняет местами строки i и j перестановкой фрагментов (без копирования текста)."""
+        self._check(i)
+        self._check(j)
+        if i == j:
+            return
+        i, j = min(i, j), max(i, j)
+        head, rest = _split(self.root, i)
+        first, rest = _split(rest, 1)
+        middle, rest = _split(rest, j - i - 1)
+        second, tail = _split(rest, 1)
+        self.root = _merge(_merge(_merge(_merge(head, second), middle), first), tail)
+
+    def pieces(self) -> Iterator[Tuple[Sequence[str], int, int]]:
+        """Фрагменты документа по порядку: (буфер, начало, количество строк)."""
+        self._reach()
+        return self._tree_pieces()
+
+    def _tree_pieces(self) -> Iterator[Tuple[Sequence[str], int, int]]:
+        """Фрагменты дерева по порядку (без строк хвоста)."""
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.buffer, node.start, node.count
+            node = node.right
+
+    def memory_size(self) -> int:
+        """
+        Примерный объём строк документа в памяти (байт). Строки отображённого файла
+        и пустые строки памяти не занимают и не учитываются.
+        """
+        total = 0
+        for buffer, start, count in self._tree_pieces():
+            if isinstance(buffer, list):
+                total += 8 * count + sum(map(len, buffer[start:start + count]))
+        return total
+
+    def materialized(self, buffer: Sequence[str]) -> "Document":
+        """Копия документа, в которой строки буфера buffer скопированы в память (после этого буфер можно закрыть)."""
+        other = Document()
+        for piece_buffer, start, count in self.pieces():
+            if piece_buffer is buffer:
+                piece_buffer, start = buffer[start:start + count], 0
+            other.root = _merge(other.root, _piece(piece_buffer, start, count))
+        return other
+
+    def __iter__(self) -> Iterator[str]:
+        for buffer, start, count in self.pieces():
+            yield from buffer[start:start + count]
@@ -0,0 +1,82 @@
+from collections import deque  # Очередь правок: старые правки вытесняются с начала
+from typing import Deque, List, Optional, Tuple  # Типы для аннотаций
+
+# История правок для undo/redo. Вместо копии документа на каждую операцию хранится
+# только сама правка (дельта): для вставки — позиция и вставленный текст, а не строка
+# целиком, поэтому объём записи пропорционален размеру правки, а не длине строки.
+# Отмена и повтор применяют дельту в обратную или прямую сторону за время,
+# пропорциональное длине затронутой строки, а не размеру документа.
+#
+# Виды правок (kind, аргументы):
+#   "insert": (row, col, text, spaces, padded) — в строку row в позицию col вставлен text;
+#             перед ним spaces пробелов (позиция была за концом строки); padded пустых строк добавлено в конец
+#   "delrow": (row, text, only) — удалена строка row; only — была единственной (документ стал [""])
+#   "swap":   (row1, row2) — обмен строк (сам себе обратен)
+#   "del":    (old_document,) — удалено всё; хранится прежний документ (копия за O(1)),
+#             в объём истории входят его строки, которые держит в памяти только история
+
+Edit = Tuple[str, tuple]
+
+DEFAULT_LIMIT = 64 * 1024 * 1024  # Ограничение памяти истории по умолчанию (64 МБ)
+EDIT_OVERHEAD = 100  # Примерный размер записи правки без текста (байт)
+
+def edit_cost(kind: str, args: tuple) -> int:
+    """Примерный объём памяти, который занимает правка."""
+    if kind == "insert":
+        return EDIT_OVERHEAD + len(args[2])
+    if kind == "delrow":
+        return EDIT_OVERHEAD + len(args[1])
+    if kind == "del":
+        return EDIT_OVERHEAD + args[0].memory_size()
+    return EDIT_OVERHEAD
+
+class EditHistory:
+    """Стеки отмены и повтора с ограничением общего объёма limit_bytes."""
+
+    def __init__(self, limit_bytes: int = DEFAULT_LIMIT):
+        self.limit_bytes = limit_bytes
+        self.undo_stack: Deque[Tuple[Edit, int]] = deque()  # (правка, её объём)
+        self.redo_stack: List[Tuple[Edit, int]] = []
+        self.size = 0  # Текущий объём обоих стеков
+
+    def __len__(self) -> int:
+        return len(self.undo_stack)
+
+    def record(self, kind: str, *args) -> None:
+        """Запоминает новую правку. Повторять отменённые правки после неё уже нельзя."""
+        self.size -= sum(cost for _, cost in self.redo_stack)
+        self.redo_stack.clear()
+        cost = edit_cost(kind, args)
+        self.undo_stack.append(((kind, args), cost))
+        self.size += cost
+        # Вытесняем самые старые правки, пока история не уложится в ограничение
+        while self.size > self.limit_bytes and len(self.undo_stack) > 1:
+            self.size -= self.undo_stack.popleft()[1]
+
+    def materialize(self, buffer) -> None:
+        """
+        Копирует в память строки буфера buffer в документах, сохранённых правками del
+        (перед закрытием отображённого файла). Объём истории пересчитывается.
+        """
+        for stack in (self.undo_stack, self.redo_stack):
+            for i, ((kind, args), cost) in enumerate(stack):
+                if kind == "del":
+                    edit = (kind, (args[0].materialized(buffer),))
+                    stack[i] = (edit, edit_cost(*edit))
+                    self.size += stack[i][1] - cost
+
+    def pop_undo(self) -> Optional[Edit]:
+        """Достаёт последнюю правку для отмены (она переходит в стек повтора)."""
+        if not self.undo_stack:
+            return None
+        item = self.undo_stack.pop()
+        self.redo_stack.append(item)
+        return item[0]
+
+    def pop_redo(self) -> Optional[Edit]:
+        """Достаёт последнюю отменённую правку для повтора (она возвращается в стек отмены)."""
+        if not self.redo_stack:
+            return None
+        item = self.redo_stack.pop()
+        self.undo_stack.append(item)
+        return item[0]
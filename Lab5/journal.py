@@ -0,0 +1,134 @@
+import json  # Формат записей журнала (одна операция на строку)
+import os  # Для работы с файлами и fsync
+from typing import List, Optional, Tuple
+
+# Журнал упреждающей записи (write-ahead log) для сохранения без перезаписи файла.
+# Команда save дописывает в журнал <файл>.journal только операции над строками,
+# сделанные после предыдущего сохранения, и завершает пакет отметкой ["commit"].
+# Сам файл переписывается (сжатие журнала) только по команде compact или когда
+# журнал превышает ограничение: во временный файл, который затем заменяет исходный.
+#
+# Первая строка журнала — заголовок с размером, временем изменения и числом строк файла,
+# к которому относятся операции. Если файл изменился (например, сбой случился после замены файла,
+# но до удаления журнала), журнал устарел и не применяется. Незавершённый пакет
+# (сбой во время дозаписи) также не применяется: читаются только пакеты до отметки commit.
+# Если файл тот же, но прочитан с другим числом строк, операции применять нельзя: журнал
+# считается ошибочным, и редактор откладывает его в <файл>.journal.bad.
+# Файл сохраняется без пустой последней строки документа (перевод строки пишется только
+# после непустой), поэтому заголовок отмечает её ("blank_tail"), и при чтении журнала
+# она восстанавливается операцией pad перед остальными.
+#
+# Операции: ["set", строка, текст], ["pad", число], ["truncate", число], ["delete", строка],
+#           ["insert", строка, текст], ["swap", строка1, строка2], ["clear"].
+
+DEFAULT_LIMIT = 4 * 1024 * 1024  # Размер журнала, после которого файл переписывается (4 МБ)
+
+Operation = list
+
+def journal_path(file_path: str) -> str:
+    """Путь к журналу файла file_path."""
+    return file_path + ".journal"
+
+def file_identity(path: str) -> Tuple[int, int]:
+    """Размер и время изменения файла (или (-1, -1), если файла нет)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return -1, -1
+    return st.st_size, st.st_mtime_ns
+
+class Journal:
+    """Журнал операций для файла file_path."""
+
+    def __init__(self, file_path: str, limit_bytes: int = DEFAULT_LIMIT):
+        self.file_path = file_path
+        self.path = journal_path(file_path)
+        self.limit_bytes = limit_bytes
+
+    def size(self) -> int:
+        """Текущий размер журнала в байтах (0, если журнала нет)."""
+        try:
+            return os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+
+    def read(self, line_count: int) -> Optional[List[Operation]]:
+        """
+        Читает завершённые пакеты операций для файла, прочитанного как line_count строк
+        (первой операцией идёт восстановление пустой последней строки, если она была). Возвращает None,
+        если журнала нет или он относится к другой версии файла. Бросает ValueError,
+        если журнал записан для того же файла, но с другим числом строк.
+        """
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                lines = f.read().split("\n")
+        except FileNotFoundError:
+            return None
+        try:
+            header = json.loads(lines[0])
+        except ValueError:
+            return None
+        if [header.get("size"), header.get("mtime_ns")] != list(file_identity(self.file_path)):
+            return None
+        if header.get("lines", line_count) != line_count:
+            raise ValueError(f"журнал записан для файла из {header['lines']} строк, а прочитано {line_count}")
+
+        operations: List[Operation] = [["pad", 1]] if header.get("blank_tail") else []
+        batch: List[Operation] = []
+        committed = 1  # Сколько строк журнала (с заголовком) относится к завершённым пакетам
+        for number, line in enumerate(lines[1:], 2):
+            try:
+                operation = json.loads(line)
+            except ValueError:
+                break  # Оборванная запись: дальше данных нет
+            if operation == ["commit"]:
+                operations.extend(batch)
+                batch = []
+                committed = number
+            else:
+                batch.append(operation)
+
+        if any(lines[committed:]):
+            # После последней отметки commit остался мусор от сбоя: переписываем журнал без него,
+            # иначе следующие пакеты оказались бы после оборванной записи и не прочитались бы
+            self._replace("\n".join(lines[:committed]) + "\n")
+        return operations
+
+    def _replace(self, text: str) -> None:
+        """Атомарно заменяет содержимое журнала."""
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def append(self, operations: List[Operation], line_count: int, blank_tail: bool = False) -> None:
+        """
+        Дописывает пакет операций с отметкой commit и сбрасывает его на диск.
+        line_count — число строк при чтении файла, blank_tail — документ, к которому применяются
+        операции, длиннее на пустую последнюю строку, не попавшую в файл (для заголовка).
+        """
+        new = not os.path.exists(self.path)
+        with open(self.path, 'a', encoding='utf-8') as f:
+            if new:
+                size, mtime_ns = file_identity(self.file_path)
+                f.write(json.dumps({"size": size, "mtime_ns": mtime_ns, "lines": line_count,
+                                    "blank_tail": blank_tail}) + "\n")
+            f.write("".join(json.dumps(operation, ensure_ascii=False) + "\n" for operation in operations))
+            f.write('["commit"]\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def set_aside(self) -> str:
+        """Переименовывает журнал, который не удалось применить, чтобы он не потерялся. Возвращает новый путь."""
+        bad_path = self.path + ".bad"
+        os.replace(self.path, bad_path)
+        return bad_path
+
+    def remove(self) -> None:
+        """Удаляет журнал (после того как файл переписан)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,173 @@
+import mmap  # Отображение файла в память
+import os  # Для размера файла
+import re  # Поиск разделителей строк, отличных от "\n"
+from bisect import bisect_right  # Поиск блока по номеру строки
+from functools import lru_cache  # Кэш позиций переводов строк в недавно прочитанных блоках
+from typing import List, Optional, Tuple
+
+# Ленивое чтение большого файла: файл отображается в память, а строки декодируются
+# только при обращении к ним. Индекс строк разреженный: для каждого блока файла
+# (BLOCK байт) хранится лишь число разделителей строк до его начала; точные смещения
+# строк внутри блока вычисляются при первом обращении к блоку и кэшируются.
+# Индекс строится по мере обращения к строкам: блоки просматриваются по порядку только
+# до нужной строки, поэтому открытие файла не читает его целиком. Число строк всего файла
+# становится известно, только когда просмотрен весь файл (len).
+#
+# Строки делятся так же, как str.splitlines() при обычном чтении файла: по "\n", "\r\n"
+# (один разделитель), "\r" и остальным разделителям ("\x0b", "\x0c", "\x1c"-"\x1e", U+0085,
+# U+2028, U+2029). При сохранении все разделители нетронутых участков заменяются на "\n",
+# как при записи строк, прочитанных обычным способом.
+
+BLOCK = 64 * 1024  # Размер блока разреженного индекса (байт)
+WRITE_CHUNK = 16 * 1024 * 1024  # Порция записи нетронутых участков при сохранении
+
+# Разделители строк str.splitlines() в кодировке UTF-8 ("\r\n" раньше "\r", чтобы пара была одним разделителем)
+SEPARATOR = re.compile(rb"\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e]|\xc2\x85|\xe2\x80[\xa8\xa9]")
+# Разделители, кроме "\n": если их нет в блоке, строки в нём ищутся быстрым поиском одного байта
+OTHER_SEPARATORS = (b"\r", b"\x0b", b"\x0c", b"\x1c", b"\x1d", b"\x1e", b"\xc2\x85", b"\xe2\x80\xa8", b"\xe2\x80\xa9")
+
+def _only_newlines(data: bytes) -> bool:
+    """True, если строки в data разделены только "\n"."""
+    return not any(separator in data for separator in OTHER_SEPARATORS)
+
+class MappedLines:
+    """Строки файла, отображённого в память; поддерживает len, line[i] и срезы, как список строк."""
+
+    def __init__(self, path: str, mm: mmap.mmap):
+        self.path = path
+        self.mm = mm
+        self.size = len(mm)
+        self.breaks_before: List[int] = []  # Число разделителей, начинающихся до каждого просмотренного блока
+        self.block_skip: List[int] = []  # Сколько байт в начале блока занято разделителем из предыдущего
+        self.breaks = 0  # Сколько разделителей найдено в просмотренных блоках
+        self._skip = 0  # block_skip для следующего блока
+        self.complete = False  # Просмотрен весь файл
+        self.count = 0  # Число строк (известно, когда complete)
+        self._block_breaks = lru_cache(maxsize=256)(self._find_breaks)
+
+    @classmethod
+    def open(cls, path: str) -> Optional["MappedLines"]:
+        """Отображает файл в память (без чтения). Возвращает None, если файл пустой."""
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return None
+            return cls(path, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    def close(self) -> None:
+        """Закрывает отображение (например, перед заменой файла: в Windows отображённый файл заменить нельзя)."""
+        self._block_breaks.cache_clear()
+        self.mm.close()
+
+    def reopen(self) -> None:
+        """Снова отображает тот же, не изменившийся файл после close (индекс остаётся верным)."""
+        with open(self.path, "rb") as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _find_breaks(self, block: int) -> List[Tuple[int, int]]:
+        """Разделители, начинающиеся в блоке block: пары (начало, конец) смещений в файле."""
+        start = block * BLOCK
+        # Захватываем 2 лишних байта, чтобы не разрезать разделитель на границе блоков
+        data = self.mm[start:start + BLOCK + 2]
+        limit = min(BLOCK, len(data))
+        skip = self.block_skip[block]
+        breaks = []
+        if _only_newlines(data):
+            pos = data.find(b"\n", skip, limit)
+            while pos != -1:
+                breaks.append((start + pos, start + pos + 1))
+                pos = data.find(b"\n", pos + 1, limit)
+            return breaks
+        for match in SEPARATOR.finditer(data, skip):
+            if match.start() >= limit:
+                break
+            breaks.append((start + match.start(), start + match.end()))
+        return breaks
+
+    def _scan_block(self) -> None:
+        """Добавляет в индекс следующий блок файла."""
+        block = len(self.breaks_before)
+        self.breaks_before.append(self.breaks)
+        self.block_skip.append(self._skip)
+        start = block * BLOCK
+        end = start + BLOCK
+        data = self.mm[start:end + 2]
+        if _only_newlines(data):
+            self.breaks += data.count(b"\n", self._skip, BLOCK)
+            self._skip = 0
+        else:
+            breaks = self._block_breaks(block)
+            self.breaks += len(breaks)
+            self._skip = max(breaks[-1][1] - end, 0) if breaks else 0
+        if end >= self.size:
+            self.complete = True
+            # Последняя строка без завершающего разделителя тоже считается строкой (как у splitlines)
+            last = self._break(self.breaks - 1)[1] if self.breaks else 0
+            self.count = self.breaks + (0 if last == self.size else 1)
+
+    def reach(self, count: int) -> int:
+        """
+        Просматривает файл, пока не станут известны границы первых count строк (или весь файл).
+        Возвращает число строк с известными границами.
+        """
+        while not self.complete and self.breaks < count:
+            self._scan_block()
+        return self.count if self.complete else self.breaks
+
+    def __len__(self) -> int:
+        while not self.complete:
+            self._scan_block()
+        return self.count
+
+    def _break(self, k: int) -> Tuple[int, int]:
+        """Начало и конец k-го (с 0) разделителя строк (блок с ним должен быть просмотрен)."""
+        block = bisect_right(self.breaks_before, k) - 1
+        return self._block_breaks(block)[k - self.breaks_before[block]]
+
+    def offset(self, index: int) -> int:
+        """Смещение начала строки index (index == len(self) — конец файла)."""
+        if index == 0:
+            return 0
+        self.reach(index)
+        if index > self.breaks:
+            return self.size
+        return self._break(index - 1)[1]
+
+    def span(self, start: int, count: int) -> range:
+        """Байтовый диапазон строк [start, start + count) без завершающего разделителя."""
+        end = start + count - 1  # Последняя строка диапазона
+        self.reach(end + 1)
+        stop = self._break(end)[0] if end < self.breaks else self.size
+        return range(self.offset(start), stop)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, _ = index.indices(len(self))
+            if start >= stop:
+                return []
+            span = self.span(start, stop - start)
+            lines = self.mm[span.start:span.stop].decode("utf-8").splitlines()
+            if len(lines) < stop - start:
+                lines.append("")  # splitlines не возвращает пустую последнюю строку
+            return lines
+        span = self.span(index, 1)
+        return self.mm[span.start:span.stop].decode("utf-8")
+
+    def write_span(self, f, start: int, count: int) -> None:
+        """
+        Записывает строки [start, start + count) в двоичный файл f без декодирования, порциями.
+        Порции режутся по началам строк, и разделители, отличные от "\n", заменяются на "\n".
+        """
+        span = self.span(start, count)
+        pos = span.start
+        block = pos // BLOCK
+        while pos < span.stop:
+            # Граница порции — начало первой строки блока, отстоящего на WRITE_CHUNK: внутри разделителя её не будет
+            block += WRITE_CHUNK // BLOCK
+            stop = span.stop
+            if block < len(self.breaks_before):
+                stop = min(self.offset(self.breaks_before[block]), stop)
+                if stop <= pos:
+                    continue  # Строка длиннее порции: граница дальше
+            data = self.mm[pos:stop]
+            f.write(data if _only_newlines(data) else SEPARATOR.sub(b"\n", data))
+            pos = stop
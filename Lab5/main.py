@@ -1,56 +1,209 @@
-import sys  # Модуль для работы с аргументами командной строки и завершения программы
+import argparse  # Модуль для разбора аргументов командной строки
 import os  # Модуль для работы с файловой системой (проверка существования файла, чтение/запись)
-from typing import List, Tuple, Optional  # Типы для аннотаций, улучшающих читаемость и проверку кода
+import sys  # Для кода завершения пакетного режима
+from typing import List, Optional, Tuple  # Типы для аннотаций, улучшающих читаемость и проверку кода
+
+from document import Document  # Документ на таблице фрагментов: правки строк за O(log n)
+from history import DEFAULT_LIMIT, EditHistory  # История правок в виде дельт для undo/redo
+from lazyfile import MappedLines  # Ленивое чтение больших файлов через mmap
+from journal import DEFAULT_LIMIT as JOURNAL_LIMIT, Journal, journal_path  # Журнал для сохранения без перезаписи файла
+from commands import Command, parse_command  # Разбор команд
+from batch import run_script  # Пакетное выполнение команд из файла
 
 class TextEditor:
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, history_limit: int = DEFAULT_LIMIT, lazy: bool = False,
+                 journal_limit: Optional[int] = None):
         # Инициализация редактора
         self.file_path = file_path  # Путь к файлу, с которым работает редактор
-        self.lines: List[str] = []  # Список строк файла, хранящий текущее содержимое в памяти
-        self.history: List[Tuple[str, List[str]]] = []  # История операций для команды undo (команда, состояние строк)
+        self.lazy = lazy  # Отображать файл в память и декодировать только затронутые строки
+        self.lines: Document = Document([""])  # Строки файла, хранящие текущее содержимое в памяти
+        self.mapped: Optional[MappedLines] = None  # Отображённый файл, на который ссылается документ (ленивый режим)
+        self.history = EditHistory(history_limit)  # Правки для команд undo и redo (не больше history_limit байт)
+        # Журнал сохранений (если задан journal_limit): save дописывает операции, файл переписывается реже
+        self.journal = Journal(file_path, journal_limit) if journal_limit is not None else None
+        self.pending: list = []  # Операции, ещё не записанные в журнал
+        self.needs_compaction = False  # Было изменение, которое нельзя записать в журнал
+        self.file_lines = 0  # Число строк, которое даёт чтение файла на диске (для заголовка журнала)
+        self.file_blank_tail = False  # Документ при сохранении кончался пустой строкой, которой нет в файле
+        # Таблица команд: имя команды -> метод, принимающий разобранные аргументы
+        self.commands = {
+            "insert": self.insert,
+            "del": self.delete_all,
+            "delrow": self.delete_row,
+            "swap": self.swap_rows,
+            "undo": self.undo,
+            "redo": self.redo,
+            "save": self.save_file,
+            "compact": lambda: self.save_file(compact=True),
+        }
         self.load_file()  # Загружаем файл при создании объекта
+        if self.journal is not None:
+            self.file_lines = len(self.lines)  # Для заголовка журнала (в ленивом режиме просматривает весь файл)
+            self.replay_journal()  # Восстанавливаем сохранения, ещё не перенесённые в файл
+        elif os.path.exists(journal_path(file_path)):
+            print(f"Внимание: найден журнал {journal_path(file_path)} с правками, которые ещё не перенесены "
+                  "в файл. Запустите редактор с --journal, чтобы применить их; сохранение без журнала их потеряет.")
 
     def load_file(self) -> None:
         """Загружает содержимое файла в память."""
         try:
             # Проверяем, существует ли файл
-            if os.path.exists(self.file_path):
+            mapped = MappedLines.open(self.file_path) if self.lazy and os.path.exists(self.file_path) else None
+            self.mapped = mapped
+            if mapped is not None:
+                # Ленивый режим: документ ссылается на строки отображённого файла без их чтения
+                self.lines = Document(mapped)
+            elif os.path.exists(self.file_path):
                 with open(self.file_path, 'r', encoding='utf-8') as f:
-                    # Читаем файл и разбиваем на строки, убирая символы новой строки
-                    self.lines = f.read().splitlines()
-                    # Если файл пустой, инициализируем одной пустой строкой
-                    if not self.lines:
-                        self.lines = [""]
+                    # Читаем файл и разбиваем на строки, убирая символы новой строки;
+                    # если файл пустой, инициализируем одной пустой строкой
+                    self.lines = Document(f.read().splitlines() or [""])
             else:
-                # Если файла нет, создаем пустой список с одной пустой строкой
-                self.lines = [""]
+                # Если файла нет, создаем документ с одной пустой строкой
+                self.lines = Document([""])
         except Exception as e:
             # Обрабатываем ошибки чтения файла и выводим сообщение
             print(f"Ошибка при загрузке файла: {e}")
-            self.lines = [""]
+            self.lines = Document([""])
 
-    def save_file(self) -> None:
-        """Сохраняет содержимое в файл."""
+    def replay_journal(self) -> None:
+        """
+        Применяет к загруженному файлу операции из журнала (после сбоя или выхода без сжатия).
+        Если журнал не применяется, он откладывается в сторону, а файл открывается без него.
+        """
         try:
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                # Записываем строки, соединяя их символом новой строки
-                f.write("\n".join(self.lines))
-                # Добавляем новую строку в конец, если последняя строка не пустая
-                if self.lines and self.lines[-1]:
-                    f.write("\n")
+            operations = self.journal.read(len(self.lines))
+            if operations is None:
+                self.journal.remove()  # Журнала нет или он относится к другой версии файла
+                return
+            for operation in operations:
+                self._apply(*operation, log=False)
+        except Exception as e:
+            bad_path = self.journal.set_aside()
+            print(f"Ошибка при восстановлении из журнала: {e}. Журнал сохранён в {bad_path}, "
+                  "файл открыт без изменений из него.")
+            self.load_file()  # Отбрасываем частично применённые операции
+            return
+        print(f"Восстановлено операций из журнала: {len(operations)}")
+
+    def _apply(self, op: str, *args, log: bool = True) -> None:
+        """Выполняет операцию над строками документа и запоминает её для журнала."""
+        if op == "set":
+            self.lines[args[0]] = args[1]
+        elif op == "pad":
+            self.lines.append_blank(args[0])
+        elif op == "truncate":
+            self.lines.truncate(args[0])
+        elif op == "delete":
+            self.lines.delete(args[0])
+        elif op == "insert":
+            self.lines.insert_lines(args[0], [args[1]])
+        elif op == "swap":
+            self.lines.swap(*args)
+        elif op == "clear":
+            self.lines = Document([""])
+        elif op == "restore":
+            self.lines = args[0]  # Возврат прежнего документа целиком (отмена del)
+        if self.journal is not None and log:
+            if op == "restore":
+                self.needs_compaction = True  # Весь документ в журнал не пишем — при сохранении файл переписывается
+            else:
+                self.pending.append([op, *args])
+
+    def save_file(self, compact: bool = False) -> None:
+        """Сохраняет содержимое в файл (compact — переписать файл целиком, даже если ведётся журнал)."""
+        try:
+            if self.journal is not None and not compact and not self.needs_compaction and \
+                    self.journal.size() + 64 * len(self.pending) < self.journal.limit_bytes:
+                # Быстрый путь: в журнал дописываются только изменения после прошлого сохранения
+                if self.pending:
+                    self.journal.append(self.pending, self.file_lines, self.file_blank_tail)
+                    self.pending = []
+            else:
+                self.compact()
             print("Файл сохранен.")
         except Exception as e:
             # Обрабатываем ошибки записи файла и выводим сообщение
             print(f"Ошибка при сохранении файла: {e}")
 
-    def save_to_history(self, command: str) -> None:
-        """Сохраняет текущее состояние в историю для возможности отмены."""
-        # Сохраняем команду и копию текущего списка строк
-        self.history.append((command, self.lines.copy()))
+    def compact(self) -> None:
+        """
+        Переписывает файл целиком: во временный файл, который затем атомарно заменяет исходный,
+        поэтому сбой во время записи не оставляет обрезанный файл. После этого журнал не нужен
+        (кроме отметки о пустой последней строке, которая в файл не попадает).
+        """
+        if self.lazy:
+            self._save_streaming()
+        else:
+            self._save_text()
+        if self.journal is not None:
+            self.journal.remove()
+        # Пустая последняя строка (кроме единственной) в файле не сохраняется: при чтении её не будет,
+        # и журнал должен вернуть её перед своими операциями
+        self.file_blank_tail = len(self.lines) > 1 and not self.lines[-1]
+        self.file_lines = len(self.lines) - self.file_blank_tail
+        if self.journal is not None and self.file_blank_tail:
+            self.journal.append([], self.file_lines, True)  # Пустой пакет: заголовок хранит отметку о строке
+        self.pending = []
+        self.needs_compaction = False
+
+    def _save_text(self) -> None:
+        """Записывает документ в текстовом режиме во временный файл и заменяет им исходный."""
+        tmp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            # Записываем строки, соединяя их символом новой строки; текст пишется
+            # по фрагментам документа, без сборки всего файла в одну строку
+            for number, (buffer, start, count) in enumerate(self.lines.pieces()):
+                if number:
+                    f.write("\n")
+                f.write("\n".join(buffer[start:start + count]))
+            # Добавляем новую строку в конец, если последняя строка не пустая
+            if len(self.lines) and self.lines[-1]:
+                f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())  # Данные на диске до замены файла
+        os.replace(tmp_path, self.file_path)
+
+    def _save_streaming(self) -> None:
+        """
+        Сохранение в ленивом режиме: нетронутые участки исходного файла копируются
+        байтами из отображения, декодируются и кодируются только изменённые строки.
+        Запись идёт во временный файл, который затем заменяет исходный: перезаписывать
+        файл, отображённый в память, на месте нельзя.
+        """
+        tmp_path = f"{self.file_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            for number, (buffer, start, count) in enumerate(self.lines.pieces()):
+                if number:
+                    f.write(b"\n")
+                if isinstance(buffer, MappedLines):
+                    buffer.write_span(f, start, count)
+                else:
+                    f.write("\n".join(buffer[start:start + count]).encode('utf-8'))
+            # Добавляем новую строку в конец, если последняя строка не пустая
+            if len(self.lines) and self.lines[-1]:
+                f.write(b"\n")
+            f.flush()
+            os.fsync(f.fileno())  # Данные на диске до замены файла
+        # Отображение закрывается до замены файла: в Windows отображённый файл заменить нельзя.
+        # Строки старого файла, которые ещё нужны истории (документ до del), копируются в память,
+        # а документ после замены снова ссылается на новый файл
+        blank_tail = len(self.lines) > 1 and not self.lines[-1]
+        if self.mapped is not None:
+            self.history.materialize(self.mapped)
+            self.mapped.close()
+        try:
+            os.replace(tmp_path, self.file_path)
+        except OSError:
+            if self.mapped is not None:
+                self.mapped.reopen()  # Файл не заменён: прежнее отображение снова действительно
+            raise
+        self.load_file()
+        if blank_tail:
+            self.lines.append_blank(1)  # Пустая последняя строка в файл не записывается
 
     def insert(self, text: str, row: Optional[int] = None, col: Optional[int] = None) -> None:
         """Вставляет текст в указанную позицию, добавляя пустые строки и пробелы при необходимости."""
-        self.save_to_history("insert")  # Сохраняем состояние перед изменением
         # Если номер строки не указан, вставляем в конец файла
         if row is None:
             row = len(self.lines)
@@ -59,131 +212,178 @@ class TextEditor:
         # Проверяем, что номер строки не отрицательный
         if row < 0:
             print(f"Ошибка: Номер строки {row + 1} вне диапазона.")
-            self.history.pop()  # Удаляем историю, так как операция не выполнена
+            return
+        # Проверяем, что позиция курсора не отрицательная (до любых изменений документа)
+        if col is not None and col < 0:
+            print(f"Ошибка: Позиция {col} вне строки.")
             return
 
-        # Добавляем пустые строки, если указанный номер строки превышает текущую длину
-        while row >= len(self.lines):
-            self.lines.append("")
+        self.insert_run(row + 1, [(text, col)])
+
+    def insert_run(self, row: int, edits: List[Tuple[str, Optional[int]]]) -> None:
+        """
+        Выполняет подряд несколько вставок (текст, позиция) в строку row (с 1). Номер строки
+        и позиции должны быть уже проверены (row >= 1, позиции не отрицательные или None).
+        Документ изменяется один раз, а в историю каждая вставка записывается отдельно.
+        """
+        row -= 1  # Преобразуем пользовательский номер строки (с 1) в индекс (с 0)
+        # Добавляем пустые строки (одним фрагментом), если указанный номер строки превышает текущую длину
+        padded = 0 if self.lines.has_line(row) else row + 1 - len(self.lines)
+        if padded:
+            self._apply("pad", padded)
 
         current_line = self.lines[row]  # Текущая строка для вставки
-        # Если позиция курсора не указана, вставляем в конец строки
-        if col is None:
-            col = len(current_line)
-        # Проверяем, что позиция курсора не отрицательная
-        if col < 0:
-            print(f"Ошибка: Позиция {col} вне строки.")
-            self.history.pop()  # Удаляем историю, так как операция не выполнена
-            return
+        for text, col in edits:
+            # Если позиция курсора не указана, вставляем в конец строки
+            if col is None:
+                col = len(current_line)
 
-        # Если позиция курсора превышает длину строки, добавляем пробелы
-        if col > len(current_line):
-            current_line += " " * (col - len(current_line))
-            self.lines[row] = current_line
+            # Если позиция курсора превышает длину строки, добавляем пробелы
+            spaces = max(col - len(current_line), 0)
+            current_line += " " * spaces
 
-        # Вставляем текст в указанную позицию
-        self.lines[row] = current_line[:col] + text + current_line[col:]
+            # Вставляем текст в указанную позицию и запоминаем правку (без текста строки) для отмены
+            current_line = current_line[:col] + text + current_line[col:]
+            self.history.record("insert", row, col, text, spaces, padded)
+            padded = 0  # Пустые строки добавлены первой вставкой
+        self._apply("set", row, current_line)
 
     def delete_all(self) -> None:
         """Удаляет все содержимое файла."""
-        self.save_to_history("del")  # Сохраняем состояние перед удалением
+        self.history.record("del", self.lines)  # Прежний документ не изменяется, копировать его не нужно
         # Заменяем содержимое одной пустой строкой
-        self.lines = [""]
+        self._apply("clear")
 
     def delete_row(self, row: int) -> None:
         """Удаляет указанную строку."""
         row -= 1  # Преобразуем пользовательский номер строки (с 1) в индекс (с 0)
         # Проверяем, что номер строки в допустимом диапазоне
-        if row < 0 or row >= len(self.lines):
+        if row < 0 or not self.lines.has_line(row):
             print(f"Ошибка: Номер строки {row + 1} вне диапазона.")
             return
-        self.save_to_history("delrow")  # Сохраняем состояние перед удалением
-        self.lines.pop(row)  # Удаляем строку
+        self.history.record("delrow", row, self.lines[row], not self.lines.has_line(1))  # Запоминаем удаляемую строку
+        self._apply("delete", row)  # Удаляем строку
         # Если файл стал пустым, добавляем одну пустую строку
-        if not self.lines:
-            self.lines = [""]
+        if not self.lines.has_line(0):
+            self._apply("clear")
 
     def swap_rows(self, row1: int, row2: int) -> None:
         """Меняет местами две строки."""
         row1 -= 1  # Преобразуем пользовательский номер строки (с 1) в индекс (с 0)
         row2 -= 1  # Преобразуем пользовательский номер строки (с 1) в индекс (с 0)
         # Проверяем, что номера строк в допустимом диапазоне
-        if row1 < 0 or row1 >= len(self.lines) or row2 < 0 or row2 >= len(self.lines):
+        if row1 < 0 or not self.lines.has_line(row1) or row2 < 0 or not self.lines.has_line(row2):
             print(f"Ошибка: Номера строк {row1 + 1} или {row2 + 1} вне диапазона.")
             return
         # Проверяем, что строки не совпадают
         if row1 == row2:
             print("Ошибка: Номера строк совпадают.")
             return
-        self.save_to_history("swap")  # Сохраняем состояние перед обменом
-        # Меняем строки местами
-        self.lines[row1], self.lines[row2] = self.lines[row2], self.lines[row1]
+        self.history.record("swap", row1, row2)  # Запоминаем обмен
+        # Меняем строки местами (перестановкой фрагментов, без копирования текста)
+        self._apply("swap", row1, row2)
 
     def undo(self) -> None:
         """Отменяет последнюю операцию."""
+        edit = self.history.pop_undo()
         # Проверяем, есть ли операции в истории
-        if not self.history:
+        if edit is None:
             print("Нет операций для отмены.")
             return
-        # Восстанавливаем предыдущее состояние строк
-        self.lines = self.history.pop()[1]
+        # Применяем правку в обратную сторону
+        kind, args = edit
+        if kind == "insert":
+            row, col, text, spaces, padded = args
+            if padded:
+                self._apply("truncate", len(self.lines) - padded)  # Строка row была среди добавленных
+            else:
+                line = self.lines[row]
+                self._apply("set", row, line[:col - spaces] + line[col + len(text):])
+        elif kind == "delrow":
+            row, text, only = args
+            if only:
+                self._apply("set", 0, text)  # Документ после удаления состоял из одной пустой строки
+            else:
+                self._apply("insert", row, text)
+        elif kind == "swap":
+            self._apply("swap", *args)
+        elif kind == "del":
+            self._apply("restore", args[0])
         print("Последняя операция отменена.")
 
-    def process_command(self, command: str) -> bool:
-        """Обрабатывает введенную команду."""
-        parts = command.strip().split()  # Разбиваем команду на части
-        if not parts:
-            return True  # Пустая команда, продолжаем цикл
+    def redo(self) -> None:
+        """Повторяет последнюю отменённую операцию."""
+        edit = self.history.pop_redo()
+        if edit is None:
+            print("Нет операций для повтора.")
+            return
+        # Применяем правку в прямую сторону
+        kind, args = edit
+        if kind == "insert":
+            row, col, text, spaces, padded = args
+            if padded:
+                self._apply("pad", padded)
+            line = self.lines[row]
+            self._apply("set", row, line[:col] + " " * spaces + text + line[col:])
+        elif kind == "delrow":
+            self._apply("delete", args[0])
+            if not self.lines.has_line(0):
+                self._apply("clear")
+        elif kind == "swap":
+            self._apply("swap", *args)
+        elif kind == "del":
+            self._apply("clear")
+        print("Отменённая операция повторена.")
 
-        cmd = parts[0].lower()  # Приводим команду к нижнему регистру
+    def execute(self, command: Command) -> bool:
+        """Выполняет разобранную команду. Возвращает False для команды exit."""
+        cmd, args = command
+        if cmd == "exit":
+            return False  # Завершаем цикл обработки команд
         try:
-            if cmd == "insert":
-                # Проверяем, что текст заключен в кавычки
-                if len(parts) < 2 or parts[1][0] != '"' or parts[1][-1] != '"':
-                    print('Ошибка: Текст должен быть в двойных кавычках.')
-                    return True
-                text = parts[1][1:-1]  # Извлекаем текст без кавычек
-                # Получаем номер строки и позицию курсора, если указаны
-                row = int(parts[2]) if len(parts) > 2 else None
-                col = int(parts[3]) if len(parts) > 3 else None
-                self.insert(text, row, col)  # Выполняем вставку
-            elif cmd == "del":
-                self.delete_all()  # Удаляем все содержимое
-            elif cmd == "delrow":
-                # Проверяем, что указан номер строки
-                if len(parts) < 2:
-                    print("Ошибка: Укажите номер строки.")
-                    return True
-                self.delete_row(int(parts[1]))  # Удаляем строку
-            elif cmd == "swap":
-                # Проверяем, что указаны два номера строк
-                if len(parts) < 3:
-                    print("Ошибка: Укажите два номера строк.")
-                    return True
-                self.swap_rows(int(parts[1]), int(parts[2]))  # Меняем строки
-            elif cmd == "undo":
-                self.undo()  # Отменяем последнюю операцию
-            elif cmd == "save":
-                self.save_file()  # Сохраняем файл
-            elif cmd == "exit":
-                return False  # Завершаем цикл обработки команд
-            else:
-                print(f"Неизвестная команда: {cmd}")  # Неизвестная команда
+            self.commands[cmd](*args)  # Выполняем команду по таблице
         except ValueError:
-            # Обрабатываем ошибки преобразования аргументов (например, не числа)
+            # Обрабатываем ошибки в аргументах
             print("Ошибка: Неверный формат аргументов.")
         except Exception as e:
             # Обрабатываем прочие ошибки
             print(f"Ошибка: {e}")
         return True  # Продолжаем цикл обработки команд
 
+    def process_command(self, command: str) -> bool:
+        """Обрабатывает введенную команду."""
+        try:
+            parsed = parse_command(command)  # Разбираем команду на имя и аргументы
+        except ValueError as e:
+            print(e)  # Неизвестная команда или неверные аргументы
+            return True
+        if parsed is None:
+            return True  # Пустая команда, продолжаем цикл
+        return self.execute(parsed)
+
 def main():
-    # Проверяем, что передан ровно один аргумент (путь к файлу)
-    if len(sys.argv) != 2:
-        print("Использование: python text_editor.py <file_path>")
-        sys.exit(1)  # Завершаем программу с ошибкой
+    # Разбираем аргументы: путь к файлу и необязательное ограничение памяти истории
+    parser = argparse.ArgumentParser(description="Построчный текстовый редактор")
+    parser.add_argument("file_path", help="путь к редактируемому файлу")
+    parser.add_argument("--history-limit", type=int, default=DEFAULT_LIMIT // (1024 * 1024),
+                        help="ограничение памяти истории undo/redo в МБ (по умолчанию %(default)s)")
+    parser.add_argument("--lazy", action="store_true",
+                        help="ленивое открытие больших файлов: строки читаются только при правке")
+    parser.add_argument("--journal", action="store_true",
+                        help="сохранять изменения в журнал <файл>.journal, а файл переписывать "
+                             "командой compact или при переполнении журнала")
+    parser.add_argument("--journal-limit", type=int, default=JOURNAL_LIMIT // (1024 * 1024),
+                        help="размер журнала в МБ, после которого файл переписывается (по умолчанию %(default)s)")
+    parser.add_argument("--script", metavar="FILE",
+                        help="выполнить команды из файла ('-' — стандартный ввод) и завершить работу")
+    args = parser.parse_args()
 
-    editor = TextEditor(sys.argv[1])  # Создаем объект редактора
+    # Создаем объект редактора
+    journal_limit = args.journal_limit * 1024 * 1024 if args.journal else None
+    editor = TextEditor(args.file_path, args.history_limit * 1024 * 1024, lazy=args.lazy,
+                        journal_limit=journal_limit)
+    if args.script is not None:
+        sys.exit(run_script(editor, args.script))
     print("Введите команды (exit для выхода):")
     while True:
         command = input("> ")  # Запрашиваем команду у пользователя